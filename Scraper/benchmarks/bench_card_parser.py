@@ -0,0 +1,244 @@
+"""Compare the table-driven card parser with the hand-written one it replaced.
+
+Run from the Scraper directory:
+
+    python -m benchmarks.bench_card_parser [--cards 5000] [--repeat 5] [--seed 1]
+
+Builds a corpus of synthetic job cards (plus the cards in
+debug_page_source.html), checks that CardParser.parse_many returns the same
+fields as the reference parser for every card, then times the reference
+one card at a time, CardParser.parse one card at a time and
+CardParser.parse_many over the whole corpus.
+"""
+import argparse
+import gc
+import random
+import re
+import time
+from datetime import datetime
+
+from card_parser import CardParser
+from job_cards import BASE_URL, absolute_url, find_job_cards, first_link, parse_html
+
+COMPANIES = ['Isio', 'Aon', 'WTW', 'Milliman', 'Lane Clark & Peacock', 'Hannover Re', 'MetLife', 'Travelers',
+             'Swiss Re', 'AXA', 'Zurich Insurance Group', 'Liberty Mutual', 'Just', 'Barnett Waddingham', 'XL']
+TITLES = ['Senior Pensions Actuarial Consultant', 'Actuarial Analyst', 'Pricing Actuary', 'Reserving Manager',
+          'Director, Capital Modelling', 'Junior Actuarial Assistant', 'Head of Longevity', 'Actuarial Intern',
+          'Chief Risk Officer', 'Valuation Specialist', 'Consultant - Health & Benefits']
+FLAGS = ['🇬🇧 UK', '🇺🇸 USA', '🇨🇦 Canada', '🇦🇺 Australia', '🇩🇪 Germany', '🇫🇷 France', '🇮🇪 Ireland', '🇧🇲 Bermuda']
+CITIES = ['London', 'New York', 'Hartford, CT', 'Toronto', 'Sydney', 'Munich', 'Paris', 'Remote', 'Senior Hub']
+TAGS = ['Actuary (Fellow)', 'Actuary (Associate)', 'Life', 'Investments', 'Pensions', 'Health', 'Property & Casualty',
+        'Risk Management', 'Insurance', 'Consulting', 'Reinsurance', 'Analytics', 'Data Science and Analytics Hub']
+AGES = ['12h ago', '1d ago', '3d ago', '2w ago', 'Featured']
+
+
+def synthetic_card(rng):
+    """Rendered text of a made-up card, shaped like ActuaryList's with random omissions and noise"""
+    lines = []
+    if rng.random() < 0.95:
+        lines.append(rng.choice(COMPANIES))
+    lines.append(rng.choice(TITLES))
+    if rng.random() < 0.8:
+        lines.append(rng.choice(FLAGS))
+    if rng.random() < 0.8:
+        lines.append(rng.choice(CITIES))
+    lines.extend(rng.sample(TAGS, rng.randint(0, 6)))
+    if rng.random() < 0.1:
+        lines.append('Apply now to join our growing actuarial team in ' + rng.choice(CITIES) + ' ' + 'x' * rng.randint(0, 90))
+    if rng.random() < 0.9:
+        lines.append(rng.choice(AGES))
+    if rng.random() < 0.05:
+        return ''
+    # Stray blank lines and padding, as rendered text sometimes has
+    return '\n'.join(line if rng.random() < 0.9 else f'  {line}\n' for line in lines)
+
+
+def corpus(size, seed, page='debug_page_source.html'):
+    """(all_text, href) pairs: the fixture's cards, then synthetic ones up to size"""
+    with open(page, encoding='utf-8') as page_file:
+        cards, _ = find_job_cards(parse_html(page_file.read()))
+    cards = [(text, first_link(element)) for text, element in cards]
+    rng = random.Random(seed)
+    while len(cards) < size:
+        cards.append((synthetic_card(rng), f'/actuarial-jobs/{len(cards)}-synthetic' if rng.random() < 0.9 else None))
+    return cards
+
+
+def without_dates(jobs):
+    return [{key: value for key, value in job.items() if key != 'posting_date'} for job in jobs]
+
+
+def best_of(repeat, function):
+    """Shortest of repeat runs, with the garbage collector off as in timeit"""
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function()
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(timings), result
+
+
+def reference_parse_job_card(all_text, href=None, base_url=BASE_URL):
+    """The hand-written parser card_parser.py replaced, kept as the reference its output must match"""
+    job_data = {
+        'title': '',
+        'company': '',
+        'location': '',
+        'posting_date': datetime.now(),
+        'job_type': 'Full-time',
+        'tags': [],
+        'description': '',
+        'url': ''
+    }
+    
+    try:
+        all_text = all_text.strip()
+        lines = [line.strip() for line in all_text.split('\n') if line.strip()]
+        
+        # Extract URL first
+        job_data['url'] = absolute_url(href, base_url)
+        
+        # Parse based on ActuaryList structure (from debug output)
+        # Expected structure: Company, Title, Location flag, Location, Tags...
+        if lines:
+            # Look for location indicators (🇬🇧, 🇺🇸, etc.)
+            location_info = []
+            title_candidates = []
+            company_candidates = []
+            
+            for i, line in enumerate(lines):
+                # Check for emoji flags (location indicators)
+                if any(emoji in line for emoji in ['🇬🇧', '🇺🇸', '🇨🇦', '🇦🇺', '🇩🇪', '🇫🇷']):
+                    # This line and potentially next ones are location
+                    location_parts = [line]
+                    if i + 1 < len(lines) and not any(keyword in lines[i + 1].lower() 
+                                                    for keyword in ['actuary', 'analyst', 'manager', 'director', 'senior', 'junior']):
+                        location_parts.append(lines[i + 1])
+                    location_info = location_parts
+                    continue
+                
+                # Check for job titles (containing actuary-related terms)
+                if any(keyword in line.lower() for keyword in ['actuary', 'analyst', 'manager', 'director', 'senior', 'junior', 'consultant']):
+                    if len(line) < 100:  # Reasonable title length
+                        title_candidates.append(line)
+                
+                # Check for company names (shorter, corporate-sounding)
+                elif len(line) < 50 and i < 3:  # Company usually in first few lines
+                    company_candidates.append(line)
+            
+            # Assign title
+            if title_candidates:
+                job_data['title'] = title_candidates[0]
+            elif len(lines) > 1:
+                job_data['title'] = lines[1]  # Default to second line
+            else:
+                job_data['title'] = lines[0] if lines else "Actuarial Position"
+            
+            # Assign company - prefer shorter names that appear early
+            if company_candidates:
+                # Choose the shortest reasonable company name
+                company_candidates.sort(key=len)
+                for candidate in company_candidates:
+                    if 3 <= len(candidate) <= 50:  # Reasonable company name length
+                        job_data['company'] = candidate
+                        break
+            
+            # If still no company, use first line if it's not the title
+            if not job_data['company'] and lines:
+                if lines[0] != job_data['title']:
+                    job_data['company'] = lines[0]
+            
+            # Assign location
+            if location_info:
+                job_data['location'] = ' '.join(location_info).replace('🇬🇧', 'UK').replace('🇺🇸', 'USA')
+            else:
+                # Look for location patterns in text
+                location_patterns = [
+                    r'(London|New York|Chicago|Toronto|Sydney|Berlin|Paris|Remote|Hybrid)',
+                    r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, ST
+                    r'(UK|USA|US|Canada|Australia|Germany|France)'
+                ]
+                
+                for pattern in location_patterns:
+                    match = re.search(pattern, all_text, re.IGNORECASE)
+                    if match:
+                        job_data['location'] = match.group(1)
+                        break
+            
+            # Extract tags from remaining lines
+            tag_keywords = ['actuary', 'fellow', 'life', 'investments', 'pensions', 'insurance', 'risk', 'analytics']
+            for line in lines:
+                line_lower = line.lower()
+                if any(keyword in line_lower for keyword in tag_keywords) and len(line) < 30:
+                    if line not in job_data['tags']:
+                        job_data['tags'].append(line)
+            
+            # Set description
+            job_data['description'] = ' '.join(lines[:5])  # First 5 lines as description
+        
+        # Fallback values to ensure required fields
+        if not job_data['title']:
+            job_data['title'] = "Actuarial Position"
+        if not job_data['company']:
+            job_data['company'] = "Unknown Company"
+        if not job_data['location']:
+            job_data['location'] = "Location Not Specified"
+        
+        # Clean up fields
+        job_data['title'] = job_data['title'][:100]  # Limit length
+        job_data['company'] = job_data['company'][:100]
+        job_data['location'] = job_data['location'][:100]
+        job_data['description'] = job_data['description'][:500]
+        
+    except Exception as e:
+        print(f"Error extracting job data: {str(e)}")
+        # Set minimum required fields even on error
+        if not job_data['title']:
+            job_data['title'] = "Actuarial Position"
+        if not job_data['company']:
+            job_data['company'] = "Unknown Company"
+        if not job_data['location']:
+            job_data['location'] = "Location Not Specified"
+    
+    return job_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--rules', help='rules file (default card_rules.json)')
+    args = parser.parse_args()
+
+    cards = corpus(args.cards, args.seed)
+    card_parser = CardParser.from_file(args.rules)
+    pairs = [(text, absolute_url(href, BASE_URL)) for text, href in cards]
+
+    reference_time, reference = best_of(args.repeat, lambda: [reference_parse_job_card(text, href)
+                                                             for text, href in cards])
+    single_time, single = best_of(args.repeat, lambda: [card_parser.parse(text, url) for text, url in pairs])
+    batch_time, batch = best_of(args.repeat, lambda: card_parser.parse_many(pairs))
+
+    expected = without_dates(reference)
+    for name, jobs in (('parse', single), ('parse_many', batch)):
+        mismatches = [i for i, (want, got) in enumerate(zip(expected, without_dates(jobs))) if want != got]
+        if mismatches:
+            i = mismatches[0]
+            raise SystemExit(f"{name} differs from the reference on {len(mismatches)} cards, first {cards[i]!r}:\n"
+                             f"  reference {expected[i]}\n  {name} {without_dates(jobs)[i]}")
+    print(f"{len(cards)} cards parsed identically by all three")
+
+    for name, elapsed in (('reference', reference_time), ('CardParser.parse', single_time),
+                          ('CardParser.parse_many', batch_time)):
+        print(f"{name:<22} {elapsed * 1000:>10.1f} ms  {len(cards) / elapsed:>10,.0f} cards/s  "
+              f"{reference_time / elapsed:>5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Time parsing job cards from a saved page source.
+
+Run from the Scraper directory:
+
+    python -m benchmarks.bench_parse [--page debug_page_source.html] [--repeat 20] [--browser]
+
+Times parse_job_cards on the page, which is what a scrape costs per page
+once the browser has rendered it: one page_source read, then pure Python.
+With --browser the page is also opened in headless Chrome and both parse
+modes of ActuaryListScraper are timed, including the WebDriver round trips
+the element mode makes per card and selector.
+"""
+import argparse
+import os
+import time
+
+from job_cards import find_job_cards, parse_html, parse_job_cards
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def bench_browser(page, repeat):
+    from scrape import ActuaryListScraper
+
+    scraper = ActuaryListScraper(headless=True)
+    try:
+        scraper.driver.get('file://' + os.path.abspath(page))
+        for mode in ('snapshot', 'elements'):
+            parse = scraper.parse_page_source if mode == 'snapshot' else scraper.parse_job_elements
+            elapsed, jobs = best_of(repeat, parse)
+            print(f"{'browser ' + mode:<22} {elapsed * 1000:>10.1f} ms  {len(jobs)} jobs")
+    finally:
+        scraper.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--page', default='debug_page_source.html')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--browser', action='store_true', help='also time both modes in headless Chrome')
+    args = parser.parse_args()
+
+    with open(args.page, encoding='utf-8') as page_file:
+        page_source = page_file.read()
+
+    elapsed, root = best_of(args.repeat, lambda: parse_html(page_source))
+    print(f"{'build tree':<22} {elapsed * 1000:>10.1f} ms  ({len(page_source) / 1024:.0f} KiB)")
+    elapsed, (cards, selector) = best_of(args.repeat, lambda: find_job_cards(root))
+    print(f"{'find cards':<22} {elapsed * 1000:>10.1f} ms  {len(cards)} cards via {selector}")
+    elapsed, jobs = best_of(args.repeat, lambda: parse_job_cards(page_source))
+    print(f"{'parse_job_cards':<22} {elapsed * 1000:>10.1f} ms  {len(jobs)} jobs, "
+          f"{len(jobs) / elapsed:,.0f} cards/s")
+
+    if args.browser:
+        bench_browser(args.page, max(1, args.repeat // 10))
+
+
+if __name__ == '__main__':
+    main()
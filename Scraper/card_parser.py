@@ -0,0 +1,203 @@
+"""Table-driven job card parser.
+
+The keywords, flags and patterns that pick a card's title, company,
+location and tags live in a data file (card_rules.json by default, or the
+file named by the CARD_RULES environment variable):
+
+- title_keywords: a line containing one (lowercased) is a title candidate
+- location_stop_keywords: the line after a flag is part of the location unless it contains one
+- tag_keywords: short lines containing one become tags
+- location_flags: flag -> name it is replaced with in the location (null keeps the flag)
+- location_patterns: tried in order when a card has no flag
+- the remaining keys are the length and line-count limits
+
+Each keyword list is compiled into one alternation regex. parse_many runs
+each regex once over the lines of a whole batch of cards and maps the
+matches back to lines, so classifying lines costs a few scans in C rather
+than a Python loop over every keyword of every line. The rules reproduce
+the original hand-written parser exactly.
+"""
+import json
+import os
+import re
+from datetime import datetime
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'card_rules.json')
+
+# Title, company and location columns hold at most this many characters
+FIELD_LENGTH = 100
+
+
+def load_rules(path=None):
+    """The rules in path, the CARD_RULES file or card_rules.json, in that order of preference"""
+    with open(path or os.environ.get('CARD_RULES') or RULES_PATH, encoding='utf-8') as rules_file:
+        return json.load(rules_file)
+
+
+def keyword_pattern(keywords):
+    """One regex matching any of keywords literally; longest first so none is shadowed by a prefix"""
+    return re.compile('|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)))
+
+
+def line_pattern(keywords):
+    """A regex matching from the first keyword on a line to the end of that line"""
+    return re.compile(f'(?:{keyword_pattern(keywords).pattern})[^\\n]*')
+
+
+def matching_lines(pattern, text):
+    """Indices of the '\\n'-separated lines of text that a line_pattern matches"""
+    lines = set()
+    line = 0
+    last = 0
+    # Each match runs to the end of its line, so every line is matched at most once
+    for match in pattern.finditer(text):
+        start = match.start()
+        line += text.count('\n', last, start)
+        last = start
+        lines.add(line)
+    return lines
+
+
+class CardParser:
+    """Parse job cards' rendered text with precompiled rules"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.title_keywords = line_pattern(rules['title_keywords'])
+        self.location_stop_keywords = line_pattern(rules['location_stop_keywords'])
+        self.tag_keywords = line_pattern(rules['tag_keywords'])
+        self.flags = line_pattern(rules['location_flags'])
+        self.flag_names = {flag: name for flag, name in rules['location_flags'].items() if name is not None}
+        self.flag_name_pattern = keyword_pattern(self.flag_names) if self.flag_names else None
+        self.location_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in rules['location_patterns']]
+
+        self.max_title_length = rules['max_title_length']
+        self.max_company_length = rules['max_company_length']
+        self.min_company_length = rules['min_company_length']
+        self.company_lines = rules['company_lines']
+        self.max_tag_length = rules['max_tag_length']
+        self.description_lines = rules['description_lines']
+        self.max_description_length = rules['max_description_length']
+
+    @classmethod
+    def from_file(cls, path=None):
+        return cls(load_rules(path))
+
+    def parse(self, all_text, url=''):
+        """Parse one card's text (one line per rendered block) into a job dict"""
+        return self.parse_many([(all_text, url)])[0]
+
+    def parse_many(self, cards):
+        """Parse (all_text, url) pairs into job dicts, classifying the lines of every card in one pass"""
+        texts = []
+        all_lines = []
+        for all_text, _ in cards:
+            text = all_text.strip() if all_text else ''
+            texts.append(text)
+            all_lines.append([line.strip() for line in text.split('\n') if line.strip()])
+
+        # Lines never contain '\n', so the batch joins into one text with a line per card line
+        batch = '\n'.join(line for lines in all_lines for line in lines)
+        lowered = batch.lower()
+        flag_lines = matching_lines(self.flags, batch)
+        title_lines = matching_lines(self.title_keywords, lowered)
+        stop_lines = matching_lines(self.location_stop_keywords, lowered)
+        tag_lines = matching_lines(self.tag_keywords, lowered)
+
+        jobs = []
+        offset = 0
+        for (_, url), text, lines in zip(cards, texts, all_lines):
+            job_data = self.new_job(url)
+            try:
+                if lines:
+                    self.fill(job_data, text, lines, offset, flag_lines, title_lines, stop_lines, tag_lines)
+                self.finish(job_data)
+            except Exception as e:
+                print(f"Error extracting job data: {str(e)}")
+                self.finish(job_data)
+            offset += len(lines)
+            jobs.append(job_data)
+        return jobs
+
+    @staticmethod
+    def new_job(url):
+        return {
+            'title': '',
+            'company': '',
+            'location': '',
+            'posting_date': datetime.now(),
+            'job_type': 'Full-time',
+            'tags': [],
+            'description': '',
+            'url': url
+        }
+
+    def fill(self, job_data, text, lines, offset, flag_lines, title_lines, stop_lines, tag_lines):
+        """Fill job_data from one card's lines; line i of the card is line offset + i of the batch"""
+        # Expected structure: Company, Title, Location flag, Location, Tags...
+        location_info = []
+        title_candidates = []
+        company_candidates = []
+        for i, line in enumerate(lines):
+            if offset + i in flag_lines:
+                # This line and potentially the next one are the location
+                location_info = [line]
+                if i + 1 < len(lines) and offset + i + 1 not in stop_lines:
+                    location_info.append(lines[i + 1])
+                continue
+            if offset + i in title_lines:
+                if len(line) < self.max_title_length:
+                    title_candidates.append(line)
+            elif len(line) < self.max_company_length and i < self.company_lines:
+                company_candidates.append(line)
+
+        if title_candidates:
+            job_data['title'] = title_candidates[0]
+        elif len(lines) > 1:
+            job_data['title'] = lines[1]
+        else:
+            job_data['title'] = lines[0]
+
+        # Prefer the shortest reasonable company name among the first lines
+        for candidate in sorted(company_candidates, key=len):
+            if self.min_company_length <= len(candidate) <= self.max_company_length:
+                job_data['company'] = candidate
+                break
+        if not job_data['company'] and lines[0] != job_data['title']:
+            job_data['company'] = lines[0]
+
+        if location_info:
+            location = ' '.join(location_info)
+            if self.flag_name_pattern:
+                location = self.flag_name_pattern.sub(lambda match: self.flag_names[match.group()], location)
+            job_data['location'] = location
+        else:
+            for pattern in self.location_patterns:
+                match = pattern.search(text)
+                if match:
+                    job_data['location'] = match.group(1)
+                    break
+
+        for i, line in enumerate(lines):
+            if offset + i in tag_lines and len(line) < self.max_tag_length and line not in job_data['tags']:
+                job_data['tags'].append(line)
+
+        job_data['description'] = ' '.join(lines[:self.description_lines])
+
+    def finish(self, job_data):
+        """Fill in required fields that are still empty and trim fields to their column sizes"""
+        job_data['title'] = (job_data['title'] or "Actuarial Position")[:FIELD_LENGTH]
+        job_data['company'] = (job_data['company'] or "Unknown Company")[:FIELD_LENGTH]
+        job_data['location'] = (job_data['location'] or "Location Not Specified")[:FIELD_LENGTH]
+        job_data['description'] = job_data['description'][:self.max_description_length]
+
+
+_default_parser = None
+
+
+def default_parser():
+    """The CardParser for the default rules file, loaded on first use"""
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = CardParser.from_file()
+    return _default_parser
@@ -0,0 +1,129 @@
+"""Persistent crawl state, so each run only parses and uploads what changed.
+
+A small SQLite file records, for every listing URL, a hash of the listing's
+raw content (card text or embedded JSON), the API job id it was uploaded
+as, and when it was first and last seen. During a run, should_parse tells
+the scrapers which listings are new or changed; unchanged ones are skipped
+before they are parsed. Hashes are only stored for listings the run
+actually delivered (mark_delivered), so a failed upload is retried next
+time. A complete run also reports the listings that have gone from the
+site, so their jobs can be expired.
+"""
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    job_id INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    removed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_listings_last_seen ON listings (last_seen) WHERE removed_at IS NULL;
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    seen INTEGER NOT NULL,
+    new INTEGER NOT NULL,
+    changed INTEGER NOT NULL,
+    unchanged INTEGER NOT NULL,
+    disappeared INTEGER NOT NULL
+);
+"""
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+
+class CrawlState:
+    """Listing hashes and last-seen times, kept in a SQLite file across runs; safe to share between threads"""
+
+    def __init__(self, path='crawl_state.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.started_at = datetime.now().isoformat()
+
+        # url -> hash of every listing still on the site as of the last run
+        self.known = dict(self.conn.execute('SELECT url, content_hash FROM listings WHERE removed_at IS NULL'))
+        self.seen = set()
+        self.pending = {}
+        self.delivered = {}
+        self.counts = {NEW: 0, CHANGED: 0, UNCHANGED: 0}
+
+    def should_parse(self, url, listing_hash):
+        """Record url as seen in this run; True if the listing is new or changed since it was last delivered"""
+        if not url:
+            # Nothing to track it by
+            return True
+        with self.lock:
+            if url in self.seen:
+                return False
+            self.seen.add(url)
+            known_hash = self.known.get(url)
+            if known_hash == listing_hash:
+                self.counts[UNCHANGED] += 1
+                return False
+            self.counts[NEW if known_hash is None else CHANGED] += 1
+            self.pending[url] = listing_hash
+            return True
+
+    def mark_delivered(self, job_ids):
+        """Store the hashes of listings that were saved or uploaded; job_ids maps url -> API job id (or None)"""
+        with self.lock:
+            for url, job_id in job_ids.items():
+                if url in self.pending:
+                    self.delivered[url] = job_id
+
+    def finish(self, complete):
+        """Write this run's sightings; if the run covered the whole site, return the listings that disappeared.
+
+        Returns a list of (url, job_id) pairs. An incomplete run (capped,
+        interrupted or with failed pages) returns none, since a listing it
+        did not see may simply not have been reached.
+        """
+        now = datetime.now().isoformat()
+        with self.lock, self.conn:
+            # A listing that came back after being removed stays removed until it is delivered again
+            self.conn.executemany(
+                'UPDATE listings SET last_seen = ? WHERE url = ? AND removed_at IS NULL',
+                [(now, url) for url in self.seen]
+            )
+            self.conn.executemany(
+                'INSERT INTO listings (url, content_hash, job_id, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (url) DO UPDATE SET content_hash = excluded.content_hash, '
+                'job_id = COALESCE(excluded.job_id, listings.job_id), last_seen = excluded.last_seen, removed_at = NULL',
+                [(url, self.pending[url], job_id, now, now) for url, job_id in self.delivered.items()]
+            )
+
+            disappeared = []
+            if complete:
+                disappeared = self.conn.execute(
+                    'SELECT url, job_id FROM listings WHERE removed_at IS NULL AND last_seen < ?', (self.started_at,)
+                ).fetchall()
+                self.conn.execute(
+                    'UPDATE listings SET removed_at = ? WHERE removed_at IS NULL AND last_seen < ?',
+                    (now, self.started_at)
+                )
+
+            self.conn.execute(
+                'INSERT INTO runs (started_at, finished_at, complete, seen, new, changed, unchanged, disappeared) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (self.started_at, now, int(complete), len(self.seen), self.counts[NEW], self.counts[CHANGED],
+                 self.counts[UNCHANGED], len(disappeared))
+            )
+        return disappeared
+
+    def summary(self):
+        return (f"{len(self.seen)} listings seen: {self.counts[NEW]} new, {self.counts[CHANGED]} changed, "
+                f"{self.counts[UNCHANGED]} unchanged")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,295 @@
+"""Parallel crawl of actuarylist.com with a pool of browsers.
+
+ActuaryListScraper drives one Chrome instance through one page at a time.
+Crawler keeps a work queue of listing pages, category pages and job detail
+URLs and runs one worker thread per pooled browser. Each browser is its own
+process, so a crawl spreads over the available cores. Browsers are reused
+from page to page and replaced when one crashes. A failed page is retried
+with backoff, up to a limit.
+
+To try it without hitting the site, serve the saved page and point the
+crawler at it:
+
+    python -m http.server 8000
+    python crawler.py --base-url http://localhost:8000/debug_page_source.html --browsers 4
+"""
+import argparse
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from crawl_state import CrawlState
+from job_cards import listing_page_url
+from scrape import ActuaryListScraper, BaseScraper, create_chrome_driver, finish_crawl_state
+from uploader import API_URL
+from waits import PhaseTimer, TimeBudget
+
+LISTING = 'listing'
+CATEGORY = 'category'
+DETAIL = 'detail'
+
+
+class DriverPool:
+    """A fixed number of WebDrivers, started on first use and shared between threads"""
+
+    def __init__(self, size, factory=None, headless=True, timer=None):
+        self.size = size
+        self.factory = factory or (lambda: create_chrome_driver(headless))
+        self.timer = timer or PhaseTimer()
+        self.idle = queue.Queue()
+        self.started = 0
+        self.lock = threading.Lock()
+        self.drivers = []
+
+    def acquire(self):
+        """Take an idle driver, starting a new one while fewer than size exist"""
+        with self.lock:
+            start_new = self.idle.empty() and self.started < self.size
+            if start_new:
+                self.started += 1
+        if not start_new:
+            return self.idle.get()
+        try:
+            with self.timer.phase('browser'):
+                driver = self.factory()
+        except Exception:
+            with self.lock:
+                self.started -= 1
+            raise
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+    def release(self, driver):
+        self.idle.put(driver)
+
+    def discard(self, driver):
+        """Quit a broken driver so a replacement can be started in its place"""
+        with self.lock:
+            self.started -= 1
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self.release(driver)
+            else:
+                self.discard(driver)
+
+    def close(self):
+        with self.lock:
+            drivers, self.drivers = self.drivers, []
+            self.started = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Crawler:
+    """Crawl listing, category and detail pages concurrently over a DriverPool"""
+
+    def __init__(self, pool, start_url="https://www.actuarylist.com", max_pages=None,
+                 categories=(), details=False, max_retries=2, retry_delay=2.0, parse_mode='snapshot',
+                 time_budget=None, timer=None, state=None):
+        self.pool = pool
+        self.start_url = start_url
+        self.max_pages = max_pages
+        self.categories = tuple(categories)
+        self.details = details
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.parse_mode = parse_mode
+        # Shared by every worker: one deadline for the crawl, one set of phase timings
+        self.budget = TimeBudget(time_budget)
+        self.timer = timer or pool.timer
+        self.state = state
+
+        self.tasks = queue.Queue()
+        self.seen_urls = set()
+        self.jobs = {}
+        self.failed = []
+        self.pages_done = 0
+        self.pages_skipped = 0
+        self.lock = threading.Lock()
+
+    def enqueue(self, kind, url, attempt=0):
+        """Queue url unless it was queued before (retries always go through)"""
+        with self.lock:
+            if attempt == 0:
+                if url in self.seen_urls:
+                    return
+                self.seen_urls.add(url)
+        self.tasks.put((kind, url, attempt))
+
+    def add_jobs(self, jobs):
+        with self.lock:
+            for job in jobs:
+                # Listings repeat across category pages; keep the first copy of each
+                key = job['url'] or (job['title'], job['company'], job['location'])
+                if key not in self.jobs:
+                    self.jobs[key] = job
+                    if self.details and job['url']:
+                        self.tasks.put((DETAIL, job['url'], 0))
+
+    def process(self, scraper, kind, url):
+        """Scrape one page and queue the work it leads to"""
+        if kind == DETAIL:
+            description = scraper.scrape_job_details(url)
+            if description:
+                with self.lock:
+                    self.jobs[url]['description'] = description
+            return
+
+        scraper.jobs_data = []
+        self.add_jobs(scraper.scrape_page(url))
+
+        # Only the first page of a listing knows how many pages follow it
+        if 'page' not in dict(parse_qsl(urlsplit(url).query)):
+            pages = scraper.listing_page_count()
+            if self.max_pages:
+                pages = min(pages, self.max_pages)
+            for page in range(2, pages + 1):
+                self.enqueue(kind, listing_page_url(url, page))
+            if kind == LISTING and self.categories:
+                for link in scraper.category_links(self.categories):
+                    self.enqueue(CATEGORY, link)
+
+    def worker(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                self.tasks.task_done()
+                return
+            kind, url, attempt = task
+            if self.budget.expired:
+                # Drain the queue without loading anything more
+                with self.lock:
+                    self.pages_skipped += 1
+                self.tasks.task_done()
+                continue
+            try:
+                with self.pool.driver() as driver:
+                    scraper = ActuaryListScraper(driver=driver, parse_mode=self.parse_mode,
+                                                 budget=self.budget, timer=self.timer, state=self.state)
+                    self.process(scraper, kind, url)
+                with self.lock:
+                    self.pages_done += 1
+            except Exception as e:
+                if attempt < self.max_retries:
+                    print(f" Retrying {url} after error: {str(e)}")
+                    # Back off before retrying so a struggling site gets some slack
+                    time.sleep(self.retry_delay * (2 ** attempt))
+                    self.enqueue(kind, url, attempt + 1)
+                else:
+                    print(f" Giving up on {url}: {str(e)}")
+                    with self.lock:
+                        self.failed.append({'url': url, 'kind': kind, 'error': str(e)})
+            finally:
+                self.tasks.task_done()
+
+    def run(self):
+        """Crawl from start_url until the queue drains; returns the scraped jobs"""
+        started = time.time()
+        self.enqueue(LISTING, self.start_url)
+
+        workers = [threading.Thread(target=self.worker, daemon=True) for _ in range(self.pool.size)]
+        for thread in workers:
+            thread.start()
+        self.tasks.join()
+        for _ in workers:
+            self.tasks.put(None)
+        for thread in workers:
+            thread.join()
+
+        print(f" Crawled {self.pages_done} pages with {self.pool.size} browsers in "
+              f"{time.time() - started:.1f}s: {len(self.jobs)} jobs, {len(self.failed)} pages failed")
+        if self.pages_skipped:
+            print(f" Time budget ran out; {self.pages_skipped} queued pages were skipped")
+        self.timer.report()
+        return list(self.jobs.values())
+
+    @property
+    def complete(self):
+        """True if every listing page was crawled, so listings not seen have left the site"""
+        return not self.failed and not self.pages_skipped and not self.max_pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl actuarylist.com with several browsers in parallel")
+    parser.add_argument('--base-url', default="https://www.actuarylist.com")
+    parser.add_argument('--browsers', type=int, default=4, help="browsers (and pages) in flight at once")
+    parser.add_argument('--max-pages', type=int, help="listing pages to crawl per listing")
+    parser.add_argument('--categories', nargs='*', default=[],
+                        help="category kinds to crawl too, e.g. sectors countries cities experience-levels")
+    parser.add_argument('--details', action='store_true', help="fetch each job's detail page for its description")
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--parse-mode', choices=['snapshot', 'elements'], default='snapshot')
+    parser.add_argument('--time-budget', type=float, help="seconds the crawl may take; pages still queued are skipped")
+    parser.add_argument('--output', default='scraped_jobs.json')
+    parser.add_argument('--no-upload', action='store_true')
+    parser.add_argument('--api-url', default=API_URL)
+    parser.add_argument('--uploads', type=int, default=4, help="upload requests in flight at once")
+    parser.add_argument('--show-browser', action='store_true')
+    parser.add_argument('--state', default='crawl_state.db',
+                        help="crawl state file; listings unchanged since they were last delivered are skipped")
+    parser.add_argument('--no-state', action='store_true', help="parse and deliver every listing")
+    parser.add_argument('--expire-missing', action='store_true',
+                        help="delete the jobs of listings that were removed from the site")
+    args = parser.parse_args()
+
+    state = None if args.no_state else CrawlState(args.state)
+    with DriverPool(args.browsers, headless=not args.show_browser) as pool:
+        crawler = Crawler(pool, args.base_url, max_pages=args.max_pages, categories=args.categories,
+                          details=args.details, max_retries=args.retries, parse_mode=args.parse_mode,
+                          time_budget=args.time_budget, state=state)
+        jobs = crawler.run()
+
+    scraper = BaseScraper()
+    if jobs:
+        scraper.jobs_data = jobs
+        scraper.save_to_json(args.output)
+        if args.no_upload:
+            # Saved to the file is delivered, just without an API id
+            scraper.job_ids = {job['url']: None for job in jobs if job['url']}
+        else:
+            try:
+                success, errors = scraper.send_to_api(args.api_url, concurrency=args.uploads)
+                print(f"📡 Sent {success} jobs to API with {errors} errors")
+            except Exception as e:
+                print(f" Could not connect to API: {str(e)}")
+    elif state and state.seen:
+        print(" No new or changed listings since the last run")
+    else:
+        print(" No jobs were scraped successfully")
+
+    if state:
+        finish_crawl_state(state, scraper, crawler.complete, args.expire_missing, args.api_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Job card parsing that needs no browser.
+
+parse_job_card turns a card's rendered text into a job dict (with the
+rules in card_parser.py); both the WebDriver path in scrape.py and the
+page-source path below use it.
+parse_job_cards parses every card in a saved or live page source with the
+standard library's HTMLParser. It reproduces the text WebDriver would report
+for each card, so a page costs one page_source call instead of several
+WebDriver round trips per card and selector.
+
+ActuaryList is a Next.js app and embeds each listing page's jobs as JSON in
+a __NEXT_DATA__ script. parse_next_data reads them from there, which needs
+no rendering at all.
+"""
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from card_parser import default_parser
+
+BASE_URL = "https://www.actuarylist.com"
+
+# Card selectors tried in order; ActuaryList's own class names first
+ACTUARYLIST_SELECTORS = [
+    '[class*="Job_job-card"]',
+    '.Job_job-card__YgDAV',
+    'div[class*="job-card"]',
+    'div[class*="Job_job"]',
+    '[class*="job-"]'
+]
+
+GENERIC_SELECTORS = [
+    '[class*="job"]', '[id*="job"]',
+    '[class*="listing"]', '[id*="listing"]',
+    '[class*="position"]', '[id*="position"]',
+    '.card', '.item', '.entry', '.post',
+    'li[class*="job"]', 'li[class*="listing"]',
+    'a[href*="/job"]', 'a[href*="/jobs"]'
+]
+
+# Elements rendered on a line of their own. Links are included because the
+# card's links are laid out as flex items, which WebDriver reports one per line.
+LINE_TAGS = {
+    'a', 'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr',
+    'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul'
+}
+
+# Elements whose content is never rendered as text
+HIDDEN_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'svg'}
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+    'source', 'track', 'wbr'
+}
+
+# Listing fields whose values have display labels in pageProps.arrayLabels
+LABELLED_FIELDS = {'experience_levels': 'expLevelsInfo', 'sectors': 'sectorsInfo', 'tags': 'tagsInfo'}
+
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+SELECTOR_PATTERN = re.compile(
+    r'^(?P<tag>[a-z0-9]+)?(?:\[(?P<attr>[\w-]+)(?P<op>\*|\^)?="(?P<value>[^"]*)"\]|\.(?P<cls>[\w-]+))$'
+)
+
+
+class Element:
+    __slots__ = ('tag', 'attrs', 'children', 'parent', 'hidden')
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+        self.hidden = 'hidden' in attrs
+
+    def iter(self):
+        """This element and its descendant elements, in document order"""
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(child for child in reversed(element.children) if isinstance(child, Element))
+
+
+class TreeBuilder(HTMLParser):
+    """Build a minimal element tree, dropping content that is never rendered"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {}, None)
+        self.current = self.root
+        self.hidden_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.hidden_depth:
+            if tag in HIDDEN_TAGS:
+                self.hidden_depth += 1
+            return
+        if tag in HIDDEN_TAGS:
+            self.hidden_depth = 1
+            return
+        element = Element(tag, dict(attrs), self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.hidden_depth and tag not in HIDDEN_TAGS:
+            self.current.children.append(Element(tag, dict(attrs), self.current))
+
+    def handle_endtag(self, tag):
+        if self.hidden_depth:
+            if tag in HIDDEN_TAGS:
+                self.hidden_depth -= 1
+            return
+        # Close up to the matching open element; stray end tags are ignored
+        element = self.current
+        while element is not self.root:
+            if element.tag == tag:
+                self.current = element.parent
+                return
+            element = element.parent
+
+    def handle_data(self, data):
+        if not self.hidden_depth:
+            self.current.children.append(data)
+
+
+def parse_html(page_source):
+    builder = TreeBuilder()
+    builder.feed(page_source)
+    builder.close()
+    return builder.root
+
+
+def compile_selector(selector):
+    """A predicate for the simple selectors used above: tag[attr*="v"], tag[attr^="v"], tag[attr="v"], tag.class"""
+    match = SELECTOR_PATTERN.match(selector)
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector}")
+    tag, attr, op, value, cls = match.group('tag', 'attr', 'op', 'value', 'cls')
+
+    if cls:
+        def test(element):
+            return cls in element.attrs.get('class', '').split()
+    elif op == '*':
+        def test(element):
+            return value in (element.attrs.get(attr) or '')
+    elif op == '^':
+        def test(element):
+            return (element.attrs.get(attr) or '').startswith(value)
+    else:
+        def test(element):
+            return element.attrs.get(attr) == value
+
+    if tag:
+        return lambda element: element.tag == tag and test(element)
+    return test
+
+
+def outermost_matches(root, test):
+    """Elements matching test that are not inside another match"""
+    matches = []
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        if test(element):
+            matches.append(element)
+            continue
+        stack.extend(child for child in reversed(element.children) if isinstance(child, Element))
+    return matches
+
+
+def element_text(element):
+    """The element's visible text, one line per block-level element, like WebDriver's .text"""
+    lines = []
+    line = []
+
+    def flush():
+        text = ' '.join(''.join(line).split())
+        if text:
+            lines.append(text)
+        line.clear()
+
+    # (node, leaving) pairs so line breaks can be emitted after a block's content
+    stack = [(element, False)]
+    while stack:
+        node, leaving = stack.pop()
+        if isinstance(node, str):
+            line.append(node)
+            continue
+        if node.hidden:
+            continue
+        breaks_line = node.tag in LINE_TAGS
+        if leaving:
+            if breaks_line:
+                flush()
+            continue
+        if breaks_line:
+            flush()
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.children))
+    flush()
+    return '\n'.join(lines)
+
+
+def absolute_url(href, base_url=BASE_URL):
+    if not href:
+        return ''
+    return href if href.startswith('http') else base_url + href
+
+
+def listing_hash(*parts):
+    """Fingerprint of a listing's raw content, to tell whether it changed between runs"""
+    return hashlib.sha1('\n'.join(part or '' for part in parts).encode('utf-8')).hexdigest()
+
+
+def first_link(element):
+    """href of the first link inside element (or element itself), like find_element(By.TAG_NAME, "a")"""
+    for node in element.iter():
+        if node.tag == 'a' and node is not element:
+            return node.attrs.get('href')
+    return element.attrs.get('href') if element.tag == 'a' else None
+
+
+def find_job_cards(root):
+    """(cards, selector) for the first selector that matches any card-sized elements.
+
+    Matches nested inside another match are parts of that card (its company,
+    position, tags...) and are skipped.
+    """
+    for selectors, unique in ((ACTUARYLIST_SELECTORS, True), (GENERIC_SELECTORS, False)):
+        for selector in selectors:
+            cards = []
+            seen_texts = set()
+            for element in outermost_matches(root, compile_selector(selector)):
+                text = element_text(element)
+                if len(text) > 20 and not (unique and text in seen_texts):
+                    cards.append((text, element))
+                    seen_texts.add(text)
+            if cards:
+                return cards, selector
+    return [], None
+
+
+def jobs_from_cards(cards, base_url=BASE_URL, max_jobs=None, keep=None):
+    """Parse (text, element) pairs from find_job_cards into job dicts.
+    
+    keep(url, listing_hash), if given, is asked before each card is parsed
+    and skips it by returning False (see crawl_state.CrawlState.should_parse).
+    """
+    if max_jobs is not None:
+        cards = cards[:max_jobs]
+    texts = []
+    for text, element in cards:
+        url = absolute_url(first_link(element), base_url)
+        if keep is not None and not keep(url, listing_hash(text, url)):
+            continue
+        texts.append((text, url))
+    # The whole page's cards are parsed as one batch
+    return default_parser().parse_many(texts)
+
+
+def parse_job_cards(page_source, base_url=BASE_URL, max_jobs=None, keep=None):
+    """Parse every job card in an HTML page source into job dicts"""
+    cards, _ = find_job_cards(parse_html(page_source))
+    return jobs_from_cards(cards, base_url, max_jobs, keep)
+
+
+def listing_page_url(url, page):
+    """url with its page query parameter set to page (page 1 is the url itself)"""
+    if page <= 1:
+        return url
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != 'page']
+    query.append(('page', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def next_data(page_source):
+    """The pageProps Next.js embedded in page_source, or None if there are none"""
+    match = NEXT_DATA_PATTERN.search(page_source)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))['props']['pageProps']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def listing_url(listing, base_url=BASE_URL):
+    return f"{base_url}/actuarial-jobs/{listing['slug']}" if listing.get('slug') else ''
+
+
+def html_to_text(html):
+    return ' '.join(unescape(re.sub(r'<[^>]+>', ' ', html or '')).split())
+
+
+def job_from_listing(listing, labels, base_url=BASE_URL):
+    """Convert one entry of pageProps.filteredJobs into a job dict.
+    
+    labels maps each listing field (experience_levels, sectors, tags) to the
+    display labels the site shows for its values.
+    """
+    country = listing.get('countries') or {}
+    location = ' '.join(filter(None, [country.get('label') or listing.get('country'), *(listing.get('cities') or [])]))
+
+    # Tags use the site's display labels, e.g. experience level Qualified -> Actuary (Fellow)
+    tags = []
+    for field in LABELLED_FIELDS:
+        for value in listing.get(field) or []:
+            tag = labels.get(field, {}).get(value, value)
+            if tag and tag not in tags:
+                tags.append(tag)
+
+    posting_date = datetime.now()
+    if listing.get('created_at'):
+        try:
+            created = datetime.fromisoformat(listing['created_at'].replace('Z', '+00:00'))
+            # Stored naive, in UTC, like the API's other posting dates
+            posting_date = created.astimezone(timezone.utc).replace(tzinfo=None) if created.tzinfo else created
+        except ValueError:
+            pass
+
+    return {
+        'title': (listing.get('position') or "Actuarial Position")[:100],
+        'company': (listing.get('company') or "Unknown Company")[:100],
+        'location': (location or "Location Not Specified")[:100],
+        'posting_date': posting_date,
+        'job_type': 'Internship' if 'Intern' in (listing.get('experience_levels') or []) else 'Full-time',
+        'tags': tags,
+        'description': html_to_text(listing.get('description')),
+        'url': listing_url(listing, base_url)
+    }
+
+
+def parse_next_data(page_source, base_url=BASE_URL, keep=None):
+    """(jobs, page_count) from a listing page's embedded data, or (None, 0) if it has none.
+
+    Closed listings are skipped, as are listings keep(url, listing_hash) rejects.
+    """
+    props = next_data(page_source)
+    if not props or not isinstance(props.get('filteredJobs'), list):
+        return None, 0
+
+    array_labels = props.get('arrayLabels') or {}
+    labels = {
+        field: {item['name']: item['label'] for item in array_labels.get(key) or []}
+        for field, key in LABELLED_FIELDS.items()
+    }
+    jobs = []
+    for listing in props['filteredJobs']:
+        if not listing.get('is_active', True):
+            continue
+        if keep is not None and not keep(listing_url(listing, base_url),
+                                         listing_hash(json.dumps(listing, sort_keys=True))):
+            continue
+        jobs.append(job_from_listing(listing, labels, base_url))
+    try:
+        page_count = max(1, -(-props['filteredJobCount'] // props['jobsPerPage']))
+    except (KeyError, TypeError, ZeroDivisionError):
+        page_count = 1
+    return jobs, page_count
+
+
+def parse_job_card(all_text, href=None, base_url=BASE_URL):
+    """Parse a job card's visible text and link into a job dict.
+    
+    all_text holds the card's lines as rendered (one per block element);
+    href is the card's first link, absolute or relative to base_url. The
+    rules are in card_rules.json (see card_parser.py).
+    """
+    return default_parser().parse(all_text, absolute_url(href, base_url))
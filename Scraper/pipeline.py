@@ -0,0 +1,212 @@
+"""Streaming scrape -> save -> upload pipeline.
+
+Jobs flow through a chain of generators: page sources -> parsed jobs ->
+unique jobs -> JSON Lines file and batched API upload. Stage runs a
+generator in its own thread and hands its items on through a bounded
+queue, so fetching, parsing, saving and uploading overlap. A slow stage
+makes the ones before it wait rather than pile records up in memory. Each
+job is appended to the output file as soon as it is parsed, so a crash
+loses nothing already scraped.
+"""
+import json
+import queue
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+
+from uploader import API_URL, Uploader
+
+DONE = object()
+
+
+class StageError:
+    """An exception raised inside a stage, passed on to be re-raised by the consumer"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Stage:
+    """Iterate iterable in a background thread; items are handed over through a queue of at most maxsize"""
+
+    def __init__(self, iterable, maxsize=32, name=None):
+        self.items = queue.Queue(maxsize)
+        self.stopped = threading.Event()
+        self.finished = False
+        self.thread = threading.Thread(target=self.produce, args=(iterable,), name=name, daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        """Wait for room in the queue; False once the consumer has closed the stage"""
+        while not self.stopped.is_set():
+            try:
+                self.items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(self, iterable):
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not self.put(item):
+                    break
+        except Exception as e:
+            self.put(StageError(e))
+        finally:
+            # Let a generator upstream run its cleanup (e.g. shutting down its workers)
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+            self.put(DONE)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.finished:
+            raise StopIteration
+        item = self.items.get()
+        if item is DONE or isinstance(item, StageError):
+            self.finished = True
+            self.thread.join()
+            if item is DONE:
+                raise StopIteration
+            raise item.error
+        return item
+
+    def close(self):
+        """Stop the producer early and wait for it to clean up"""
+        self.stopped.set()
+        self.thread.join()
+        self.finished = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def unique_jobs(jobs, max_jobs=None):
+    """Drop listings seen before and stop after max_jobs (all when None)"""
+    seen = set()
+    count = 0
+    try:
+        for job in jobs:
+            if max_jobs is not None and count >= max_jobs:
+                return
+            key = job['url'] or (job['title'], job['company'], job['location'])
+            if key in seen:
+                continue
+            seen.add(key)
+            count += 1
+            yield job
+    finally:
+        # Stopping early should stop whatever is still producing jobs
+        close = getattr(jobs, 'close', None)
+        if close:
+            close()
+
+
+class JsonLinesWriter:
+    """Append jobs to a JSON Lines file, one flushed line per job"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.count = 0
+
+    def write(self, job):
+        record = dict(job)
+        if isinstance(record.get('posting_date'), datetime):
+            record['posting_date'] = record['posting_date'].isoformat()
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BatchUploader:
+    """Upload jobs to the bulk endpoint in batches, from background threads.
+
+    Up to concurrency batches are in flight at once, through one Uploader
+    (see uploader.py). add() only blocks when max_pending full batches are
+    already waiting, so uploading overlaps with scraping without letting
+    batches pile up.
+    """
+
+    def __init__(self, scraper, api_url=API_URL, batch_size=100, concurrency=4, max_pending=None, uploader=None):
+        self.scraper = scraper
+        self.batch_size = batch_size
+        self.batch = []
+        self.batches = queue.Queue(max_pending or concurrency)
+        self.uploader = uploader or Uploader(api_url, concurrency)
+        self.lock = threading.Lock()
+        self.success = 0
+        self.errors = 0
+        self.threads = [threading.Thread(target=self.run, name=f'upload-{i}', daemon=True) for i in range(concurrency)]
+        for thread in self.threads:
+            thread.start()
+
+    @property
+    def stats(self):
+        return self.uploader.stats
+
+    def add(self, job):
+        self.batch.append(job)
+        if len(self.batch) >= self.batch_size:
+            self.batches.put(self.batch)
+            self.batch = []
+
+    def run(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                return
+            success, errors = self.scraper.send_batch(batch, self.uploader)
+            with self.lock:
+                self.success += success
+                self.errors += errors
+
+    def close(self):
+        """Send what is left and wait for every batch to finish"""
+        if self.batch:
+            self.batches.put(self.batch)
+            self.batch = []
+        for _ in self.threads:
+            self.batches.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.uploader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def deliver(jobs, writer=None, uploader=None, timer=None):
+    """Save and upload jobs as they arrive; returns counts for the run summary"""
+    stats = {'jobs': 0, 'titles': 0, 'companies': 0, 'locations': 0}
+    for job in jobs:
+        if writer:
+            with timer.phase('save') if timer else nullcontext():
+                writer.write(job)
+        if uploader:
+            uploader.add(job)
+        stats['jobs'] += 1
+        stats['titles'] += bool(job['title'])
+        stats['companies'] += bool(job['company'])
+        stats['locations'] += bool(job['location'])
+    return stats
@@ -0,0 +1,149 @@
+"""Re-parse saved page sources offline, on every core.
+
+When the parsing rules change, archived snapshots of listing pages (like
+debug_page_source.html) can be parsed again without a browser or the
+network. Each file is parsed in a worker process with the same card
+extraction ActuaryListScraper uses on a live page (parse_job_cards), or
+from the embedded Next.js data with --mode next-data/auto. Jobs stream
+back in file order and are appended to a JSON Lines file, uploaded
+through the bulk endpoint, or both:
+
+    python reparse.py snapshots/ --output reparsed_jobs.jsonl
+    python reparse.py snapshots/ --pattern '**/*.html.gz' --upload --unique
+
+Set CARD_RULES (or pass --rules) to re-parse with a different rules file.
+"""
+import argparse
+import glob
+import gzip
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from job_cards import BASE_URL, parse_job_cards, parse_next_data
+from pipeline import BatchUploader, JsonLinesWriter, deliver, unique_jobs
+from scrape import BaseScraper
+from uploader import API_URL
+
+MODES = ('cards', 'next-data', 'auto')
+
+
+def read_page(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as page_file:
+        return page_file.read()
+
+
+def parse_file(path, base_url=BASE_URL, mode='cards'):
+    """(path, jobs, error) for one saved page source; runs in a worker process"""
+    try:
+        page_source = read_page(path)
+        jobs = None
+        if mode != 'cards':
+            jobs, _ = parse_next_data(page_source, base_url)
+        if jobs is None and mode != 'next-data':
+            jobs = parse_job_cards(page_source, base_url)
+        for job in jobs or []:
+            job['source'] = path
+        return path, jobs or [], None
+    except Exception as e:
+        return path, [], str(e)
+
+
+def find_pages(directory, pattern='*.html'):
+    """Files under directory matching pattern (which may use **), sorted by path"""
+    return sorted(path for path in glob.glob(os.path.join(directory, pattern), recursive=True)
+                  if os.path.isfile(path))
+
+
+class Reparser:
+    """Parse page files in a process pool and yield their jobs in file order"""
+
+    def __init__(self, workers=None, base_url=BASE_URL, mode='cards'):
+        self.workers = workers or os.cpu_count() or 1
+        self.base_url = base_url
+        self.mode = mode
+        self.files = 0
+        self.failed = []
+        self.jobs = 0
+
+    def iter_jobs(self, paths):
+        """Jobs of every file in paths; a few files per worker are in flight at a time"""
+        paths = iter(paths)
+        # Upload threads may already be running, so start clean processes rather than forking them
+        with ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            pending = deque()
+            for path in paths:
+                pending.append(executor.submit(parse_file, path, self.base_url, self.mode))
+                if len(pending) >= self.workers * 4:
+                    yield from self.collect(pending.popleft())
+            while pending:
+                yield from self.collect(pending.popleft())
+
+    def collect(self, future):
+        path, jobs, error = future.result()
+        self.files += 1
+        if error:
+            print(f" Could not parse {path}: {error}")
+            self.failed.append(path)
+        self.jobs += len(jobs)
+        return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse saved listing page sources in parallel")
+    parser.add_argument('directory')
+    parser.add_argument('--pattern', default='*.html', help="glob under directory, e.g. '**/*.html*'")
+    parser.add_argument('--mode', choices=MODES, default='cards',
+                        help="cards parses the rendered job cards like the browser scraper; next-data reads "
+                             "the embedded JSON; auto tries next-data first")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--base-url', default=BASE_URL, help="site the pages were saved from, for relative links")
+    parser.add_argument('--rules', help="card rules file (default card_rules.json)")
+    parser.add_argument('--unique', action='store_true', help="keep only the first copy of each listing")
+    parser.add_argument('--output', help="JSON Lines file jobs are appended to (default reparsed_jobs.jsonl "
+                                         "unless --upload is given)")
+    parser.add_argument('--upload', action='store_true', help="send the jobs to the bulk endpoint")
+    parser.add_argument('--api-url', default=API_URL)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--uploads', type=int, default=4, help="upload requests in flight at once")
+    args = parser.parse_args()
+
+    if args.rules:
+        # Worker processes inherit the environment, so they load the same rules
+        os.environ['CARD_RULES'] = os.path.abspath(args.rules)
+    output = args.output or (None if args.upload else 'reparsed_jobs.jsonl')
+
+    paths = find_pages(args.directory, args.pattern)
+    if not paths:
+        print(f" No files matching {args.pattern} in {args.directory}")
+        return
+
+    started = time.time()
+    reparser = Reparser(args.workers, args.base_url, args.mode)
+    print(f" Re-parsing {len(paths)} files with {reparser.workers} processes...")
+    jobs = reparser.iter_jobs(paths)
+    if args.unique:
+        jobs = unique_jobs(jobs)
+
+    scraper = BaseScraper()
+    with JsonLinesWriter(output) if output else nullcontext() as writer, \
+            BatchUploader(scraper, args.api_url, args.batch_size, args.uploads) if args.upload else nullcontext() \
+            as uploader:
+        stats = deliver(jobs, writer, uploader)
+
+    elapsed = time.time() - started
+    print(f" Parsed {reparser.files} files ({len(reparser.failed)} failed) in {elapsed:.1f}s: "
+          f"{reparser.files / elapsed:.1f} files/s, {reparser.jobs} jobs, {stats['jobs']} delivered")
+    if output:
+        print(f" Data appended to {output}")
+    if uploader:
+        print(f"📡 Sent {uploader.success} jobs to API with {uploader.errors} errors")
+        uploader.stats.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,217 @@
+import argparse
 import time
 import re
-import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 import requests
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-class ActuaryListScraper:
-    def __init__(self, headless=False):
-        self.driver = None
+from job_cards import (
+    ACTUARYLIST_SELECTORS, BASE_URL, GENERIC_SELECTORS, absolute_url, find_job_cards, html_to_text, jobs_from_cards,
+    listing_hash, listing_page_url, next_data, parse_html, parse_job_card, parse_next_data
+)
+
+from card_parser import default_parser
+from crawl_state import CrawlState
+from pipeline import BatchUploader, JsonLinesWriter, Stage, deliver, unique_jobs
+from uploader import API_URL, Uploader
+from waits import (
+    COOKIE_SELECTOR, COOKIE_TEXT, LOAD_MORE_SELECTOR, LOAD_MORE_TEXT, CardsGrewOrSettled, PhaseTimer, TimeBudget,
+    click_first, document_complete, page_state, wait_until
+)
+
+# Shortest timeout given to a request near the end of the time budget, in seconds
+MIN_FETCH_TIMEOUT = 0.1
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def create_chrome_driver(headless=False):
+    """Start a Chrome WebDriver configured for scraping"""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+    
+    chrome_options.add_argument("--log-level=3")
+    chrome_options.add_argument("--silent")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    
+    # Waits are explicit (see waits.py); an implicit wait would stall every lookup that finds nothing
+    driver.implicitly_wait(0)
+    return driver
+
+
+class BaseScraper:
+    """Scraped jobs plus saving them to JSON and sending them to the API.
+    
+    budget (a TimeBudget) bounds the whole run and timer (a PhaseTimer)
+    records time per phase; both can be shared by several scrapers. With a
+    state (a CrawlState), listings unchanged since the last run are skipped
+    before parsing.
+    """
+    
+    def __init__(self, budget=None, timer=None, state=None):
         self.jobs_data = []
-        self.base_url = "https://www.actuarylist.com"
-        self.jobs_url = "https://www.actuarylist.com"
-        self.headless = headless
-        self.setup_driver()
+        self.base_url = BASE_URL
+        self.jobs_url = BASE_URL
+        self.budget = budget or TimeBudget()
+        self.timer = timer or PhaseTimer()
+        self.state = state
+        # url -> API job id for every job the API accepted
+        self.job_ids = {}
+        # Whether the last scrape saw every listing on the site (needed to report removed ones)
+        self.complete = False
     
-    def setup_driver(self):
+    @property
+    def keep(self):
+        return self.state.should_parse if self.state else None
+    
+    def save_to_json(self, filename='scraped_jobs.json'):
+        """Save scraped data to JSON file"""
         try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+            json_data = []
+            for job in self.jobs_data:
+                job_copy = job.copy()
+                if isinstance(job_copy['posting_date'], datetime):
+                    job_copy['posting_date'] = job_copy['posting_date'].isoformat()
+                json_data.append(job_copy)
             
-            chrome_options.add_argument("--log-level=3")
-            chrome_options.add_argument("--silent")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(json_data, f, indent=2, ensure_ascii=False)
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            print(f" Data saved to {filename}")
+            return True
+        except Exception as e:
+            print(f" Error saving to JSON: {str(e)}")
+            return False
+    
+    def build_api_payload(self, job):
+        """Convert a scraped job into the JSON shape expected by the Flask API"""
+        api_data = {
+            'title': job['title'],
+            'company': job['company'],
+            'location': job['location'],
+            'job_type': job['job_type'],
+            'tags': job['tags'] if job['tags'] else ['Actuary'],
+            'description': job.get('description', ''),
+            'url': job.get('url', ''),
+            'posting_date': job['posting_date'].isoformat() if isinstance(job['posting_date'], datetime) else job['posting_date']
+        }
+        
+        # Ensure all required fields have values
+        for required_field in ['title', 'company', 'location']:
+            if not api_data[required_field] or api_data[required_field].strip() == '':
+                api_data[required_field] = "Not specified"
+        
+        return api_data
+    
+    def send_batch(self, batch, uploader):
+        """Upsert one batch of jobs through the bulk endpoint; returns (success, errors)"""
+        try:
+            payload = [self.build_api_payload(job) for job in batch]
+            with self.timer.phase('upload'):
+                # Upsert so re-scraped listings update existing jobs instead of duplicating them
+                response = uploader.post('/bulk?upsert=1', payload)
+            
+            if response.status_code in (201, 207):
+                result = response.json()['data']
+                for item in result['created'] + result['updated'] + result['unchanged']:
+                    self.job_ids[batch[item['index']].get('url', '')] = item['id']
+                success = len(result['created']) + len(result['updated']) + len(result['unchanged'])
+                uploader.stats.add_jobs(success)
+                print(f" Sent batch of {len(batch)} to API: {len(result['created'])} created, "
+                      f"{len(result['updated'])} updated, {len(result['unchanged'])} unchanged")
+                for error in result['errors']:
+                    print(f" Error sending {batch[error['index']]['title']}: {error['errors']}")
+                return success, len(result['errors'])
             
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            try:
+                error_detail = response.json()
+                print(f" Error sending batch: {error_detail}")
+            except:
+                print(f" Error sending batch: {response.text}")
+                
+        except requests.exceptions.RequestException as e:
+            print(f" Network error sending jobs to API: {str(e)}")
+        except Exception as e:
+            print(f" Error sending jobs to API: {str(e)}")
+        return 0, len(batch)
+    
+    def send_to_api(self, api_url=API_URL, batch_size=500, concurrency=4):
+        """Send scraped data to the Flask bulk endpoint, concurrency batches at a time"""
+        if not self.jobs_data:
+            print("No job data to send to API")
+            return 0, 0
             
-            self.driver.implicitly_wait(10)
+        batches = [self.jobs_data[start:start + batch_size] for start in range(0, len(self.jobs_data), batch_size)]
+        with Uploader(api_url, concurrency) as uploader, ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(lambda batch: self.send_batch(batch, uploader), batches))
+        success_count = sum(success for success, _ in results)
+        error_count = sum(errors for _, errors in results)
+        
+        print(f" API upload complete: {success_count} successful, {error_count} errors")
+        uploader.stats.report()
+        return success_count, error_count
+    
+    def expire_jobs(self, job_ids, api_url=API_URL):
+        """Delete jobs whose listings have been removed from the site; returns how many were deleted"""
+        deleted = 0
+        with Uploader(api_url, concurrency=1, timeout=10) as uploader:
+            for job_id in job_ids:
+                try:
+                    response = uploader.request('DELETE', f"/{job_id}")
+                    # Already gone counts as expired
+                    if response.status_code in (200, 404):
+                        deleted += 1
+                    else:
+                        print(f" Error expiring job {job_id}: HTTP {response.status_code}")
+                except requests.exceptions.RequestException as e:
+                    print(f" Network error expiring job {job_id}: {str(e)}")
+        print(f" Expired {deleted} removed jobs")
+        return deleted
+    
+    def close(self):
+        pass
+
+
+class ActuaryListScraper(BaseScraper):
+    def __init__(self, headless=False, driver=None, parse_mode='snapshot', budget=None, timer=None, state=None):
+        super().__init__(budget, timer, state)
+        self.driver = driver
+        self.headless = headless
+        # 'snapshot' parses cards from one page_source read; 'elements' reads each card over WebDriver
+        self.parse_mode = parse_mode
+        self.cards_found = False
+        # A driver passed in (e.g. from a DriverPool) belongs to the caller and is not quit by close()
+        self.owns_driver = driver is None
+        if driver is None:
+            self.setup_driver()
+    
+    def setup_driver(self):
+        try:
+            self.driver = create_chrome_driver(self.headless)
             print("Chrome WebDriver initialized successfully")
             
         except Exception as e:
@@ -55,134 +220,56 @@ class ActuaryListScraper:
             raise
     
     def wait_for_page_load(self, timeout=20):
-        """Wait for page to load completely with enhanced waiting"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
-            print("Page loaded, waiting for dynamic content...")
-            
-            time.sleep(5)
-            
-            loading_selectors = [
-                "[class*='loading']", "[class*='spinner']", "[id*='loading']",
-                ".loader", "#loader", ".loading-overlay"
-            ]
-            
-            for selector in loading_selectors:
-                try:
-                    WebDriverWait(self.driver, 3).until(
-                        EC.invisibility_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                except:
-                    continue
-                    
-        except TimeoutException:
+        """Wait until the page has rendered its job cards, or has settled without any"""
+        state = wait_until(self.driver, document_complete, timeout, self.budget)
+        if not state:
             print("Page load timeout, continuing anyway...")
+            return
+        
+        # Cards are rendered server-side on ActuaryList, so they are usually there already
+        if state['cards'] and not state['loaders']:
+            return
+        if not wait_until(self.driver, CardsGrewOrSettled(0), timeout, self.budget):
+            print("Page did not settle, continuing anyway...")
     
-    def handle_cookie_consent(self):
-        """Handle cookie consent popup if present"""
-        try:
-            cookie_selectors = [
-                "button[aria-label*='Accept']",
-                "button[aria-label*='accept']",
-                "button:contains('Accept')",
-                "button:contains('OK')",
-                "button:contains('Agree')",
-                ".cookie-accept",
-                "#cookie-accept",
-                "[data-testid*='accept']",
-                ".accept-cookies",
-                "#accept-cookies"
-            ]
-            
-            for selector in cookie_selectors:
-                try:
-                    cookie_button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    cookie_button.click()
-                    print("Cookie consent handled")
-                    time.sleep(2)
-                    return
-                except:
-                    continue
-                    
-        except Exception as e:
-            print("No cookie consent found or could not handle it")
+    def handle_cookie_consent(self, timeout=2):
+        """Accept the cookie banner if one shows up within timeout seconds"""
+        if wait_until(self.driver, lambda driver: click_first(driver, COOKIE_SELECTOR, COOKIE_TEXT),
+                      timeout, self.budget):
+            print("Cookie consent handled")
     
-    def smart_scroll_and_load(self):
-        """Smart scrolling to load dynamic content"""
+    def smart_scroll_and_load(self, max_attempts=10):
+        """Scroll (and click load-more buttons) until no more job cards appear"""
         print("Attempting to load all jobs...")
         
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        jobs_loaded_count = 0
-        attempts = 0
-        max_attempts = 10
-        
-        while attempts < max_attempts:
-            # Scroll down
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            print(f"Scrolled to bottom (attempt {attempts + 1})")
-            
-            # Wait for new content to load
-            time.sleep(3)
-            
-            # Check for "Load More" type buttons
-            load_more_buttons = [
-                "button:contains('Load More')", "button:contains('Show More')",
-                "button:contains('Load more')", "button:contains('Show more')",
-                ".load-more", "#load-more", ".show-more", "#show-more",
-                "[data-testid*='load']", "[data-testid*='more']"
-            ]
-            
-            for selector in load_more_buttons:
-                try:
-                    button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if button.is_displayed() and button.is_enabled():
-                        self.driver.execute_script("arguments[0].click();", button)
-                        print(f"Clicked load more button")
-                        time.sleep(3)
-                        break
-                except:
-                    continue
-            
-            # Check if new content loaded
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+        cards = page_state(self.driver)['cards']
+        for attempt in range(max_attempts):
+            if self.budget.expired:
+                print("Time budget used up, parsing what has loaded")
+                break
             
-            # Also check for job-like elements
-            current_job_count = len(self.driver.find_elements(By.CSS_SELECTOR, "*"))  # Get total elements
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            click_first(self.driver, LOAD_MORE_SELECTOR, LOAD_MORE_TEXT)
             
-            if new_height == last_height and current_job_count == jobs_loaded_count:
-                print("No new content loaded, stopping...")
+            state = wait_until(self.driver, CardsGrewOrSettled(cards), 10, self.budget)
+            if not state or state['cards'] <= cards:
+                print(f"No new jobs after scroll {attempt + 1}, stopping...")
                 break
-            
-            last_height = new_height
-            jobs_loaded_count = current_job_count
-            attempts += 1
+            print(f"Scroll {attempt + 1} loaded {state['cards'] - cards} more job cards")
+            cards = state['cards']
         
         # Scroll back to top to ensure all elements are in view
         self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
     
     def find_job_elements(self):
         """Enhanced job element detection specifically for actuarylist.com"""
         print("Searching for job elements...")
         
-        # Based on the debug output, try specific ActuaryList.com selectors first
-        actuarylist_selectors = [
-            '[class*="Job_job-card"]',  
-            '.Job_job-card__YgDAV',
-            'div[class*="job-card"]',
-            'div[class*="Job_job"]',
-            '[class*="job-"]'
-        ]
-        
         job_elements = []
         successful_selector = None
         
         # Try ActuaryList specific selectors first
-        for selector in actuarylist_selectors:
+        for selector in ACTUARYLIST_SELECTORS:
             try:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 if elements:
@@ -205,21 +292,12 @@ class ActuaryListScraper:
                         print(f"Found {len(valid_elements)} job elements using ActuaryList selector: {selector}")
                         break
                         
-            except Exception as e:
+            except Exception:
                 continue
         
         # If ActuaryList selectors don't work, try generic ones
         if not job_elements:
-            generic_selectors = [
-                '[class*="job"]', '[id*="job"]',
-                '[class*="listing"]', '[id*="listing"]',
-                '[class*="position"]', '[id*="position"]',
-                '.card', '.item', '.entry', '.post',
-                'li[class*="job"]', 'li[class*="listing"]',
-                'a[href*="/job"]', 'a[href*="/jobs"]'
-            ]
-            
-            for selector in generic_selectors:
+            for selector in GENERIC_SELECTORS:
                 try:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     valid_elements = []
@@ -237,188 +315,40 @@ class ActuaryListScraper:
                         print(f"Found {len(valid_elements)} job elements using generic selector: {selector}")
                         break
                         
-                except Exception as e:
+                except Exception:
                     continue
         
         return job_elements, successful_selector
     
-    def extract_job_data_enhanced(self, job_element):
-        """Enhanced job data extraction with better parsing logic"""
-        job_data = {
-            'title': '',
-            'company': '',
-            'location': '',
-            'posting_date': datetime.now(),
-            'job_type': 'Full-time',
-            'tags': [],
-            'description': '',
-            'url': ''
-        }
-        
+    def read_job_element(self, job_element):
+        """A card element's text and first link (two WebDriver round trips)"""
         try:
-            # Get all text content
-            all_text = job_element.text.strip()
-            lines = [line.strip() for line in all_text.split('\n') if line.strip()]
-            
-            # Extract URL first
-            try:
-                link_element = job_element.find_element(By.TAG_NAME, "a")
-                href = link_element.get_attribute("href")
-                if href:
-                    job_data['url'] = href if href.startswith('http') else self.base_url + href
-            except:
-                pass
-            
-            # Parse based on ActuaryList structure (from debug output)
-            # Expected structure: Company, Title, Location flag, Location, Tags...
-            if lines:
-                # First non-empty line is often the company or title
-                potential_company = lines[0] if lines else ""
-                potential_title = lines[1] if len(lines) > 1 else ""
-                
-                # Look for location indicators (🇬🇧, 🇺🇸, etc.)
-                location_info = []
-                title_candidates = []
-                company_candidates = []
-                
-                for i, line in enumerate(lines):
-                    # Check for emoji flags (location indicators)
-                    if any(emoji in line for emoji in ['🇬🇧', '🇺🇸', '🇨🇦', '🇦🇺', '🇩🇪', '🇫🇷']):
-                        # This line and potentially next ones are location
-                        location_parts = [line]
-                        if i + 1 < len(lines) and not any(keyword in lines[i + 1].lower() 
-                                                        for keyword in ['actuary', 'analyst', 'manager', 'director', 'senior', 'junior']):
-                            location_parts.append(lines[i + 1])
-                        location_info = location_parts
-                        continue
-                    
-                    # Check for job titles (containing actuary-related terms)
-                    if any(keyword in line.lower() for keyword in ['actuary', 'analyst', 'manager', 'director', 'senior', 'junior', 'consultant']):
-                        if len(line) < 100:  # Reasonable title length
-                            title_candidates.append(line)
-                    
-                    # Check for company names (shorter, corporate-sounding)
-                    elif len(line) < 50 and i < 3:  # Company usually in first few lines
-                        company_candidates.append(line)
-                
-                # Assign title
-                if title_candidates:
-                    job_data['title'] = title_candidates[0]
-                elif len(lines) > 1:
-                    job_data['title'] = lines[1]  # Default to second line
-                else:
-                    job_data['title'] = lines[0] if lines else "Actuarial Position"
-                
-                # Assign company - prefer shorter names that appear early
-                if company_candidates:
-                    # Choose the shortest reasonable company name
-                    company_candidates.sort(key=len)
-                    for candidate in company_candidates:
-                        if 3 <= len(candidate) <= 50:  # Reasonable company name length
-                            job_data['company'] = candidate
-                            break
-                
-                # If still no company, use first line if it's not the title
-                if not job_data['company'] and lines:
-                    if lines[0] != job_data['title']:
-                        job_data['company'] = lines[0]
-                
-                # Assign location
-                if location_info:
-                    job_data['location'] = ' '.join(location_info).replace('🇬🇧', 'UK').replace('🇺🇸', 'USA')
-                else:
-                    # Look for location patterns in text
-                    location_patterns = [
-                        r'(London|New York|Chicago|Toronto|Sydney|Berlin|Paris|Remote|Hybrid)',
-                        r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, ST
-                        r'(UK|USA|US|Canada|Australia|Germany|France)'
-                    ]
-                    
-                    for pattern in location_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match:
-                            job_data['location'] = match.group(1)
-                            break
-                
-                # Extract tags from remaining lines
-                tag_keywords = ['actuary', 'fellow', 'life', 'investments', 'pensions', 'insurance', 'risk', 'analytics']
-                for line in lines:
-                    line_lower = line.lower()
-                    if any(keyword in line_lower for keyword in tag_keywords) and len(line) < 30:
-                        if line not in job_data['tags']:
-                            job_data['tags'].append(line)
-                
-                # Set description
-                job_data['description'] = ' '.join(lines[:5])  # First 5 lines as description
-            
-            # Fallback values to ensure required fields
-            if not job_data['title']:
-                job_data['title'] = "Actuarial Position"
-            if not job_data['company']:
-                job_data['company'] = "Unknown Company"
-            if not job_data['location']:
-                job_data['location'] = "Location Not Specified"
-            
-            # Clean up fields
-            job_data['title'] = job_data['title'][:100]  # Limit length
-            job_data['company'] = job_data['company'][:100]
-            job_data['location'] = job_data['location'][:100]
-            job_data['description'] = job_data['description'][:500]
-            
+            all_text = job_element.text
         except Exception as e:
             print(f"Error extracting job data: {str(e)}")
-            # Set minimum required fields even on error
-            if not job_data['title']:
-                job_data['title'] = "Actuarial Position"
-            if not job_data['company']:
-                job_data['company'] = "Unknown Company"
-            if not job_data['location']:
-                job_data['location'] = "Location Not Specified"
-        
-        return job_data
+            all_text = ''
+        try:
+            href = job_element.find_element(By.TAG_NAME, "a").get_attribute("href")
+        except:
+            href = None
+        return all_text, href
+    
+    def extract_job_data_enhanced(self, job_element):
+        """Enhanced job data extraction with better parsing logic"""
+        all_text, href = self.read_job_element(job_element)
+        return parse_job_card(all_text, href, self.base_url)
     
     def scrape_jobs(self, max_jobs=10, debug=True):
         """Main scraping method with enhanced parsing"""
         try:
-            print(f"Navigating to {self.jobs_url}")
-            self.driver.get(self.jobs_url)
-            self.wait_for_page_load()
-            
-            # Handle cookie consent
-            self.handle_cookie_consent()
+            self.scrape_page(self.jobs_url, max_jobs)
             
-            # Smart scroll to load content
-            self.smart_scroll_and_load()
-            
-            # Find job elements
-            job_elements, successful_selector = self.find_job_elements()
-            
-            if job_elements:
-                print(f" Found {len(job_elements)} job elements")
-                print(f"Processing up to {min(len(job_elements), max_jobs)} jobs...")
-                
-                processed = 0
-                for i, job_element in enumerate(job_elements[:max_jobs]):
-                    try:
-                        job_data = self.extract_job_data_enhanced(job_element)
-                        
-                        # Always add the job (we ensure required fields in extraction)
-                        self.jobs_data.append(job_data)
-                        processed += 1
-                        print(f" Job {processed}: {job_data['title']} at {job_data['company']}")
-                        print(f"   Location: {job_data['location']}")
-                        if job_data['url']:
-                            print(f"   URL: {job_data['url']}")
-                            
-                    except Exception as e:
-                        print(f" Error processing job element {i}: {str(e)}")
-                        continue
-                
-                print(f"\n Successfully scraped {len(self.jobs_data)} jobs")
-            else:
-                print(" No job elements could be found")
+            if not self.cards_found:
                 # Try to extract from page source as last resort
                 self.extract_from_page_source(max_jobs)
+            else:
+                # Later listing pages are only reached by crawler.py
+                self.complete = max_jobs is None and self.listing_page_count() == 1
             
             return self.jobs_data
             
@@ -426,6 +356,119 @@ class ActuaryListScraper:
             print(f" Error in scrape_jobs: {str(e)}")
             return []
     
+    def stream_jobs(self, max_jobs=10):
+        """The jobs of scrape_jobs as an iterator (the browser reads one listing page)"""
+        return iter(self.scrape_jobs(max_jobs))
+    
+    def scrape_page(self, url, max_jobs=None):
+        """Load one listing page and parse its job cards into self.jobs_data.
+        
+        Returns the jobs parsed from this page. WebDriver errors propagate so
+        callers can retry the page.
+        """
+        print(f"Navigating to {url}")
+        with self.timer.phase('navigate'):
+            self.driver.get(url)
+        with self.timer.phase('load'):
+            self.wait_for_page_load()
+        
+        with self.timer.phase('cookies'):
+            self.handle_cookie_consent()
+        
+        with self.timer.phase('scroll'):
+            self.smart_scroll_and_load()
+        
+        with self.timer.phase('parse'):
+            if self.parse_mode == 'snapshot':
+                jobs = self.parse_page_source(max_jobs)
+            else:
+                jobs = self.parse_job_elements(max_jobs)
+        
+        self.jobs_data.extend(jobs)
+        print(f"\n Successfully scraped {len(jobs)} jobs")
+        return jobs
+    
+    def parse_page_source(self, max_jobs=None):
+        """Parse every job card from a single page_source snapshot"""
+        cards, _ = find_job_cards(parse_html(self.driver.page_source))
+        self.cards_found = bool(cards)
+        if not cards:
+            print(" No job elements could be found")
+        jobs = jobs_from_cards(cards, self.base_url, max_jobs, self.keep)
+        for job_data in jobs:
+            print(f" Job: {job_data['title']} at {job_data['company']}")
+        return jobs
+    
+    def parse_job_elements(self, max_jobs=None):
+        """Parse job cards one WebDriver element at a time"""
+        job_elements, successful_selector = self.find_job_elements()
+        self.cards_found = bool(job_elements)
+        
+        if not job_elements:
+            print(" No job elements could be found")
+            return []
+        
+        if max_jobs is None:
+            max_jobs = len(job_elements)
+        print(f" Found {len(job_elements)} job elements")
+        print(f"Processing up to {min(len(job_elements), max_jobs)} jobs...")
+        
+        cards = []
+        keep = self.keep
+        for i, job_element in enumerate(job_elements[:max_jobs]):
+            try:
+                all_text, href = self.read_job_element(job_element)
+                url = absolute_url(href, self.base_url)
+                if keep is not None and not keep(url, listing_hash(all_text, url)):
+                    continue
+                cards.append((all_text, url))
+            except Exception as e:
+                print(f" Error processing job element {i}: {str(e)}")
+                continue
+        
+        # Every card read from the page is parsed as one batch
+        jobs = default_parser().parse_many(cards)
+        for number, job_data in enumerate(jobs, 1):
+            print(f" Job {number}: {job_data['title']} at {job_data['company']}")
+            print(f"   Location: {job_data['location']}")
+            if job_data['url']:
+                print(f"   URL: {job_data['url']}")
+        
+        return jobs
+    
+    def listing_page_count(self):
+        """Number of listing pages reported by the current page (1 if unknown)"""
+        _, page_count = parse_next_data(self.driver.page_source, self.base_url)
+        return page_count
+    
+    def category_links(self, kinds=('sectors', 'countries', 'cities', 'experience-levels')):
+        """Absolute URLs of the category pages linked from the current page"""
+        links = []
+        for kind in kinds:
+            for element in self.driver.find_elements(By.CSS_SELECTOR, f'a[href^="/{kind}/"]'):
+                href = element.get_attribute("href")
+                if href and href not in links:
+                    links.append(href)
+        return links
+    
+    def scrape_job_details(self, url):
+        """Load a job's detail page and return its description text"""
+        with self.timer.phase('navigate'):
+            self.driver.get(url)
+        with self.timer.phase('load'):
+            self.wait_for_page_load()
+        
+        props = next_data(self.driver.page_source) or {}
+        job = props.get('job') or props.get('jobData') or {}
+        description = html_to_text(job.get('description')) if isinstance(job, dict) else ''
+        
+        if not description:
+            try:
+                description = self.driver.find_element(By.TAG_NAME, "main").text
+            except NoSuchElementException:
+                description = self.driver.find_element(By.TAG_NAME, "body").text
+        return ' '.join(description.split())[:500]
+    
     def extract_from_page_source(self, max_jobs):
         """Last resort: extract job info from page source"""
         try:
@@ -471,117 +514,270 @@ class ActuaryListScraper:
         except Exception as e:
             print(f" Error extracting from page source: {str(e)}")
     
-    def save_to_json(self, filename='scraped_jobs.json'):
-        """Save scraped data to JSON file"""
+    def close(self):
+        """Close the WebDriver"""
+        if self.driver and self.owns_driver:
+            self.driver.quit()
+            print(" WebDriver closed")
+
+
+class HttpScraper(BaseScraper):
+    """Scrape listing pages over plain HTTP, without a browser.
+    
+    ActuaryList renders its listing pages on the server and embeds the jobs
+    as JSON (__NEXT_DATA__), so a page is a single GET on a pooled keep-alive
+    session. Once the first page tells how many pages there are, the rest are
+    fetched concurrently. scrape_jobs returns None when the site stops
+    serving that data, so callers can fall back to ActuaryListScraper.
+    """
+    
+    def __init__(self, workers=8, timeout=15, session=None, budget=None, timer=None, state=None):
+        super().__init__(budget, timer, state)
+        self.workers = workers
+        self.timeout = timeout
+        self.session = session or self.create_session(workers)
+    
+    @staticmethod
+    def create_session(pool_size):
+        """A session keeping up to pool_size connections alive, retrying failed GETs"""
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+    
+    def fetch_text(self, url):
+        """The source of one page"""
+        with self.timer.phase('fetch'):
+            if self.budget.expired:
+                raise requests.exceptions.Timeout('Time budget used up')
+            # requests rejects a zero timeout, which cap() returns as the budget runs out
+            timeout = max(self.budget.cap(self.timeout), MIN_FETCH_TIMEOUT)
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            if 'charset' not in response.headers.get('Content-Type', ''):
+                # requests assumes ISO-8859-1 without a charset, which garbles non-ASCII text and its hashes
+                response.encoding = 'utf-8'
+            return response.text
+    
+    def parse_page(self, page_source):
+        """(jobs, page_count) for one listing page; jobs is None if the page has no job data"""
+        with self.timer.phase('parse'):
+            jobs, page_count = parse_next_data(page_source, self.base_url, self.keep)
+            if jobs is None:
+                # Server-rendered cards without the embedded data still parse without a browser
+                cards, _ = find_job_cards(parse_html(page_source))
+                jobs = jobs_from_cards(cards, self.base_url, keep=self.keep) if cards else None
+                page_count = 1
+        return jobs, page_count
+    
+    def fetch_page(self, url):
+        """(jobs, page_count) for one listing page; jobs is None if the page has no job data"""
+        return self.parse_page(self.fetch_text(url))
+    
+    def fetch_later_page(self, url):
+        """The source of a page after the first, or None; errors are reported, not raised"""
+        if self.budget.expired:
+            return None
         try:
-            json_data = []
-            for job in self.jobs_data:
-                job_copy = job.copy()
-                if isinstance(job_copy['posting_date'], datetime):
-                    job_copy['posting_date'] = job_copy['posting_date'].isoformat()
-                json_data.append(job_copy)
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
-            
-            print(f" Data saved to {filename}")
-            return True
-        except Exception as e:
-            print(f" Error saving to JSON: {str(e)}")
-            return False
+            return self.fetch_text(url)
+        except requests.exceptions.RequestException as e:
+            print(f" Error fetching {url}: {str(e)}")
+            return None
     
-    def send_to_api(self, api_url='http://localhost:5000/api/jobs'):
-        """Send scraped data to Flask API with better error handling"""
-        if not self.jobs_data:
-            print("No job data to send to API")
-            return 0, 0
-            
-        success_count = 0
-        error_count = 0
+    def iter_page_sources(self, urls):
+        """Page sources of urls (None for a failed page) in the order they arrive.
         
-        for job in self.jobs_data:
-            try:
-                api_data = {
-                    'title': job['title'],
-                    'company': job['company'],
-                    'location': job['location'],
-                    'job_type': job['job_type'],
-                    'tags': job['tags'] if job['tags'] else ['Actuary'],
-                    'description': job.get('description', ''),
-                    'url': job.get('url', ''),
-                    'posting_date': job['posting_date'].isoformat() if isinstance(job['posting_date'], datetime) else job['posting_date']
-                }
-                
-                # Ensure all required fields have values
-                for required_field in ['title', 'company', 'location']:
-                    if not api_data[required_field] or api_data[required_field].strip() == '':
-                        api_data[required_field] = f"Not specified"
-                
-                response = requests.post(api_url, json=api_data, timeout=10)
-                
-                if response.status_code == 201:
-                    success_count += 1
-                    print(f" Sent to API: {job['title']}")
-                else:
-                    error_count += 1
-                    try:
-                        error_detail = response.json()
-                        print(f" Error sending {job['title']}: {error_detail}")
-                    except:
-                        print(f" Error sending {job['title']}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                error_count += 1
-                print(f" Network error sending job to API: {str(e)}")
-            except Exception as e:
-                error_count += 1
-                print(f" Error sending job to API: {str(e)}")
+        At most workers pages are in flight, so fetching runs ahead of
+        parsing by a bounded amount.
+        """
+        urls = iter(urls)
+        executor = ThreadPoolExecutor(self.workers)
+        try:
+            pending = {executor.submit(self.fetch_later_page, url) for url in islice(urls, self.workers)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = next(urls, None)
+                    if url:
+                        pending.add(executor.submit(self.fetch_later_page, url))
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def stream_jobs(self, max_jobs=None, max_pages=None):
+        """Fetch the first page and return a generator of the jobs on every page.
         
-        print(f" API upload complete: {success_count} successful, {error_count} errors")
-        return success_count, error_count
+        Returns None if HTTP scraping is not possible. Later pages are
+        fetched in a background stage while the caller consumes the jobs.
+        """
+        started = time.time()
+        print(f"Fetching {self.jobs_url}")
+        try:
+            jobs, total_pages = self.fetch_page(self.jobs_url)
+        except requests.exceptions.RequestException as e:
+            print(f" HTTP scraping failed: {str(e)}")
+            return None
+        if jobs is None:
+            print(" No job data found in the page")
+            return None
+        
+        page_count = total_pages
+        if max_pages:
+            page_count = min(page_count, max_pages)
+        if max_jobs and jobs and not self.state:
+            # Only fetch the pages needed to reach max_jobs
+            page_count = min(page_count, -(-max_jobs // len(jobs)))
+        
+        pages = [listing_page_url(self.jobs_url, page) for page in range(2, page_count + 1)]
+        return self.iter_jobs(jobs, pages, page_count == total_pages, started)
+    
+    def iter_jobs(self, first_jobs, pages, all_pages, started):
+        """first_jobs, then the jobs of each later page as its source arrives"""
+        sources = Stage(self.iter_page_sources(pages), maxsize=self.workers, name='fetch')
+        all_fetched = True
+        count = len(first_jobs)
+        try:
+            yield from first_jobs
+            for page_source in sources:
+                jobs = self.parse_page(page_source)[0] if page_source is not None else None
+                all_fetched = all_fetched and jobs is not None
+                count += len(jobs or [])
+                yield from jobs or []
+        finally:
+            sources.close()
+        # Only reached when every page was consumed
+        self.complete = all_pages and all_fetched
+        print(f" Fetched {len(pages) + 1} pages in {time.time() - started:.2f}s: {count} listings")
+    
+    def scrape_jobs(self, max_jobs=None, max_pages=None):
+        """Scrape up to max_jobs jobs (all when None); returns None if HTTP scraping is not possible"""
+        jobs = self.stream_jobs(max_jobs, max_pages)
+        if jobs is None:
+            return None
+        # Listings can shift between pages while they are fetched; keep each once
+        self.jobs_data = list(unique_jobs(jobs, max_jobs))
+        return self.jobs_data
     
     def close(self):
-        """Close the WebDriver"""
-        if self.driver:
-            self.driver.quit()
-            print(" WebDriver closed")
+        self.session.close()
+
+
+def stream_with_fallback(mode='auto', max_jobs=None, jobs_url=None, headless=False, budget=None, timer=None,
+                         state=None):
+    """Stream over HTTP when possible, otherwise scrape with the browser; returns (scraper, jobs iterator)"""
+    if mode in ('auto', 'http'):
+        scraper = HttpScraper(budget=budget, timer=timer, state=state)
+        if jobs_url:
+            scraper.jobs_url = jobs_url
+        jobs = scraper.stream_jobs(max_jobs)
+        if jobs is not None or mode == 'http':
+            # Listings can shift between pages while they are fetched; keep each once
+            return scraper, unique_jobs(jobs or [], max_jobs)
+        scraper.close()
+        print(" Falling back to the browser scraper")
+    
+    with (timer or PhaseTimer()).phase('browser'):
+        scraper = ActuaryListScraper(headless=headless, budget=budget, timer=timer, state=state)
+    if jobs_url:
+        scraper.jobs_url = jobs_url
+    return scraper, scraper.stream_jobs(max_jobs)
+
+
+def scrape_with_fallback(mode='auto', max_jobs=None, jobs_url=None, headless=False, budget=None, timer=None,
+                         state=None):
+    """Scrape over HTTP when possible, otherwise with the browser; returns (scraper, jobs)"""
+    scraper, jobs = stream_with_fallback(mode, max_jobs, jobs_url, headless, budget, timer, state)
+    scraper.jobs_data = list(jobs)
+    return scraper, scraper.jobs_data
+
+
+def finish_crawl_state(state, scraper, complete, expire=False, api_url=API_URL):
+    """Record the run in the crawl state and report (optionally expire) listings removed from the site"""
+    state.mark_delivered(scraper.job_ids)
+    disappeared = state.finish(complete)
+    print(f" Crawl state: {state.summary()}")
+    if not complete:
+        print(" Not every listing was reached, so removed listings are not reported this run")
+    elif disappeared:
+        print(f" {len(disappeared)} listings were removed from the site since the last run:")
+        for url, job_id in disappeared[:20]:
+            print(f"   {url} (job {job_id})")
+        if expire:
+            scraper.expire_jobs([job_id for _, job_id in disappeared if job_id], api_url)
+    state.close()
+    return disappeared
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape actuarial jobs from actuarylist.com")
+    parser.add_argument('--mode', choices=['auto', 'http', 'browser'], default='auto',
+                        help="http reads the job data embedded in the pages; auto falls back to the browser")
+    parser.add_argument('--max-jobs', type=int, default=10, help="0 scrapes every job")
+    parser.add_argument('--url', help="listing page to start from")
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--time-budget', type=float, help="seconds the whole run may take; waits are cut short to fit")
+    parser.add_argument('--state', default='crawl_state.db',
+                        help="crawl state file; listings unchanged since they were last uploaded are skipped")
+    parser.add_argument('--no-state', action='store_true', help="parse and upload every listing")
+    parser.add_argument('--expire-missing', action='store_true',
+                        help="delete the jobs of listings that were removed from the site")
+    parser.add_argument('--output', default='scraped_jobs.jsonl', help="JSON Lines file jobs are appended to")
+    parser.add_argument('--batch-size', type=int, default=100, help="jobs per bulk upload request")
+    parser.add_argument('--api-url', default=API_URL)
+    parser.add_argument('--uploads', type=int, default=4, help="upload requests in flight at once")
+    args = parser.parse_args()
+    
+    started = time.time()
+    budget = TimeBudget(args.time_budget)
+    timer = PhaseTimer()
+    state = None if args.no_state else CrawlState(args.state)
     scraper = None
     try:
         print(" Starting Enhanced Actuary List Scraper...")
-        scraper = ActuaryListScraper(headless=False)
+        scraper, jobs = stream_with_fallback(args.mode, args.max_jobs or None, args.url, args.headless, budget, timer,
+                                             state)
         
-        jobs = scraper.scrape_jobs(max_jobs=10, debug=True)
+        # Parsing runs in its own stage; each job is appended to the output and queued for upload as it arrives
+        with Stage(jobs, name='parse') as parsed, JsonLinesWriter(args.output) as writer, \
+                BatchUploader(scraper, args.api_url, args.batch_size, args.uploads) as uploader:
+            stats = deliver(parsed, writer, uploader, timer)
         
-        if jobs:
-            print(f"\n Summary:")
-            print(f"   Total jobs scraped: {len(jobs)}")
-            print(f"   Jobs with titles: {sum(1 for job in jobs if job['title'])}")
-            print(f"   Jobs with companies: {sum(1 for job in jobs if job['company'])}")
-            print(f"   Jobs with locations: {sum(1 for job in jobs if job['location'])}")
-            
-            # Save to JSON file
-            scraper.save_to_json('scraped_jobs.json')
-            
-            # Try to send to API
-            try:
-                success, errors = scraper.send_to_api()
-                print(f"📡 Sent {success} jobs to API with {errors} errors")
-            except Exception as e:
-                print(f" Could not connect to API: {str(e)}")
-                print("Make sure the Flask API is running on http://localhost:5000")
+        if stats['jobs']:
+            print("\n Summary:")
+            print(f"   Total jobs scraped: {stats['jobs']}")
+            print(f"   Jobs with titles: {stats['titles']}")
+            print(f"   Jobs with companies: {stats['companies']}")
+            print(f"   Jobs with locations: {stats['locations']}")
+            print(f" Data appended to {args.output}")
+            print(f"📡 Sent {uploader.success} jobs to API with {uploader.errors} errors")
+            uploader.stats.report()
+            if uploader.errors and not uploader.success:
+                print(f"Make sure the Flask API is running on {args.api_url}")
+        elif state and state.seen:
+            print(" No new or changed listings since the last run")
         else:
             print(" No jobs were scraped successfully")
+        
+        if state:
+            finish_crawl_state(state, scraper, scraper.complete, args.expire_missing, args.api_url)
+            state = None
     
     except KeyboardInterrupt:
         print("  Scraping interrupted by user")
     except Exception as e:
         print(f" Scraping failed: {str(e)}")
     finally:
+        if state:
+            # Interrupted: keep what was delivered, but do not judge what is missing
+            finish_crawl_state(state, scraper or BaseScraper(), complete=False)
         if scraper:
             scraper.close()
+        print(f"\n Finished in {time.time() - started:.1f}s")
+        timer.report()
 
 
 if __name__ == "__main__":
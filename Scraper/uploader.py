@@ -0,0 +1,157 @@
+"""HTTP client for sending jobs to the Flask API.
+
+Uploader shares one pooled keep-alive session between every upload thread
+and retries transient failures: connection errors, timeouts, 429 and 5xx
+responses. Retries back off exponentially with full jitter, or wait as
+long as the server's Retry-After header asks. Bulk uploads are upserts
+keyed by job URL, so sending a batch twice is harmless. UploadStats
+records every request, so a run can report its throughput and latency.
+api_url can point at any server, such as a local stub for trying out
+failure handling.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = 'http://localhost:5000/api/jobs'
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after(response):
+    """Seconds the server asked to wait before retrying, or None"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class UploadStats:
+    """Requests, retries, failures and latencies of an upload run; safe to share between threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.jobs = 0
+        self.started = None
+        self.finished = None
+
+    def record(self, latency, retried=False, failed=False):
+        with self.lock:
+            now = time.perf_counter()
+            if self.started is None:
+                self.started = now - latency
+            self.finished = now
+            self.latencies.append(latency)
+            self.requests += 1
+            self.retries += retried
+            self.failures += failed
+
+    def add_jobs(self, count):
+        with self.lock:
+            self.jobs += count
+
+    def percentile(self, fraction):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def report(self):
+        with self.lock:
+            if not self.requests:
+                return
+            elapsed = max(self.finished - self.started, 1e-9)
+            print(f" Upload: {self.jobs} jobs in {self.requests} requests over {elapsed:.2f}s "
+                  f"({self.jobs / elapsed:.1f} jobs/s, {self.requests / elapsed:.1f} requests/s), "
+                  f"{self.retries} retried, {self.failures} failed")
+            print(f" Upload latency ms: p50 {self.percentile(0.5) * 1000:.0f}, "
+                  f"p95 {self.percentile(0.95) * 1000:.0f}, max {max(self.latencies) * 1000:.0f}")
+
+
+class Uploader:
+    """A pooled session for up to concurrency requests in flight, retrying transient failures"""
+
+    def __init__(self, api_url=API_URL, concurrency=4, max_retries=4, backoff=0.5, max_backoff=30.0,
+                 timeout=60, session=None):
+        self.api_url = api_url.rstrip('/')
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.stats = UploadStats()
+        self.session = session or self.create_session(concurrency)
+
+    @staticmethod
+    def create_session(pool_size):
+        """A session keeping up to pool_size connections to the API alive"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before retry number attempt + 1"""
+        requested = retry_after(response)
+        if requested is not None:
+            return min(requested, self.max_backoff)
+        # Full jitter keeps concurrent uploaders from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def request(self, method, path='', **kwargs):
+        """Send a request, retrying transient failures; returns the last response.
+
+        Raises the last requests exception if every attempt failed to get
+        a response at all.
+        """
+        url = self.api_url + path
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.stats.record(time.perf_counter() - started, retried=not last_attempt, failed=last_attempt)
+                if last_attempt:
+                    raise
+                response = None
+            else:
+                retry = response.status_code in RETRY_STATUSES and not last_attempt
+                self.stats.record(time.perf_counter() - started, retried=retry,
+                                  failed=response.status_code >= 400 and not retry)
+                if not retry:
+                    return response
+            time.sleep(self.delay(attempt, response))
+
+    def post(self, path, payload):
+        return self.request('POST', path, json=payload)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
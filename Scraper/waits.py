@@ -0,0 +1,173 @@
+"""Condition-based waits, a time budget and per-phase timing for the browser scraper.
+
+Instead of fixed sleeps, every wait polls one JavaScript snapshot of the page:
+ready state, job card count, visible loading indicators, time since the DOM
+last changed (recorded by a MutationObserver) and the number of network
+requests made so far. A wait returns as soon as its condition holds, and its
+timeout is cut short by the run's TimeBudget. PhaseTimer records where the
+time goes.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_INTERVAL = 0.1
+
+CARD_SELECTOR = '[class*="Job_job-card"], [class*="job-card"]'
+
+LOADING_SELECTOR = '[class*="loading"], [class*="spinner"], [id*="loading"], .loader, #loader, .loading-overlay'
+
+COOKIE_SELECTOR = ('button[aria-label*="Accept"], button[aria-label*="accept"], .cookie-accept, #cookie-accept, '
+                   '[data-testid*="accept"], .accept-cookies, #accept-cookies')
+COOKIE_TEXT = r'^(accept( all)?( cookies)?|i agree|agree|ok|got it)$'
+
+LOAD_MORE_SELECTOR = '.load-more, #load-more, .show-more, #show-more, [data-testid*="load"], [data-testid*="more"]'
+LOAD_MORE_TEXT = r'^(load|show) more'
+
+# Installs a MutationObserver on first use, so later calls can tell how long the DOM has been quiet
+PAGE_STATE_SCRIPT = """
+if (!window.__scraperMutations) {
+    window.__scraperMutations = {last: performance.now()};
+    new MutationObserver(function () { window.__scraperMutations.last = performance.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+var mutations = window.__scraperMutations;
+var visible = function (element) { return element.offsetParent !== null; };
+return {
+    ready: document.readyState,
+    cards: document.querySelectorAll(arguments[0]).length,
+    loaders: Array.prototype.filter.call(document.querySelectorAll(arguments[1]), visible).length,
+    quietMs: performance.now() - mutations.last,
+    requests: performance.getEntriesByType('resource').length
+};
+"""
+
+# Click the first visible element matching a selector, or a button whose text matches a pattern
+CLICK_SCRIPT = """
+var pattern = new RegExp(arguments[1], 'i');
+var visible = function (element) { return element.offsetParent !== null; };
+var target = Array.prototype.find.call(document.querySelectorAll(arguments[0]), visible) ||
+    Array.prototype.find.call(document.querySelectorAll('button, [role="button"]'), function (element) {
+        return visible(element) && pattern.test(element.textContent.trim());
+    });
+if (!target) { return false; }
+target.click();
+return true;
+"""
+
+
+class TimeBudget:
+    """A deadline for a whole run; None means unlimited"""
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        if self.deadline is None:
+            return float('inf')
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def cap(self, timeout):
+        """timeout, shortened to what is left of the budget"""
+        return min(timeout, self.remaining())
+
+
+class PhaseTimer:
+    """Wall-clock time and count per named phase; safe to share between threads"""
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed
+                self.counts[name] = self.counts.get(name, 0) + 1
+
+    def report(self):
+        with self.lock:
+            phases = sorted(self.totals.items(), key=lambda item: -item[1])
+            counts = dict(self.counts)
+        if not phases:
+            return
+        print(f" {'phase':<12} {'total s':>9} {'count':>6} {'avg ms':>9}")
+        for name, total in phases:
+            print(f" {name:<12} {total:>9.2f} {counts[name]:>6} {total / counts[name] * 1000:>9.1f}")
+
+
+def page_state(driver):
+    """One snapshot of the page's loading state (see PAGE_STATE_SCRIPT)"""
+    return driver.execute_script(PAGE_STATE_SCRIPT, CARD_SELECTOR, LOADING_SELECTOR)
+
+
+def wait_until(driver, condition, timeout, budget=None):
+    """Poll condition(driver) until it returns a truthy value; returns it, or None on timeout"""
+    if budget is not None:
+        timeout = budget.cap(timeout)
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL,
+                             ignored_exceptions=(WebDriverException,)).until(condition)
+    except TimeoutException:
+        return None
+
+
+def document_complete(driver):
+    state = page_state(driver)
+    return state if state['ready'] == 'complete' else False
+
+
+class PageSettled:
+    """True once the document is complete, no loader is visible and the DOM and network are quiet"""
+
+    def __init__(self, quiet_ms=500):
+        self.quiet_ms = quiet_ms
+        self.last_requests = None
+
+    def check(self, state):
+        requests_before, self.last_requests = self.last_requests, state['requests']
+        return (state['ready'] == 'complete' and not state['loaders']
+                and state['quietMs'] >= self.quiet_ms and requests_before == state['requests'])
+
+    def __call__(self, driver):
+        state = page_state(driver)
+        return state if self.check(state) else False
+
+
+class CardsGrewOrSettled:
+    """Returns the page state once more cards than before have rendered, or the page has gone quiet"""
+
+    def __init__(self, previous_cards, quiet_ms=800):
+        self.previous_cards = previous_cards
+        self.settled = PageSettled(quiet_ms)
+
+    def __call__(self, driver):
+        state = page_state(driver)
+        if self.settled.check(state):
+            return state
+        # New cards usually arrive in one batch; give it a moment to finish rendering
+        if state['cards'] > self.previous_cards and state['quietMs'] >= 200:
+            return state
+        return False
+
+
+def click_first(driver, selector, text_pattern):
+    """Click the first visible element matching selector or a button labelled text_pattern"""
+    try:
+        return bool(driver.execute_script(CLICK_SCRIPT, selector, text_pattern))
+    except WebDriverException:
+        return False
@@ -1,25 +1,60 @@
-from flask import Flask
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; the setup then runs unlocked
+    fcntl = None
+
+from flask import Flask, current_app
 from flask_cors import CORS
 from config import Config
-from db import db
+from db import db, configure_sqlite
 from routes.job_routes import job_routes
+from search import init_search_index
+from migrations import run_migrations
+from cache import init_cache
+from metrics import init_metrics
 
-def create_app():
+INIT_LOCK_FILE = 'init_database.lock'
+
+def init_database():
+    """Create missing tables, apply migrations and build the search index.
+    
+    The steps check the schema before changing it, so processes doing this
+    at the same time would trip over each other. Processes on one host (such
+    as uvicorn --workers) take turns through a lock file in the instance
+    folder; the ones after the first find nothing left to do.
+    """
+    os.makedirs(current_app.instance_path, exist_ok=True)
+    with open(os.path.join(current_app.instance_path, INIT_LOCK_FILE), 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        db.create_all()
+        run_migrations()
+        init_search_index()
+
+def create_app(init_db=None):
+    """Create the Flask app; init_db (default: the INIT_DATABASE setting) also sets the database up"""
     app = Flask(__name__)
     app.config.from_object(Config)
     
     CORS(app)
     
     db.init_app(app)
+    init_cache(app)
     
     app.register_blueprint(job_routes, url_prefix='/api')
     
     with app.app_context():
-        db.create_all()
+        configure_sqlite(db.engine, app.config['SQLITE_BUSY_TIMEOUT'])
+        init_metrics(app, db.engine)
+        if app.config['INIT_DATABASE'] if init_db is None else init_db:
+            init_database()
     
     return app
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Development server only; use gunicorn with gunicorn.conf.py in production
+    app.run(debug=app.config['DEBUG'], port=app.config['PORT'])
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""ASGI entry point serving the async variant of the job API.
+
+Run from the backend directory:  uvicorn asgi:app --port 5000
+
+The async app uses the configuration of the Flask app in app.py, and creating
+that app sets up the schema, migrations and search indexes before the async
+engine connects to the same database. With uvicorn --workers every worker
+creates it; init_database in app.py makes them take turns.
+"""
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+
+from app import app as wsgi_app
+from async_db import create_async_db
+from cache import build_response_cache
+from db import db
+from metrics import create_metrics, time_queries
+from routes.async_job_routes import async_job_routes
+
+
+def create_async_app(flask_app):
+    """Build the Starlette app serving the async job routes under /api"""
+    config = flask_app.config
+    with flask_app.app_context():
+        # Flask-SQLAlchemy resolves relative SQLite paths against the instance folder
+        database_url = db.engine.url
+        # The async app never uses the sync engine's connections
+        db.engine.dispose()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.engine, app.state.sessions = create_async_db(database_url, config)
+        if app.state.metrics is not None:
+            time_queries(app.state.engine.sync_engine)
+        yield
+        await app.state.engine.dispose()
+
+    app = Starlette(
+        routes=[Mount('/api', routes=async_job_routes)],
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+        lifespan=lifespan
+    )
+    app.state.config = config
+    app.state.cache = build_response_cache(config)
+    app.state.metrics = create_metrics(config)
+    return app
+
+
+app = create_async_app(wsgi_app)
@@ -0,0 +1,43 @@
+"""Async SQLAlchemy engine and sessions for the ASGI app (see asgi.py).
+
+The async app talks to the same database as the Flask app, through the
+asyncio driver for its dialect. Engine pool settings and the SQLite pragmas
+are the ones the Flask app uses, so each pooled connection can serve a
+request while others wait on the database, without a thread per request.
+"""
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from config import engine_options
+from db import configure_sqlite
+
+# asyncio driver for each supported dialect
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def async_database_url(url):
+    """Rewrite a database URL to use the asyncio driver for its dialect"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver configured for {backend} databases')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_db(url, config):
+    """Create the async engine and session factory for a (sync) database URL"""
+    url = async_database_url(url)
+    options = engine_options(url.render_as_string(hide_password=False))
+    if 'pool_size' in options:
+        # aiosqlite defaults to opening a connection per checkout; pool them like the sync engine
+        options['poolclass'] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **options)
+    configure_sqlite(engine.sync_engine, config['SQLITE_BUSY_TIMEOUT'])
+    # Objects stay usable after commit; reloading them would need another await
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    return engine, sessions
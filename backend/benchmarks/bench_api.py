@@ -0,0 +1,418 @@
+"""Latency, throughput and memory benchmark for the job API.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_api [--rows 10000 100000 1000000] [--requests 200]
+    python -m benchmarks.bench_api --url http://localhost:5000 [--server-pid PID]
+    python -m benchmarks.bench_api --compare benchmarks/results/old.json benchmarks/results/new.json
+
+Each --rows size gets a SQLite database of synthetic jobs modeled on
+Scraper/scraped_jobs.json, generated from a fixed seed and kept in
+benchmarks/data so later runs reuse it. Every size is then benchmarked in a
+fresh process through the Flask test client. That keeps runs offline and
+makes the reported peak RSS that of the app serving that database alone.
+With --url the same scenarios are sent to a running server instead, and
+--server-pid reports that server's peak RSS.
+
+Scenarios cover GET /api/jobs filter, sort, search and pagination mixes,
+the facet and detail endpoints, and create/update/delete and bulk writes.
+Each reports p50/p95/p99 latency and throughput. Results are saved as JSON
+tagged with the git commit, so --compare can show regressions between two
+runs. The response cache is disabled unless --cache is given, so requests
+measure the database path.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+SEED = 20250903
+SEED_CHUNK = 5000
+
+# Vocabulary modeled on the postings in Scraper/scraped_jobs.json
+SENIORITIES = ['', 'Senior ', 'Junior ', 'Lead ', 'Principal ', 'Associate ', 'Head of ']
+AREAS = ['Pensions', 'Life', 'Non-Life', 'Health', 'Reinsurance', 'Pricing', 'Reserving',
+         'Capital Modelling', 'Investments', 'Risk', 'P&C', 'Retirement']
+ROLES = ['Actuary', 'Actuarial Consultant', 'Actuarial Analyst', 'Actuarial Manager',
+         'Pricing Actuary', 'Valuation Actuary', 'Actuarial Director', 'Data Scientist']
+COMPANIES = ['Isio', 'Travelers', 'Hannover Re', 'Milliman', 'Aon', 'WTW', 'Mercer', 'Swiss Re',
+             'Munich Re', 'Lane Clark & Peacock', 'Barnett Waddingham', 'Hymans Robertson',
+             'Aviva', 'Legal & General', 'Prudential', 'MetLife', 'AXA', 'Allianz', 'Zurich',
+             'Lloyd\'s', 'Gallagher', 'Deloitte', 'PwC', 'KPMG', 'EY', 'Guy Carpenter',
+             'Unknown Company']
+LOCATIONS = ['UK London', 'UK Edinburgh', 'UK Manchester', 'UK Birmingham', 'USA New York',
+             'USA Chicago', 'USA Hartford', 'USA Boston', 'USA Remote', 'Canada Toronto',
+             'Australia Sydney', 'Ireland Dublin', 'Germany Munich', 'Switzerland Zurich',
+             'Singapore', 'Hong Kong', 'Location Not Specified']
+TAGS = ['Actuary (Fellow)', 'Actuary (Associate)', 'Senior Actuary', 'Student Actuary', 'Life',
+        'Pensions', 'Investments', 'Health', 'General Insurance', 'Reinsurance', 'Pricing',
+        'Reserving', 'Capital', 'Solvency II', 'IFRS 17', 'Python', 'R', 'SQL', 'Remote']
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+JOB_TYPE_WEIGHTS = [85, 4, 9, 2]
+
+SORTS = ['posting_date_desc', 'posting_date_asc', 'title_asc', 'company_asc']
+SEARCH_TERMS = ['actuary', 'pensions', 'senior pricing', 'reinsurance', 'life actuary',
+                'capital modelling', 'consultant', 'data']
+LOCATION_QUERIES = ['London', 'USA', 'New York', 'Toronto', 'Zurich', 'Remote', 'Sydney']
+
+
+def zipf_weights(count, exponent=1.1):
+    """Skewed popularity weights, so a few companies and locations dominate"""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def synthetic_jobs(count, start=0, seed=SEED):
+    """Yield count synthetic job dicts, identical for the same start and seed"""
+    rng = random.Random(seed + start)
+    company_weights = zipf_weights(len(COMPANIES))
+    location_weights = zipf_weights(len(LOCATIONS))
+    newest = datetime(2025, 9, 3, 18, 53, 30)
+    for i in range(start, start + count):
+        title = f'{rng.choice(SENIORITIES)}{rng.choice(AREAS)} {rng.choice(ROLES)}'
+        company = rng.choices(COMPANIES, company_weights)[0]
+        location = rng.choices(LOCATIONS, location_weights)[0]
+        tags = rng.sample(TAGS, rng.choice([0, 1, 2, 2, 3, 3, 4]))
+        yield {
+            'title': title,
+            'company': company,
+            'location': location,
+            'posting_date': (newest - timedelta(minutes=rng.randrange(180 * 24 * 60))).isoformat(),
+            'job_type': rng.choices(JOB_TYPES, JOB_TYPE_WEIGHTS)[0],
+            'tags': tags,
+            'description': f'{company} {title} {location} {" ".join(tags)}',
+            'url': f'https://www.actuarylist.com/actuarial-jobs/{i + 1}-{company.lower().replace(" ", "-")}'
+        }
+
+
+def database_path(rows):
+    return os.path.join(DATA_DIR, f'jobs-{rows}.db')
+
+
+def row_count(path):
+    if not os.path.exists(path):
+        return 0
+    try:
+        with sqlite3.connect(path) as conn:
+            return conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+def seed_database(rows):
+    """Fill the database for DATABASE_URL up to rows synthetic jobs (runs in a child process)"""
+    from app import app
+    from ingest import ingest_chunk
+
+    with app.app_context():
+        existing = row_count(database_path(rows))
+        for start in range(existing, rows, SEED_CHUNK):
+            ingest_chunk(list(synthetic_jobs(min(SEED_CHUNK, rows - start), start)))
+            print(f'  seeded {min(start + SEED_CHUNK, rows)}/{rows}', file=sys.stderr)
+
+
+class TestClientTransport:
+    """Sends requests through the Flask test client"""
+
+    def __init__(self):
+        from app import app
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_data()
+
+
+class HttpTransport:
+    """Sends requests to a running server over a keep-alive session"""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, body=None):
+        response = self.session.request(method, self.base_url + path, json=body)
+        return response.status_code, response.content
+
+
+def read_scenarios(rng, job_ids):
+    """(name, method, path) request generators for the read scenarios"""
+    def pick_tags():
+        return '&'.join(f'tag={tag}' for tag in rng.sample(TAGS[:10], rng.choice([1, 1, 2])))
+
+    return {
+        'list_default': lambda: '/api/jobs',
+        'list_sort': lambda: f'/api/jobs?sort={rng.choice(SORTS)}',
+        'list_job_type': lambda: f'/api/jobs?job_type={rng.choice(JOB_TYPES[:3])}&sort={rng.choice(SORTS)}',
+        'list_location': lambda: f'/api/jobs?location={rng.choice(LOCATION_QUERIES)}',
+        'list_tags': lambda: f'/api/jobs?{pick_tags()}',
+        'list_search': lambda: f'/api/jobs?search={rng.choice(SEARCH_TERMS)}',
+        'list_search_relevance': lambda: f'/api/jobs?search={rng.choice(SEARCH_TERMS)}&sort=relevance',
+        'list_combined': lambda: (f'/api/jobs?job_type=Full-time&location={rng.choice(LOCATION_QUERIES)}'
+                                  f'&search={rng.choice(SEARCH_TERMS)}&{pick_tags()}'),
+        'facets': lambda: rng.choice(['/api/jobs/facets', f'/api/jobs/facets?search={rng.choice(SEARCH_TERMS)}',
+                                      f'/api/jobs/facets?location={rng.choice(LOCATION_QUERIES)}']),
+        'get_job': lambda: f'/api/jobs/{rng.choice(job_ids)}',
+    }
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+
+    def percentile(fraction):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 3)
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def timed(transport, method, path, body=None, expected=(200,)):
+    started = time.perf_counter()
+    status, content = transport.request(method, path, body)
+    return time.perf_counter() - started, status in expected, content
+
+
+def run_read(transport, make_path, count):
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(count):
+        elapsed, ok, _ = timed(transport, 'GET', make_path())
+        latencies.append(elapsed)
+        errors += not ok
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def run_pagination(transport, rng, count, pages=5):
+    """Follow next_cursor through several pages of a sorted listing"""
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    while len(latencies) < count:
+        base = f'/api/jobs?sort={rng.choice(SORTS)}&limit=50'
+        path = base
+        for _ in range(pages):
+            elapsed, ok, content = timed(transport, 'GET', path)
+            latencies.append(elapsed)
+            errors += not ok
+            cursor = json.loads(content).get('next_cursor') if ok else None
+            if not cursor or len(latencies) >= count:
+                break
+            path = f'{base}&cursor={quote(cursor)}'
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def run_crud(transport, rng, count):
+    """Create, update and delete one job per iteration; each request is timed separately"""
+    timings = {'create': [], 'update': [], 'delete': []}
+    errors = {name: 0 for name in timings}
+    for job in synthetic_jobs(count, start=10 ** 9 + rng.randrange(10 ** 6)):
+        elapsed, ok, content = timed(transport, 'POST', '/api/jobs', job, expected=(201,))
+        timings['create'].append(elapsed)
+        errors['create'] += not ok
+        if not ok:
+            continue
+        job_id = json.loads(content)['data']['id']
+
+        elapsed, ok, _ = timed(transport, 'PUT', f'/api/jobs/{job_id}',
+                               {'title': job['title'] + ' (updated)', 'tags': rng.sample(TAGS, 2)})
+        timings['update'].append(elapsed)
+        errors['update'] += not ok
+
+        elapsed, ok, _ = timed(transport, 'DELETE', f'/api/jobs/{job_id}')
+        timings['delete'].append(elapsed)
+        errors['delete'] += not ok
+
+    results = {}
+    for name, latencies in timings.items():
+        if latencies:
+            results[name] = summarize(latencies, errors[name], sum(latencies))
+    return results
+
+
+def run_bulk(transport, rng, count, batch=100):
+    """POST /api/jobs/bulk with batches of new jobs, then delete them"""
+    latencies, errors, created = [], 0, []
+    for iteration in range(count):
+        jobs = list(synthetic_jobs(batch, start=2 * 10 ** 9 + rng.randrange(10 ** 6) * batch))
+        elapsed, ok, content = timed(transport, 'POST', '/api/jobs/bulk', jobs, expected=(201, 207))
+        latencies.append(elapsed)
+        errors += not ok
+        if ok:
+            created.extend(item['id'] for item in json.loads(content)['data']['created'])
+    for job_id in created:
+        transport.request('DELETE', f'/api/jobs/{job_id}')
+    result = summarize(latencies, errors, sum(latencies))
+    result['jobs_per_second'] = round(count * batch / sum(latencies), 1)
+    return result
+
+
+def run_scenarios(transport, requests_per_scenario, seed=SEED):
+    """Run every scenario against transport; returns {scenario: summary}"""
+    rng = random.Random(seed)
+    status, content = transport.request('GET', '/api/jobs?limit=200&fields=id')
+    if status != 200:
+        raise RuntimeError(f'GET /api/jobs failed with status {status}')
+    job_ids = [job['id'] for job in json.loads(content)['data']] or [1]
+
+    # Warm up connections, statement caches and the page cache
+    for _ in range(10):
+        transport.request('GET', '/api/jobs')
+
+    results = {}
+    for name, make_path in read_scenarios(rng, job_ids).items():
+        results[name] = run_read(transport, make_path, requests_per_scenario)
+        print(f'  {name:<24} p50 {results[name]["p50_ms"]:>8.2f} ms  p95 {results[name]["p95_ms"]:>8.2f} ms',
+              file=sys.stderr)
+    results['list_paginate'] = run_pagination(transport, rng, requests_per_scenario)
+    for name, summary in run_crud(transport, rng, max(1, requests_per_scenario // 4)).items():
+        results[name] = summary
+    results['bulk_100'] = run_bulk(transport, rng, max(1, requests_per_scenario // 20))
+    return results
+
+
+def peak_rss_kb(pid=None):
+    """Peak resident set size in KiB of this process, or of pid on Linux"""
+    if pid is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    return None
+
+
+def run_size_in_child(rows, args):
+    """Seed (if needed) and benchmark one database size, each step in a fresh process"""
+    path = database_path(rows)
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}',
+               CACHE_BACKEND='memory' if args.cache else 'none',
+               METRICS_ENABLED='true' if args.metrics else 'false')
+    if row_count(path) < rows:
+        print(f'Seeding {rows} jobs into {path}...', file=sys.stderr)
+        subprocess.run([sys.executable, '-m', 'benchmarks.bench_api', '--seed-only', str(rows)],
+                       cwd=BACKEND_DIR, env=env, check=True)
+
+    print(f'Benchmarking {rows} rows...', file=sys.stderr)
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_api', '--run-only', str(rows),
+         '--requests', str(args.requests)],
+        cwd=BACKEND_DIR, env=env, check=True, stdout=subprocess.PIPE
+    ).stdout
+    return json.loads(output)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(result):
+    for size in result['runs']:
+        label = size.get('url') or f"{size['rows']} rows"
+        print(f"\n{label} (peak RSS {size['peak_rss_kb'] / 1024:.1f} MiB)")
+        print(f"  {'scenario':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+        for name, summary in size['scenarios'].items():
+            print(f"  {name:<24} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} "
+                  f"{summary['p99_ms']:>9.2f} {summary['throughput_rps']:>9.1f} {summary['errors']:>7}")
+
+
+def compare(old_path, new_path, threshold=0.10):
+    """Print p95 and throughput changes per scenario; returns the number of regressions"""
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+    print(f"Comparing {old.get('commit')} -> {new.get('commit')} (regression: p95 +{threshold:.0%})")
+    old_runs = {run['rows']: run for run in old['runs']}
+    regressions = 0
+    for run in new['runs']:
+        before = old_runs.get(run['rows'])
+        if before is None:
+            continue
+        print(f"\n{run['rows']} rows: peak RSS {before['peak_rss_kb'] / 1024:.1f} -> {run['peak_rss_kb'] / 1024:.1f} MiB")
+        for name, summary in run['scenarios'].items():
+            if name not in before['scenarios']:
+                continue
+            old_p95 = before['scenarios'][name]['p95_ms']
+            change = (summary['p95_ms'] - old_p95) / old_p95 if old_p95 else 0.0
+            flag = 'REGRESSION' if change > threshold else ''
+            regressions += bool(flag)
+            print(f"  {name:<24} p95 {old_p95:>9.2f} -> {summary['p95_ms']:>9.2f} ms ({change:+.1%}) "
+                  f"req/s {before['scenarios'][name]['throughput_rps']:>8.1f} -> "
+                  f"{summary['throughput_rps']:>8.1f} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--url', help='benchmark a running server instead of the test client')
+    parser.add_argument('--server-pid', type=int, help='with --url, report the peak RSS of this process (e.g. a gunicorn worker)')
+    parser.add_argument('--cache', action='store_true', help='keep the response cache enabled')
+    parser.add_argument('--metrics', action='store_true', help='keep request metrics enabled')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<time>-<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two results files')
+    parser.add_argument('--seed-only', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--run-only', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+    if args.seed_only:
+        seed_database(args.seed_only)
+        return
+    if args.run_only:
+        scenarios = run_scenarios(TestClientTransport(), args.requests)
+        json.dump({'rows': args.run_only, 'peak_rss_kb': peak_rss_kb(), 'scenarios': scenarios}, sys.stdout)
+        return
+
+    if args.url:
+        scenarios = run_scenarios(HttpTransport(args.url), args.requests)
+        runs = [{'rows': None, 'url': args.url, 'scenarios': scenarios,
+                 'peak_rss_kb': peak_rss_kb(args.server_pid) if args.server_pid else 0}]
+    else:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        runs = [run_size_in_child(rows, args) for rows in args.rows]
+
+    commit = git_commit()
+    result = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'requests_per_scenario': args.requests,
+        'cache': args.cache,
+        'runs': runs,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as results_file:
+        json.dump(result, results_file, indent=2)
+
+    print_table(result)
+    print(f'\nResults written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Compare the sync (gunicorn + Flask) and async (uvicorn + Starlette) job APIs.
+
+Run from the backend directory (gunicorn, uvicorn, starlette and aiosqlite
+must be installed):
+
+    python -m benchmarks.bench_async [--concurrency 8 64 256] [--duration 10]
+
+Seeds a temporary SQLite database, then for each concurrency level drives the
+same GET mix against one gunicorn worker (gthread, GUNICORN_THREADS threads)
+and one uvicorn worker, reporting requests per second and latency
+percentiles. Clients are asyncio keep-alive connections, so high concurrency
+levels do not need a client thread each. The response cache is disabled so
+every request reaches the database.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.load_test import PATHS, percentile, seed, start_gunicorn, start_server, stop_server
+
+
+def start_uvicorn(db_url, port):
+    return start_server(
+        [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port), '--log-level', 'warning',
+         '--no-access-log'],
+        {'DATABASE_URL': db_url, 'CACHE_BACKEND': 'none'},
+        port
+    )
+
+
+async def fetch(reader, writer, path):
+    """Send one keep-alive GET and read the response; returns the status code"""
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+    length = int({key.lower(): value for key, value in headers.items()}.get('content-length', 0))
+    await reader.readexactly(length)
+    return status
+
+
+async def drive(port, clients, duration):
+    """Hit PATHS round-robin over clients connections; return (latencies, errors)"""
+    latencies = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def client(offset):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        i = offset
+        try:
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                try:
+                    if await fetch(reader, writer, PATHS[i % len(PATHS)]) != 200:
+                        errors += 1
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    errors += 1
+                    writer.close()
+                    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                latencies.append(time.perf_counter() - started)
+                i += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return latencies, errors
+
+
+def report(name, clients, latencies, errors, duration):
+    latencies.sort()
+    print(f'{name:>6} {clients:>7} {len(latencies) / duration:>9.1f} '
+          f'{percentile(latencies, 0.50) * 1000:>8.1f} '
+          f'{percentile(latencies, 0.95) * 1000:>8.1f} '
+          f'{percentile(latencies, 0.99) * 1000:>8.1f} {errors:>7}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 64, 256])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--port', type=int, default=5056)
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp(prefix='jobs-async-bench-')
+    db_url = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"
+    try:
+        print(f'Seeding {args.rows} jobs...')
+        seed(db_url, args.rows)
+        print(f"{'server':>6} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        servers = [
+            ('sync', lambda: start_gunicorn(db_url, 1, args.port, 'none')),
+            ('async', lambda: start_uvicorn(db_url, args.port)),
+        ]
+        for clients in args.concurrency:
+            for name, start in servers:
+                server, _ = start()
+                try:
+                    latencies, errors = asyncio.run(drive(args.port, clients, args.duration))
+                finally:
+                    stop_server(server)
+                report(name, clients, latencies, errors, args.duration)
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
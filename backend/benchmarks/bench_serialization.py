@@ -0,0 +1,96 @@
+"""Compare ORM hydration + to_dict + jsonify with the column-tuple fast path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization [--sizes 1000 10000 100000] [--repeat 3]
+
+Seeds a temporary SQLite database and times serializing N jobs of the list
+endpoint's default fields both ways, reporting the best of --repeat runs.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='jobs-bench-'), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+
+from app import create_app  # noqa: E402  (DATABASE_URL must be set first)
+from db import db  # noqa: E402
+from ingest import ingest_chunk  # noqa: E402
+from models.job import Job  # noqa: E402
+from serializers import columns_for, dumps, orjson, row_serializer  # noqa: E402
+
+SEED_CHUNK = 5000
+
+
+def seed(count):
+    """Insert synthetic jobs until the table holds count rows"""
+    existing = db.session.query(Job.id).count()
+    for start in range(existing, count, SEED_CHUNK):
+        ingest_chunk([
+            {
+                'title': f'Senior Pensions Actuarial Consultant {i}',
+                'company': f'Company {i % 500}',
+                'location': ['UK London', 'USA New York', 'Canada Toronto'][i % 3],
+                'job_type': 'Full-time',
+                'tags': ['Actuary (Fellow)', 'Life', 'Pensions'][:1 + i % 3],
+                'url': f'https://example.com/jobs/{i}'
+            }
+            for i in range(start, min(start + SEED_CHUNK, count))
+        ])
+
+
+def orm_path(app, count):
+    jobs = Job.query.order_by(Job.posting_date.desc(), Job.id.desc()).limit(count).all()
+    return app.json.dumps({'success': True, 'data': [job.to_dict(Job.LIST_FIELDS) for job in jobs]})
+
+
+def fast_path(app, count):
+    fields = Job.LIST_FIELDS
+    rows = (
+        db.session.query(*columns_for(fields))
+        .order_by(Job.posting_date.desc(), Job.id.desc())
+        .limit(count)
+        .all()
+    )
+    serialize = row_serializer(fields)
+    return dumps({'success': True, 'data': [serialize(row) for row in rows]})
+
+
+def best_time(func, app, count, repeat):
+    times = []
+    for _ in range(repeat):
+        db.session.remove()
+        started = time.perf_counter()
+        func(app, count)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    try:
+        with app.app_context():
+            seed(max(args.sizes))
+            print(f"encoder: {'orjson' if orjson else 'json (stdlib)'}")
+            print(f"{'rows':>8} {'orm + to_dict':>15} {'fast path':>12} {'speedup':>8}")
+            for count in args.sizes:
+                orm = best_time(orm_path, app, count, args.repeat)
+                fast = best_time(fast_path, app, count, args.repeat)
+                print(f"{count:>8} {orm * 1000:>12.1f} ms {fast * 1000:>9.1f} ms {orm / fast:>7.1f}x")
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(os.path.dirname(DB_PATH), ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
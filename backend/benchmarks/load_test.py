@@ -0,0 +1,160 @@
+"""Measure API throughput under gunicorn at different worker counts.
+
+Run from the backend directory (gunicorn and requests must be installed):
+
+    python -m benchmarks.load_test [--workers 1 2 4] [--clients 16] [--duration 10]
+
+Seeds a temporary SQLite database, starts gunicorn with gunicorn.conf.py for
+each worker count and drives GET endpoints from concurrent keep-alive clients,
+reporting requests per second and latency percentiles. The response cache is
+disabled by default so every request reaches the database; pass --cache memory
+to measure the cached path instead.
+"""
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATHS = [
+    '/api/jobs',
+    '/api/jobs?sort_by=title',
+    '/api/jobs?search=actuary',
+    '/api/jobs?location=London',
+    '/api/jobs/facets',
+    '/api/jobs/1',
+]
+
+
+def seed(db_url, count):
+    """Create the schema and insert count synthetic jobs into the database at db_url"""
+    os.environ['DATABASE_URL'] = db_url
+    sys.path.insert(0, BACKEND_DIR)
+    from app import create_app
+    from ingest import ingest_chunk
+
+    app = create_app()
+    with app.app_context():
+        for start in range(0, count, 5000):
+            ingest_chunk([
+                {
+                    'title': f'Pensions Actuary {i}',
+                    'company': f'Company {i % 200}',
+                    'location': ['UK London', 'USA New York', 'Canada Toronto'][i % 3],
+                    'job_type': ['Full-time', 'Contract'][i % 2],
+                    'tags': ['Actuary (Fellow)', 'Life', 'Pensions'][:1 + i % 3],
+                    'url': f'https://example.com/load/{i}'
+                }
+                for i in range(start, min(start + 5000, count))
+            ])
+
+
+def start_server(command, env, port):
+    """Run a server command from the backend directory and wait until /api/health answers"""
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=dict(os.environ, **env))
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            if requests.get(f'{base_url}/api/health', timeout=5).ok:
+                return server, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"{' '.join(command)} did not start")
+
+
+def start_gunicorn(db_url, workers, port, cache_backend):
+    return start_server(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        {'DATABASE_URL': db_url, 'WEB_CONCURRENCY': str(workers), 'BIND': f'127.0.0.1:{port}',
+         'CACHE_BACKEND': cache_backend, 'GUNICORN_ACCESS_LOG': '', 'GUNICORN_LOG_LEVEL': 'warning'},
+        port
+    )
+
+
+def stop_server(server):
+    server.send_signal(signal.SIGTERM)
+    server.wait(timeout=30)
+
+
+def drive(base_url, clients, duration):
+    """Hit PATHS round-robin from clients threads; return (latencies, errors)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset):
+        session = requests.Session()
+        local, failed, i = [], 0, offset
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + PATHS[i % len(PATHS)], timeout=10)
+                if response.status_code != 200:
+                    failed += 1
+            except requests.RequestException:
+                failed += 1
+            local.append(time.perf_counter() - started)
+            i += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--cache', default='none', choices=['none', 'memory'])
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp(prefix='jobs-load-')
+    db_url = f"sqlite:///{os.path.join(db_dir, 'load.db')}"
+    try:
+        print(f'Seeding {args.rows} jobs...')
+        seed(db_url, args.rows)
+        print(f"{'workers':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for workers in args.workers:
+            server, base_url = start_gunicorn(db_url, workers, args.port, args.cache)
+            try:
+                latencies, errors = drive(base_url, args.clients, args.duration)
+            finally:
+                stop_server(server)
+            latencies.sort()
+            print(f'{workers:>8} {len(latencies) / args.duration:>9.1f} '
+                  f'{percentile(latencies, 0.50) * 1000:>8.1f} '
+                  f'{percentile(latencies, 0.95) * 1000:>8.1f} '
+                  f'{percentile(latencies, 0.99) * 1000:>8.1f} {errors:>7}')
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
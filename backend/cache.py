@@ -0,0 +1,234 @@
+"""Response cache and conditional GET support for the read-only job endpoints.
+
+Cached bodies are keyed on the request path, the normalized query parameters
+and a version counter for the jobs table. Every write bumps the counter, so
+entries from before the write are simply never looked up again and age out.
+The same key doubles as a strong ETag, which lets If-None-Match requests be
+answered with 304 before the view or the database is touched.
+
+The default backend is an in-process LRU with a TTL. Any client exposing the
+Redis get/set(ex=)/incr commands can be used instead, which also shares the
+version counter between worker processes; with the in-process backend other
+workers only see a write once their entries expire.
+"""
+import hashlib
+import math
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+VERSION_KEY = 'jobs:version'
+MODIFIED_KEY = 'jobs:modified'
+
+
+class LRUCache:
+    """Thread-safe in-process cache with LRU eviction and per-entry TTL.
+
+    Counters and keys set without a TTL are kept outside the LRU and never
+    evicted, matching how the version bookkeeping uses them.
+    """
+
+    # State is private to this process
+    shared = False
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._persistent = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._persistent:
+                return self._persistent[key]
+
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            if not ex:
+                self._persistent[key] = value
+                return
+            self._entries[key] = (time.monotonic() + ex, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._persistent[key] = int(self._persistent.get(key, 0)) + 1
+            return self._persistent[key]
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl=60, prefix='jobcache:', enabled=True):
+        self.backend = backend
+        self.ttl = max(int(ttl), 1)
+        self.prefix = prefix
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # Threaded workers share this object; += on the counters is not atomic
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        # Version numbers from a per-process backend mean nothing to other
+        # processes, so their ETags must not match each other's
+        self.etag_scope = '' if getattr(backend, 'shared', True) else uuid.uuid4().hex
+
+    def version(self):
+        version = self.backend.get(self.prefix + VERSION_KEY)
+        return int(version) if version is not None else 0
+
+    def bump_version(self):
+        self.backend.set(self.prefix + MODIFIED_KEY, repr(time.time()))
+        return self.backend.incr(self.prefix + VERSION_KEY)
+
+    def last_modified(self):
+        """Time of the last write seen by the backend (or startup), rounded up to the second"""
+        modified = self.backend.get(self.prefix + MODIFIED_KEY)
+        timestamp = float(modified) if modified is not None else self.started_at
+        return datetime.fromtimestamp(math.ceil(timestamp), tz=timezone.utc)
+
+    def etag(self, key):
+        return hashlib.sha1(f'{self.etag_scope}{key}'.encode('utf-8')).hexdigest()
+
+    def make_key(self, path, args):
+        """Cache key from the path and query parameters, ignoring order and empty values"""
+        params = sorted((key, value) for key, value in args.items(multi=True) if value != '')
+        return f'{self.prefix}v{self.version()}:{path}?{urlencode(params)}'
+
+    def get(self, key):
+        body = self.backend.get(key) if self.enabled else None
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def set(self, key, body):
+        if self.enabled:
+            self.backend.set(key, body, ex=self.ttl)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0,
+            'version': self.version()
+        }
+
+
+def create_backend(config):
+    """Build the cache backend selected by CACHE_BACKEND (memory, redis or none)"""
+    backend = config.get('CACHE_BACKEND', 'memory')
+
+    if backend == 'redis':
+        import redis  # Optional dependency, only needed for this backend
+        return redis.Redis.from_url(config['CACHE_REDIS_URL'])
+    return LRUCache(max_entries=config.get('CACHE_MAX_ENTRIES', 1024))
+
+
+def build_response_cache(config, backend=None):
+    """Create the ResponseCache described by config; backend overrides the configured one"""
+    if backend is None:
+        backend = create_backend(config)
+    # With caching disabled the backend still tracks versions for ETags
+    return ResponseCache(
+        backend,
+        ttl=config.get('CACHE_TTL', 60),
+        enabled=config.get('CACHE_BACKEND', 'memory') != 'none'
+    )
+
+
+def init_cache(app, backend=None):
+    """Attach a ResponseCache to the app; backend overrides the configured one"""
+    app.extensions['response_cache'] = build_response_cache(app.config, backend)
+
+
+def get_cache():
+    return current_app.extensions['response_cache']
+
+
+def invalidate_jobs_cache():
+    """Make every cached job response stale; call after each committed write"""
+    get_cache().bump_version()
+
+
+def validators_match(if_none_match, if_modified_since, etag, last_modified):
+    """Whether parsed If-None-Match / If-Modified-Since values show the client has this version"""
+    if if_none_match:
+        return if_none_match.contains(etag)
+    if if_modified_since:
+        return last_modified <= if_modified_since
+    return False
+
+
+def not_modified(etag, last_modified):
+    """Whether the request's validators show the client already has this version"""
+    return validators_match(request.if_none_match, request.if_modified_since, etag, last_modified)
+
+
+def last_modified_is_final(last_modified):
+    """Whether Last-Modified can be sent yet.
+
+    It only has one second resolution, so it is sent once that second is over
+    and any later write gets a strictly newer value.
+    """
+    return last_modified.timestamp() <= time.time()
+
+
+def cached_response(view):
+    """Serve a GET view from the response cache, with ETag and Last-Modified validators.
+
+    Requests whose If-None-Match or If-Modified-Since still match are answered
+    with 304 without calling the view.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = get_cache()
+        key = cache.make_key(request.path, request.args)
+        etag = cache.etag(key)
+        last_modified = cache.last_modified()
+
+        def with_validators(response):
+            response.set_etag(etag)
+            if last_modified_is_final(last_modified):
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        if not_modified(etag, last_modified):
+            return with_validators(current_app.response_class(status=304))
+
+        body = cache.get(key)
+        if body is not None:
+            response = current_app.response_class(body, status=200, mimetype='application/json')
+            response.headers['X-Cache'] = 'HIT'
+            return with_validators(response)
+
+        response = current_app.make_response(view(*args, **kwargs))
+        response.headers['X-Cache'] = 'MISS'
+        if response.status_code != 200:
+            return response
+        cache.set(key, response.get_data())
+        return with_validators(response)
+
+    return wrapper
@@ -1,10 +1,61 @@
 import os
 
+def engine_options(database_uri):
+    """SQLAlchemy engine pool settings, overridable through environment variables"""
+    options = {
+        # Test connections on checkout and replace ones older than the recycle time,
+        # so connections dropped by the database server are not handed out
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+    # In-memory SQLite uses a single shared connection, which has no pool to size
+    in_memory = database_uri == 'sqlite://' or ':memory:' in database_uri
+    if not in_memory:
+        options.update(
+            pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+            max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 30))
+        )
+    return options
+
 class Config:
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///jobs.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    
+    # SQLite only: milliseconds a connection waits for a lock before failing
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    
+    # Create missing tables, run migrations and build the search index when the
+    # app starts. Turn off where several processes start at once (gunicorn's
+    # config does this for its workers) and set the database up beforehand
+    # with python migrations.py
+    INIT_DATABASE = os.environ.get('INIT_DATABASE', 'True').lower() == 'true'
     
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
-    DEBUG = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
\ No newline at end of file
+    # Off unless explicitly enabled; use FLASK_DEBUG=true for local development
+    DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
+    PORT = int(os.environ.get('PORT', 5000))
+    
+    # Pagination for GET /api/jobs
+    JOBS_PAGE_SIZE = int(os.environ.get('JOBS_PAGE_SIZE', 50))
+    JOBS_MAX_PAGE_SIZE = int(os.environ.get('JOBS_MAX_PAGE_SIZE', 200))
+    
+    # Jobs inserted per transaction by POST /api/jobs/bulk
+    BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 500))
+    
+    # Response cache for read endpoints: memory (in-process LRU), redis or none
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_TTL = int(os.environ.get('CACHE_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    
+    # Rows fetched per batch when streaming NDJSON/CSV exports
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    
+    # Request metrics served at /api/metrics, and the slow-query log threshold
+    # in milliseconds (negative disables the log, 0 logs every statement)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 250))
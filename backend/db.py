@@ -1,3 +1,22 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy()
+
+
+def configure_sqlite(engine, busy_timeout):
+    """Enable WAL and a busy timeout on every new SQLite connection.
+
+    WAL lets readers proceed while a writer commits, and the busy timeout
+    makes writers wait for the lock instead of failing immediately.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout)}')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
@@ -0,0 +1,83 @@
+"""Streaming serializers for exporting job lists as NDJSON or CSV.
+
+The chunk generators take an iterable of job dicts (or, for the async
+variants, an async iterable of batches of them) and yield encoded chunks, so
+a response built from them never holds more than one chunk of rows in memory.
+"""
+import csv
+import io
+from itertools import islice
+
+from serializers import dumps
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+CSV_MIMETYPE = 'text/csv'
+
+EXPORT_FORMATS = {
+    'ndjson': NDJSON_MIMETYPE,
+    'csv': CSV_MIMETYPE,
+}
+
+# Rows written per yielded chunk
+CHUNK_ROWS = 500
+
+
+def batched(rows, size=CHUNK_ROWS):
+    """Group an iterable of rows into lists of at most size rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def encode_ndjson(rows):
+    """Encode a batch of rows as newline-terminated JSON lines"""
+    return b''.join(dumps(row) + b'\n' for row in rows)
+
+
+def encode_csv(rows, fields, header=False):
+    """Encode a batch of rows as CSV lines; list values are joined with commas"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    for row in rows:
+        writer.writerow([
+            ','.join(value) if isinstance(value, list) else ('' if value is None else value)
+            for value in (row[field] for field in fields)
+        ])
+    return buffer.getvalue()
+
+
+def ndjson_chunks(rows):
+    """Yield rows as newline-delimited JSON, CHUNK_ROWS lines at a time"""
+    for batch in batched(rows):
+        yield encode_ndjson(batch)
+
+
+def csv_chunks(rows, fields):
+    """Yield rows as CSV with a header line, CHUNK_ROWS lines at a time"""
+    header = True
+    for batch in batched(rows):
+        yield encode_csv(batch, fields, header)
+        header = False
+    if header:
+        yield encode_csv([], fields, header)
+
+
+async def ndjson_chunks_async(batches):
+    """Async counterpart of ndjson_chunks, for an async iterable of row batches"""
+    async for batch in batches:
+        yield encode_ndjson(batch)
+
+
+async def csv_chunks_async(batches, fields):
+    """Async counterpart of csv_chunks, for an async iterable of row batches"""
+    header = True
+    async for batch in batches:
+        yield encode_csv(batch, fields, header)
+        header = False
+    if header:
+        yield encode_csv([], fields, header)
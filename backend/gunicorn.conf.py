@@ -0,0 +1,68 @@
+"""Gunicorn settings for serving the API in production.
+
+Run from the backend directory:  gunicorn -c gunicorn.conf.py wsgi:app
+Every setting can be overridden through the environment variables below.
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+
+# Processes sidestep the GIL for CPU-bound work (serialization, cache hits);
+# threads inside each worker overlap the time spent waiting on the database
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers periodically so slow leaks cannot accumulate; jitter keeps
+# them from all restarting at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+# Each worker must build its own engine and connection pool; sharing pooled
+# connections across a fork corrupts them, so the app is not preloaded
+preload_app = False
+
+# An empty GUNICORN_ACCESS_LOG disables access logging
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def configure_workers(server):
+    """Environment the workers inherit, adjusted to the worker and thread counts.
+
+    The in-process response cache is private to each worker, so a write
+    would only invalidate the worker that handled it and the others would
+    keep serving stale lists until their entries expire. With several
+    workers it is turned off unless a shared backend (redis) is configured.
+    Each thread uses at most one database connection at a time, so the pool
+    defaults to one connection per thread and no overflow, which keeps
+    workers x threads connections within the database's limit.
+    """
+    if server.cfg.workers > 1 and os.environ.get('CACHE_BACKEND', 'memory') == 'memory':
+        server.log.warning('CACHE_BACKEND=memory is per worker and would serve stale responses with %d workers; '
+                           'disabling the response cache (use CACHE_BACKEND=redis to share it)', server.cfg.workers)
+        os.environ['CACHE_BACKEND'] = 'none'
+    os.environ.setdefault('DB_POOL_SIZE', str(server.cfg.threads))
+    os.environ.setdefault('DB_MAX_OVERFLOW', '0')
+
+
+def on_starting(server):
+    """Prepare the workers' environment and set the database up once, before any worker starts.
+
+    Workers booting at the same time would otherwise all create tables and
+    run migrations at once and fail on each other's changes. The setup runs
+    in a child process so the master never opens a connection its workers
+    could inherit; workers then skip it.
+    """
+    configure_workers(server)
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    subprocess.run([sys.executable, os.path.join(backend_dir, 'migrations.py')], cwd=backend_dir, check=True)
+    os.environ['INIT_DATABASE'] = 'false'
@@ -0,0 +1,180 @@
+"""Batched job ingestion used by the bulk endpoint.
+
+Jobs are written with executemany statements, one transaction per chunk,
+instead of one ORM flush and commit per job. Each job is identified by its
+source_key, so re-ingesting the same postings either reports them as
+duplicates or, in upsert mode, updates only the ones whose content changed.
+
+Every function works on an explicit session, so the async API can run them
+through AsyncSession.run_sync; ingest_chunk defaults to the Flask session.
+"""
+from sqlalchemy import delete, insert, select, update
+
+from db import db
+from models.job import Job
+from models.tag import Tag, job_tags, parse_tags, tag_slug
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+DUPLICATE = 'duplicate'
+INVALID = 'invalid'
+
+
+def tag_ids_for(session, names):
+    """Map tag slugs to ids, inserting the tags that do not exist yet"""
+    wanted = {}
+    for name in names:
+        wanted.setdefault(tag_slug(name), name)
+    if not wanted:
+        return {}
+
+    ids = dict(session.execute(select(Tag.slug, Tag.id).where(Tag.slug.in_(list(wanted)))).all())
+    missing = [{'name': name, 'slug': slug} for slug, name in wanted.items() if slug not in ids]
+    if missing:
+        session.execute(insert(Tag), missing)
+        ids.update(session.execute(
+            select(Tag.slug, Tag.id).where(Tag.slug.in_([row['slug'] for row in missing]))
+        ).all())
+    return ids
+
+
+def insert_job_rows(session, rows):
+    """Insert job column dicts with executemany and return their new ids in order"""
+    dialect = session.get_bind(Job).dialect
+    if getattr(dialect, 'insert_executemany_returning_sort_by_parameter_order', False):
+        statement = insert(Job).returning(Job.id, sort_by_parameter_order=True)
+        return list(session.scalars(statement, rows))
+
+    # Databases without ordered RETURNING for executemany fall back to single inserts
+    return [
+        session.execute(insert(Job.__table__).values(**row)).inserted_primary_key[0]
+        for row in rows
+    ]
+
+
+def link_tags(session, job_rows):
+    """Insert job_tags links for (job_id, column values) pairs"""
+    tag_names = [(job_id, parse_tags(row['tags'])) for job_id, row in job_rows]
+    tag_ids = tag_ids_for(session, (name for _, names in tag_names for name in names))
+    links = [
+        {'job_id': job_id, 'tag_id': tag_ids[tag_slug(name)]}
+        for job_id, names in tag_names
+        for name in names
+    ]
+    if links:
+        session.execute(job_tags.insert(), links)
+
+
+# Columns an upsert item may update; the others keep their stored values
+UPSERT_FIELDS = ('title', 'company', 'location', 'job_type', 'tags', 'url', 'description', 'posting_date')
+
+
+def merged_row(stored, item, row):
+    """Stored column values with the fields item provides taken from row, as update_from_dict does"""
+    merged = dict(stored)
+    for field in UPSERT_FIELDS:
+        if field not in item:
+            continue
+        # An invalid or empty posting_date leaves the stored one, like update_from_dict
+        if field == 'posting_date' and not Job.parse_posting_date(item[field] or ''):
+            continue
+        merged[field] = row[field]
+    merged['content_hash'] = Job.compute_content_hash(merged)
+    return merged
+
+
+def ingest_chunk(items, upsert=False, session=None):
+    """Insert (or upsert) a chunk of validated job dicts in a single transaction.
+
+    Returns one (status, job_id) pair per item, in order. Items whose
+    source_key already exists are DUPLICATE unless upsert is set, in which
+    case the fields the item provides are written to the stored job: it is
+    UPDATED when that changes its content and UNCHANGED otherwise. Tags are
+    only replaced when the item has tags. Repeats of a key within the chunk
+    are always DUPLICATE of the first one. An item whose values cannot be
+    read is (INVALID, error message) without affecting the others.
+    """
+    session = session or db.session
+    results = [None] * len(items)
+    rows = []
+    for position, item in enumerate(items):
+        try:
+            rows.append(Job.columns_from_dict(item))
+        except (AttributeError, TypeError, ValueError) as e:
+            rows.append(None)
+            results[position] = (INVALID, str(e))
+    existing = {
+        source_key: (job_id, content_hash)
+        for job_id, source_key, content_hash in session.execute(
+            select(Job.id, Job.source_key, Job.content_hash)
+            .where(Job.source_key.in_({row['source_key'] for row in rows if row}))
+        )
+    }
+
+    first_seen = {}
+    new_positions = []
+    upsert_positions = []
+    for position, row in enumerate(rows):
+        if row is None:
+            continue
+        key = row['source_key']
+        if key in first_seen:
+            continue
+        first_seen[key] = position
+
+        if key not in existing:
+            new_positions.append(position)
+        elif upsert:
+            upsert_positions.append(position)
+        else:
+            results[position] = (DUPLICATE, existing[key][0])
+
+    update_rows = []
+    retag_rows = []
+    if upsert_positions:
+        columns = [getattr(Job, field) for field in UPSERT_FIELDS]
+        stored = {
+            job_id: dict(zip(UPSERT_FIELDS, values))
+            for job_id, *values in session.execute(
+                select(Job.id, *columns).where(Job.id.in_([existing[rows[position]['source_key']][0]
+                                                           for position in upsert_positions]))
+            )
+        }
+        for position in upsert_positions:
+            job_id, content_hash = existing[rows[position]['source_key']]
+            row = merged_row(stored[job_id], items[position], rows[position])
+            if row['content_hash'] == content_hash:
+                results[position] = (UNCHANGED, job_id)
+                continue
+            results[position] = (UPDATED, job_id)
+            row['id'] = job_id
+            update_rows.append(row)
+            if 'tags' in items[position]:
+                retag_rows.append(row)
+
+    try:
+        if new_positions:
+            new_rows = [rows[position] for position in new_positions]
+            ids = insert_job_rows(session, new_rows)
+            for position, job_id in zip(new_positions, ids):
+                results[position] = (CREATED, job_id)
+            link_tags(session, zip(ids, new_rows))
+
+        if update_rows:
+            session.execute(update(Job), update_rows)
+        if retag_rows:
+            session.execute(
+                delete(job_tags).where(job_tags.c.job_id.in_([row['id'] for row in retag_rows]))
+            )
+            link_tags(session, ((row['id'], row) for row in retag_rows))
+
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    for position, row in enumerate(rows):
+        if results[position] is None:
+            results[position] = (DUPLICATE, results[first_seen[row['source_key']]][1])
+    return results
@@ -0,0 +1,290 @@
+"""Request metrics and slow-query logging for the job API, exposed in Prometheus text format.
+
+Hooks on the job_routes blueprint time every request and record its status
+and response size. SQLAlchemy cursor events count the statements each
+request runs and the time spent in them, and log statements slower than
+SLOW_QUERY_THRESHOLD_MS together with the request's filter parameters.
+GET /api/jobs is additionally broken down by which filters and sort it used,
+to show the combinations that are slow.
+
+The async app in asgi.py records the same metrics: its views are wrapped
+per route, and the statements run during a request are attributed to it
+through a context variable instead of Flask's request context.
+
+Metrics live in process memory, so with several gunicorn workers each one
+reports its own share of the traffic.
+"""
+import contextvars
+import logging
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+slow_query_log = logging.getLogger('jobs.slow_query')
+
+# Query parameters of GET /api/jobs that change the statement it runs
+LIST_FILTER_PARAMS = ('job_type', 'location', 'tag', 'search', 'cursor')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Longest statement text and parameter list written to the slow-query log
+MAX_LOGGED_LENGTH = 1000
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.values = {}
+
+    def inc(self, labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{format_labels(self.label_names, labels)} {format_value(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [count per bucket..., sum, count]
+        self.values = {}
+
+    def observe(self, labels, value):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * len(self.buckets) + [0, 0]
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[position] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, series):
+                le = format_labels(self.label_names, labels, [('le', format_value(bound))])
+                lines.append(f'{self.name}_bucket{le} {count}')
+            le = format_labels(self.label_names, labels, [('le', '+Inf')])
+            lines.append(f'{self.name}_bucket{le} {series[-1]}')
+            lines.append(f'{self.name}_sum{format_labels(self.label_names, labels)} {format_value(series[-2])}')
+            lines.append(f'{self.name}_count{format_labels(self.label_names, labels)} {series[-1]}')
+        return lines
+
+
+class RequestMetrics:
+    """Thread-safe registry of the API's request and database metrics"""
+
+    def __init__(self, slow_query_ms=None):
+        self.slow_query_ms = slow_query_ms
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+        endpoint = ('method', 'endpoint')
+        self.requests = Counter('jobs_api_requests_total', 'Requests handled, by status code',
+                                endpoint + ('status',))
+        self.duration = Histogram('jobs_api_request_duration_seconds', 'Request latency',
+                                  endpoint, LATENCY_BUCKETS)
+        self.response_size = Histogram('jobs_api_response_size_bytes', 'Response body size',
+                                       endpoint, SIZE_BUCKETS)
+        self.db_queries = Histogram('jobs_api_request_db_queries', 'SQL statements executed per request',
+                                    endpoint, QUERY_COUNT_BUCKETS)
+        self.db_duration = Histogram('jobs_api_request_db_seconds', 'Time spent in SQL statements per request',
+                                     endpoint, LATENCY_BUCKETS)
+        self.list_duration = Histogram('jobs_api_list_duration_seconds',
+                                       'GET /api/jobs latency by filters and sort used',
+                                       ('filters', 'sort'), LATENCY_BUCKETS)
+        self.slow_queries = Counter('jobs_api_slow_queries_total',
+                                    'SQL statements slower than the slow-query threshold',
+                                    ('endpoint', 'filters'))
+        self.metrics = [self.requests, self.duration, self.response_size, self.db_queries,
+                        self.db_duration, self.list_duration, self.slow_queries]
+
+    def observe_request(self, method, endpoint, status, duration, size, queries, db_seconds, list_labels=None):
+        with self._lock:
+            self.requests.inc((method, endpoint, str(status)))
+            self.duration.observe((method, endpoint), duration)
+            if size is not None:
+                self.response_size.observe((method, endpoint), size)
+            self.db_queries.observe((method, endpoint), queries)
+            self.db_duration.observe((method, endpoint), db_seconds)
+            if list_labels is not None:
+                self.list_duration.observe(list_labels, duration)
+
+    def observe_slow_query(self, endpoint, filters):
+        with self._lock:
+            self.slow_queries.inc((endpoint, filters))
+
+    def render(self, extra_lines=()):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = []
+            for metric in self.metrics:
+                lines.extend(metric.render())
+        lines.extend(extra_lines)
+        return '\n'.join(lines) + '\n'
+
+
+def filter_combination(args):
+    """Names of the GET /api/jobs filters present in args, e.g. 'location,search', or 'none'"""
+    return ','.join(name for name in LIST_FILTER_PARAMS if args.get(name)) or 'none'
+
+
+def request_endpoint():
+    """The route pattern of the current request, which keeps label values bounded"""
+    return request.url_rule.rule if request.url_rule else request.path
+
+
+def get_metrics():
+    return current_app.extensions.get('request_metrics')
+
+
+class AsyncRequestQueries:
+    """Statements run during one request of the async app, found through current_async_request"""
+
+    def __init__(self, metrics, method, endpoint, args):
+        self.metrics = metrics
+        self.method = method
+        self.endpoint = endpoint
+        self.args = args
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set by the async app around each view; SQLAlchemy runs the statements in the same context
+current_async_request = contextvars.ContextVar('current_async_request', default=None)
+
+
+def log_slow_query(metrics, method, endpoint, args, elapsed, statement, parameters):
+    """Count and log a statement if it took longer than the slow-query threshold"""
+    if metrics.slow_query_ms is None or elapsed * 1000 < metrics.slow_query_ms:
+        return
+    filters = filter_combination(args)
+    metrics.observe_slow_query(endpoint, filters)
+    slow_query_log.warning(
+        'Slow query (%.1f ms) during %s %s with params %s: %s -- bound parameters %s',
+        elapsed * 1000, method, endpoint, args.to_dict(flat=False),
+        ' '.join(statement.split())[:MAX_LOGGED_LENGTH], repr(parameters)[:MAX_LOGGED_LENGTH]
+    )
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own execution context, so a statement that raises
+    # (and never reaches after_cursor_execute) leaves nothing behind
+    context.metrics_query_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'metrics_query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    async_request = current_async_request.get()
+    if async_request is not None:
+        async_request.queries += 1
+        async_request.db_seconds += elapsed
+        log_slow_query(async_request.metrics, async_request.method, async_request.endpoint, async_request.args,
+                       elapsed, statement, parameters)
+        return
+
+    if not has_request_context():
+        return
+    metrics = get_metrics()
+    if metrics is None:
+        return
+
+    if 'metrics_started' in g:
+        g.metrics_queries += 1
+        g.metrics_db_seconds += elapsed
+
+    log_slow_query(metrics, request.method, request_endpoint(), request.args, elapsed, statement, parameters)
+
+
+def create_metrics(config):
+    """The RequestMetrics registry described by config, or None when metrics are disabled"""
+    if not config.get('METRICS_ENABLED', True):
+        return None
+    # A negative threshold turns the slow-query log off
+    threshold = config.get('SLOW_QUERY_THRESHOLD_MS', -1)
+    return RequestMetrics(slow_query_ms=threshold if threshold >= 0 else None)
+
+
+def time_queries(engine):
+    """Time the SQL statements run on a (sync) engine"""
+    if not event.contains(engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+
+def init_metrics(app, engine):
+    """Attach a RequestMetrics registry to the app and time SQL statements on engine"""
+    metrics = create_metrics(app.config)
+    if metrics is None:
+        return
+    app.extensions['request_metrics'] = metrics
+    time_queries(engine)
+
+
+def track_requests(blueprint, list_endpoint, sort_options):
+    """Record metrics for every request handled by the blueprint.
+
+    list_endpoint names the view whose latency is also recorded per filter
+    combination, with sort values outside sort_options reported as 'default'.
+    """
+    sort_options = set(sort_options)
+
+    @blueprint.before_request
+    def start_timer():
+        if get_metrics() is None:
+            return
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_db_seconds = 0.0
+
+    @blueprint.after_request
+    def record_request(response):
+        metrics = get_metrics()
+        if metrics is None or 'metrics_started' not in g:
+            return response
+
+        duration = time.perf_counter() - g.metrics_started
+        list_labels = None
+        # A streamed export's latency only covers producing the first chunk
+        if request.endpoint == list_endpoint and not response.is_streamed:
+            sort = request.args.get('sort')
+            list_labels = (filter_combination(request.args), sort if sort in sort_options else 'default')
+
+        metrics.observe_request(
+            request.method, request_endpoint(), response.status_code, duration,
+            None if response.is_streamed else response.calculate_content_length(),
+            g.metrics_queries, g.metrics_db_seconds, list_labels
+        )
+        return response
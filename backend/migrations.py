@@ -0,0 +1,160 @@
+"""Idempotent schema and data migrations for databases created by older versions.
+
+db.create_all() only creates missing tables, so anything that changes an
+existing table or moves existing data lives here. run_migrations() is called
+on startup (see init_database in app.py) and can also be run directly, as a
+deploy step before starting several server processes: python migrations.py
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, select, text, update
+
+from db import db
+from models.job import Job
+from models.tag import Tag, job_tags, parse_tags, tag_slug
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def add_column_if_missing(table, column, ddl_type):
+    """Add a nullable column to an existing table, returning True if it was added"""
+    if column in {col['name'] for col in inspect(db.engine).get_columns(table)}:
+        return False
+    db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl_type}'))
+    return True
+
+
+def add_job_source_keys():
+    """Add and backfill jobs.source_key / jobs.content_hash.
+
+    Existing duplicates are kept, but only the newest copy of each posting
+    gets the key, so the unique index can be built and future ingests match it.
+    """
+    added = add_column_if_missing('jobs', 'source_key', 'VARCHAR(40)')
+    add_column_if_missing('jobs', 'content_hash', 'VARCHAR(40)')
+
+    keyed = 0
+    if added:
+        seen = set()
+        last_id = None
+        while True:
+            query = select(Job.id, Job.title, Job.company, Job.location, Job.job_type, Job.tags)
+            if last_id is not None:
+                query = query.where(Job.id < last_id)
+            rows = db.session.execute(query.order_by(Job.id.desc()).limit(BACKFILL_BATCH_SIZE)).all()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                values = row._asdict()
+                source_key = Job.compute_source_key(None, row.title, row.company, row.location)
+                updates.append({
+                    'id': row.id,
+                    'source_key': source_key if source_key not in seen else None,
+                    'content_hash': Job.compute_content_hash(values)
+                })
+                seen.add(source_key)
+            db.session.execute(update(Job), updates)
+            keyed += sum(1 for row in updates if row['source_key'])
+            last_id = rows[-1].id
+
+    db.session.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS ix_jobs_source_key ON jobs (source_key)'))
+    db.session.commit()
+    return keyed
+
+
+def backfill_job_tags():
+    """Populate tags/job_tags from the comma-joined jobs.tags column.
+
+    Only runs when job_tags is empty, so it is a no-op after the first start.
+    Returns the number of job/tag links created.
+    """
+    if db.session.execute(select(job_tags.c.job_id).limit(1)).first() is not None:
+        return 0
+
+    tag_ids = {slug: tag_id for tag_id, slug in db.session.execute(select(Tag.id, Tag.slug))}
+    created = 0
+    last_id = 0
+
+    while True:
+        rows = db.session.execute(
+            select(Job.id, Job.tags)
+            .where(Job.id > last_id, Job.tags.isnot(None), Job.tags != '')
+            .order_by(Job.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        links = []
+        for job_id, tags in rows:
+            for name in parse_tags(tags):
+                slug = tag_slug(name)
+                if slug not in tag_ids:
+                    tag = Tag(name=name, slug=slug)
+                    db.session.add(tag)
+                    db.session.flush()
+                    tag_ids[slug] = tag.id
+                links.append({'job_id': job_id, 'tag_id': tag_ids[slug]})
+
+        if links:
+            db.session.execute(job_tags.insert(), links)
+            created += len(links)
+        last_id = rows[-1][0]
+
+    db.session.commit()
+    return created
+
+
+def add_job_url_and_description():
+    """Add the jobs.url and jobs.description columns"""
+    added = add_column_if_missing('jobs', 'url', 'VARCHAR(500)')
+    added = add_column_if_missing('jobs', 'description', 'TEXT') or added
+    db.session.commit()
+    return added
+
+
+def fill_missing_posting_dates():
+    """Give jobs without a posting date the current time, so date sorts never see NULLs"""
+    result = db.session.execute(
+        update(Job).where(Job.posting_date.is_(None)).values(posting_date=datetime.utcnow())
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def create_missing_indexes():
+    """Create the indexes declared on the models that older databases lack"""
+    created = 0
+    existing = {index['name'] for index in inspect(db.engine).get_indexes(Job.__tablename__)}
+    for index in Job.__table__.indexes:
+        if index.name not in existing:
+            index.create(db.engine)
+            created += 1
+    return created
+
+
+MIGRATIONS = [
+    add_job_url_and_description,
+    backfill_job_tags,
+    add_job_source_keys,
+    fill_missing_posting_dates,
+    create_missing_indexes,
+]
+
+
+def run_migrations():
+    """Apply every migration in order"""
+    for migration in MIGRATIONS:
+        migration()
+
+
+if __name__ == '__main__':
+    # Importing the app already sets the database up unless INIT_DATABASE is off
+    from app import app, init_database
+
+    with app.app_context():
+        if not app.config['INIT_DATABASE']:
+            init_database()
+        print(f"Migrations applied to {db.engine.url}")
@@ -1,54 +1,154 @@
 from db import db
 from datetime import datetime
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit
+from models.tag import Tag, job_tags, parse_tags
 
 class Job(db.Model):
     __tablename__ = 'jobs'
     
+    # Composite indexes for the filter and sort combinations of GET /api/jobs.
+    # Each sort column is paired with id (the keyset tie-breaker); the job_type
+    # variants serve the equality filter plus sort. Ascending indexes are also
+    # scanned backwards for the descending sorts.
+    __table_args__ = (
+        db.Index('ix_jobs_posting_date_id', 'posting_date', 'id'),
+        db.Index('ix_jobs_title_id', 'title', 'id'),
+        db.Index('ix_jobs_company_id', 'company', 'id'),
+        db.Index('ix_jobs_job_type_posting_date_id', 'job_type', 'posting_date', 'id'),
+        db.Index('ix_jobs_job_type_title_id', 'job_type', 'title', 'id'),
+        db.Index('ix_jobs_job_type_company_id', 'job_type', 'company', 'id'),
+    )
+    
+    # Fields returned by list endpoints by default, and every field a client can request
+    LIST_FIELDS = ('id', 'title', 'company', 'location', 'posting_date', 'job_type', 'tags', 'url')
+    ALL_FIELDS = LIST_FIELDS + ('description',)
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(200), nullable=False)
-    posting_date = db.Column(db.DateTime, default=datetime.utcnow)
+    posting_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     job_type = db.Column(db.String(50), default='Full-time')
+    # Comma-joined copy of the tag names, kept for serialization and full-text
+    # search. Filtering goes through the normalized tag_list relationship.
     tags = db.Column(db.Text)  
     
+    tag_list = db.relationship(Tag, secondary=job_tags, lazy='select')
+    
+    # Identity of the posting at its source (see compute_source_key) and a hash
+    # of its content, used to deduplicate and to skip unchanged upserts
+    source_key = db.Column(db.String(40), unique=True, index=True)
+    content_hash = db.Column(db.String(40))
+    
+    url = db.Column(db.String(500))
+    # Deferred so list queries don't load the full text unless it is asked for
+    description = db.deferred(db.Column(db.Text))
+    
     def __repr__(self):
         return f'<Job {self.id}: {self.title} at {self.company}>'
     
-    def to_dict(self):
-        """Convert job object to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
+    def to_dict(self, fields=None):
+        """Convert job object to dictionary for JSON serialization.
+        
+        fields limits the output to the given field names; by default every
+        field, including the description, is returned.
+        """
+        if fields is None:
+            fields = self.ALL_FIELDS
+        
+        data = {}
+        for field in fields:
+            if field == 'posting_date':
+                data[field] = self.posting_date.isoformat() if self.posting_date else None
+            elif field == 'tags':
+                data[field] = self.tags.split(',') if self.tags and self.tags.strip() else []
+            else:
+                data[field] = getattr(self, field)
+        return data
+    
+    def set_tags(self, value, session=None):
+        """Set tags from a list or comma-separated string, keeping both representations in sync"""
+        names = parse_tags(value)
+        self.tags = ','.join(names)
+        self.tag_list = Tag.get_or_create_many(names, session)
+    
+    @staticmethod
+    def parse_posting_date(value):
+        """Parse an ISO 8601 posting date, returning None if it is missing or invalid"""
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            return None
+    
+    @staticmethod
+    def compute_source_key(url, title, company, location):
+        """Stable key for a posting: its normalized URL, or a fingerprint of title, company and location"""
+        url = (url or '').strip()
+        if url:
+            parts = urlsplit(url)
+            normalized = 'url:' + urlunsplit((
+                parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''
+            ))
+        else:
+            fields = [re.sub(r'\s+', ' ', (value or '').strip().lower()) for value in (title, company, location)]
+            normalized = 'fp:' + '\x1f'.join(fields)
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def compute_content_hash(values):
+        """Hash of the fields an upsert may change"""
+        content = '\x1f'.join(
+            str(values.get(field) or '')
+            for field in ('title', 'company', 'location', 'job_type', 'tags', 'url', 'description')
+        )
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+    
+    def refresh_content_hash(self):
+        """Recompute content_hash from the current field values"""
+        self.content_hash = self.compute_content_hash({
             'title': self.title,
             'company': self.company,
             'location': self.location,
-            'posting_date': self.posting_date.isoformat() if self.posting_date else None,
             'job_type': self.job_type,
-            'tags': self.tags.split(',') if self.tags and self.tags.strip() else []
+            'tags': self.tags,
+            'url': self.url,
+            'description': self.description
+        })
+    
+    @classmethod
+    def columns_from_dict(cls, data):
+        """Column values for a new job, shared by from_dict and bulk inserts"""
+        values = {
+            'title': data.get('title', '').strip(),
+            'company': data.get('company', '').strip(),
+            'location': data.get('location', '').strip(),
+            'job_type': data.get('job_type', 'Full-time'),
+            'tags': ','.join(parse_tags(data.get('tags'))),
+            'posting_date': cls.parse_posting_date(data.get('posting_date')) or datetime.utcnow(),
+            'url': (data.get('url') or '').strip() or None,
+            'description': data.get('description') or None
         }
+        values['source_key'] = cls.compute_source_key(
+            data.get('url'), values['title'], values['company'], values['location']
+        )
+        values['content_hash'] = cls.compute_content_hash(values)
+        return values
     
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, session=None):
         """Create job object from dictionary"""
-        job = cls(
-            title=data.get('title', '').strip(),
-            company=data.get('company', '').strip(),
-            location=data.get('location', '').strip(),
-            job_type=data.get('job_type', 'Full-time'),
-            tags=','.join(data.get('tags', [])) if isinstance(data.get('tags'), list) else data.get('tags', '')
-        )
-        
-        # Handle posting_date if provided
-        if 'posting_date' in data and data['posting_date']:
-            try:
-                job.posting_date = datetime.fromisoformat(data['posting_date'].replace('Z', '+00:00'))
-            except (ValueError, AttributeError):
-                job.posting_date = datetime.utcnow()
-        
+        job = cls(**cls.columns_from_dict(data))
+        job.set_tags(data.get('tags'), session)
         return job
     
-    def update_from_dict(self, data):
-        """Update job object from dictionary"""
+    def update_from_dict(self, data, session=None):
+        """Update job object from dictionary.
+        
+        Changing the URL, title, company or location also changes the
+        source key, which may then collide with another job's.
+        """
         if 'title' in data:
             self.title = data['title'].strip()
         if 'company' in data:
@@ -58,12 +158,15 @@ class Job(db.Model):
         if 'job_type' in data:
             self.job_type = data['job_type']
         if 'tags' in data:
-            if isinstance(data['tags'], list):
-                self.tags = ','.join(data['tags'])
-            else:
-                self.tags = data['tags']
+            self.set_tags(data['tags'], session)
+        if 'url' in data:
+            self.url = (data['url'] or '').strip() or None
+        if 'description' in data:
+            self.description = data['description'] or None
         if 'posting_date' in data and data['posting_date']:
-            try:
-                self.posting_date = datetime.fromisoformat(data['posting_date'].replace('Z', '+00:00'))
-            except (ValueError, AttributeError):
-                pass  
\ No newline at end of file
+            posting_date = self.parse_posting_date(data['posting_date'])
+            if posting_date:
+                self.posting_date = posting_date
+        if any(field in data for field in ('title', 'company', 'location', 'url')):
+            self.source_key = self.compute_source_key(self.url, self.title, self.company, self.location)
+        self.refresh_content_hash()
\ No newline at end of file
@@ -0,0 +1,68 @@
+from sqlalchemy import select
+
+from db import db
+
+# Association between jobs and tags. The primary key serves lookups by job,
+# the secondary index serves tag filters.
+job_tags = db.Table(
+    'job_tags',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_job_tags_tag_id_job_id', 'tag_id', 'job_id')
+)
+
+MAX_TAG_LENGTH = 100
+
+
+def tag_slug(name):
+    """Normalized form used to match tags case-insensitively"""
+    return name.strip().lower()
+
+
+def parse_tags(value):
+    """Turn a list or comma-separated string of tags into unique, stripped names"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+
+    names = []
+    seen = set()
+    for name in value:
+        name = str(name).strip()[:MAX_TAG_LENGTH]
+        slug = tag_slug(name)
+        if slug and slug not in seen:
+            seen.add(slug)
+            names.append(name)
+    return names
+
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(MAX_TAG_LENGTH), nullable=False)
+    slug = db.Column(db.String(MAX_TAG_LENGTH), nullable=False, unique=True, index=True)
+    
+    def __repr__(self):
+        return f'<Tag {self.id}: {self.name}>'
+    
+    @classmethod
+    def get_or_create_many(cls, names, session=None):
+        """Return Tag objects for the given names, creating the missing ones.
+        
+        session defaults to the Flask-SQLAlchemy session.
+        """
+        session = session or db.session
+        slugs = [tag_slug(name) for name in names]
+        existing = {tag.slug: tag for tag in session.scalars(select(cls).where(cls.slug.in_(slugs)))} if slugs else {}
+        
+        tags = []
+        for name, slug in zip(names, slugs):
+            tag = existing.get(slug)
+            if tag is None:
+                tag = cls(name=name, slug=slug)
+                session.add(tag)
+                existing[slug] = tag
+            tags.append(tag)
+        return tags
@@ -0,0 +1,78 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_by, value, last_id):
+    """Encode the sort key of the last row on a page into an opaque cursor"""
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps([sort_by, value, last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def sort_value_type(column):
+    """Type a cursor's sort value must have for column; untyped expressions (ranks) are numbers"""
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return (int, float)
+
+
+def decode_cursor(cursor, sort_by, value_type=None, nullable=False):
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is invalid.
+
+    value_type (see sort_value_type) is the type the sort value must have;
+    None is only accepted for a nullable sort column.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if isinstance(value, dict) and 'dt' in value:
+            value = datetime.fromisoformat(value['dt'])
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+    if cursor_sort != sort_by:
+        raise ValueError('Cursor does not match the requested sort')
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError('Invalid cursor')
+    if value is None:
+        if not nullable:
+            raise ValueError('Invalid cursor')
+    elif value_type is not None and (not isinstance(value, value_type) or isinstance(value, bool)):
+        raise ValueError('Invalid cursor')
+
+    return value, last_id
+
+
+def keyset_filter(column, id_column, descending, value, last_id, nullable=False):
+    """Build the WHERE clause selecting rows after (value, last_id) in sort order.
+
+    Nullable columns are expected to be ordered with NULLs last in both directions.
+    """
+    if descending:
+        after_value, after_id = column < value, id_column < last_id
+    else:
+        after_value, after_id = column > value, id_column > last_id
+
+    if value is None:
+        return and_(column.is_(None), after_id)
+
+    clause = or_(after_value, and_(column == value, after_id))
+    if nullable:
+        clause = or_(clause, column.is_(None))
+    return clause
+
+
+def order_by_keyset(column, id_column, descending, nullable=False):
+    """Return the ORDER BY clauses matching keyset_filter"""
+    if descending:
+        order = [column.desc(), id_column.desc()]
+    else:
+        order = [column.asc(), id_column.asc()]
+    if nullable:
+        order[0] = order[0].nulls_last()
+    return order
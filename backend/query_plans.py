@@ -0,0 +1,94 @@
+"""EXPLAIN-based check that the documented GET /api/jobs query shapes use indexes.
+
+Run from the backend directory against the configured database:
+
+    python query_plans.py
+
+Each shape is built with the same filter and sort code as get_jobs, explained
+by the database, and reported as a failure if the plan reads the jobs table
+with a full scan. Shapes served by a sort index must also not sort in a
+temporary structure; the tag, location and search shapes find their matches
+through an index and then sort only those. Exits with status 1 if any shape
+fails.
+"""
+import re
+import sys
+
+from sqlalchemy import text
+from werkzeug.datastructures import MultiDict
+
+from db import db
+from models.job import Job
+
+# The filter + sort combinations the indexes are designed for, and whether
+# the rows should come out of the index already in sort order
+QUERY_SHAPES = [
+    ({'sort': 'posting_date_desc'}, True),
+    ({'sort': 'posting_date_asc'}, True),
+    ({'sort': 'title_asc'}, True),
+    ({'sort': 'company_asc'}, True),
+    ({'job_type': 'Full-time', 'sort': 'posting_date_desc'}, True),
+    ({'job_type': 'Full-time', 'sort': 'posting_date_asc'}, True),
+    ({'job_type': 'Full-time', 'sort': 'title_asc'}, True),
+    ({'job_type': 'Full-time', 'sort': 'company_asc'}, True),
+    ({'tag': 'Life', 'sort': 'posting_date_desc'}, False),
+    ({'tag': 'Life,Pensions', 'sort': 'posting_date_desc'}, False),
+    ({'location': 'London', 'sort': 'posting_date_desc'}, False),
+    ({'search': 'actuary', 'sort': 'relevance'}, False),
+]
+
+# Plan lines meaning the jobs table is read in full, or sorted without an index
+SQLITE_SCAN = re.compile(r'SCAN jobs$')
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR ORDER BY')
+POSTGRES_SCAN = re.compile(r'Seq Scan on jobs\b')
+POSTGRES_SORT = re.compile(r'^Sort\b|-> +Sort\b')
+
+
+def build_shape_query(args, limit=50):
+    """Build the SELECT that get_jobs would run for the given args"""
+    from routes.job_routes import page_statement
+
+    statement, _ = page_statement(Job.LIST_FIELDS, MultiDict(args), limit)
+    return statement
+
+
+def explain(query):
+    """Return the plan lines for a query on the current database"""
+    dialect = db.engine.dialect
+    sql = str(query.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+    if dialect.name == 'sqlite':
+        rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')).all()
+        return [row[-1] for row in rows]
+    return [row[0] for row in db.session.execute(text(f'EXPLAIN {sql}')).all()]
+
+
+def check_query_plans():
+    """Explain every query shape; returns a list of (args, plan, ok) tuples"""
+    if db.engine.dialect.name == 'sqlite':
+        scan, sort = SQLITE_SCAN, SQLITE_SORT
+    else:
+        scan, sort = POSTGRES_SCAN, POSTGRES_SORT
+
+    results = []
+    for args, index_ordered in QUERY_SHAPES:
+        plan = [line.strip() for line in explain(build_shape_query(args))]
+        ok = not any(scan.search(line) for line in plan)
+        if index_ordered:
+            ok = ok and not any(sort.search(line) for line in plan)
+        results.append((args, plan, ok))
+    return results
+
+
+if __name__ == '__main__':
+    from app import app
+
+    with app.app_context():
+        failures = 0
+        for args, plan, ok in check_query_plans():
+            print(f"{'OK  ' if ok else 'FAIL'} {args}")
+            for line in plan:
+                print(f"       {line}")
+            failures += not ok
+        print(f"{len(QUERY_SHAPES) - failures}/{len(QUERY_SHAPES)} query shapes use indexes")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,582 @@
+"""Async variant of the job API routes, served by the Starlette app in asgi.py.
+
+The URLs, parameters and JSON bodies are the same as in job_routes; the
+statements, validation and response payloads are built by the same helpers.
+Reads await the async engine directly. Writes reuse the synchronous ORM and
+ingest code through AsyncSession.run_sync, which runs it on the event loop
+without blocking it on database I/O.
+"""
+import time
+from functools import wraps
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from werkzeug.datastructures import MIMEAccept, MultiDict
+from werkzeug.http import http_date, parse_accept_header, parse_date, parse_etags, quote_etag
+
+from cache import last_modified_is_final, validators_match
+from export import CHUNK_ROWS, CSV_MIMETYPE, NDJSON_MIMETYPE, csv_chunks_async, ndjson_chunks_async
+from ingest import ingest_chunk, CREATED, DUPLICATE, UPDATED
+from metrics import AsyncRequestQueries, current_async_request, filter_combination
+from models.job import Job
+from models.tag import Tag, job_tags
+from routes.job_routes import (
+    BulkResults, NDJSON_BODY_MIMETYPES, PROMETHEUS_CONTENT_TYPE, RELEVANCE_SORT, SORT_OPTIONS, bulk_item_errors,
+    bulk_items_from_json, export_format_for, export_statement, facet_statement, group_facets, is_truthy,
+    metrics_text, page_body, page_limit, page_statement, parse_fields, parse_json_line, save_job,
+    save_job_response, update_job_fields, validate_job_data, validate_job_update
+)
+from serializers import dumps, row_serializer
+
+JSON_MIMETYPE = 'application/json'
+
+
+def json_response(payload, status_code=200):
+    return Response(dumps(payload), status_code=status_code, media_type=JSON_MIMETYPE)
+
+
+def query_args(request):
+    """Query parameters as a MultiDict, the type the shared helpers expect"""
+    return MultiDict(request.query_params.multi_items())
+
+
+async def json_body(request):
+    """The parsed JSON body, or None if it is missing or invalid"""
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+def cached_response(view):
+    """Async counterpart of cache.cached_response, sharing its keys and validators"""
+    @wraps(view)
+    async def wrapper(request):
+        cache = request.app.state.cache
+        key = cache.make_key(request.url.path, query_args(request))
+        etag = cache.etag(key)
+        last_modified = cache.last_modified()
+
+        validators = {'ETag': quote_etag(etag), 'Cache-Control': 'no-cache'}
+        if last_modified_is_final(last_modified):
+            validators['Last-Modified'] = http_date(last_modified)
+
+        if validators_match(parse_etags(request.headers.get('if-none-match')),
+                            parse_date(request.headers.get('if-modified-since')), etag, last_modified):
+            return Response(status_code=304, headers=validators)
+
+        body = cache.get(key)
+        if body is not None:
+            return Response(body, media_type=JSON_MIMETYPE, headers={**validators, 'X-Cache': 'HIT'})
+
+        response = await view(request)
+        response.headers['X-Cache'] = 'MISS'
+        if response.status_code != 200:
+            return response
+        cache.set(key, response.body)
+        response.headers.update(validators)
+        return response
+
+    return wrapper
+
+
+async def get_jobs(request):
+    """Get a page of jobs, or stream every matching job as NDJSON or CSV"""
+    args = query_args(request)
+    accept = parse_accept_header(request.headers.get('accept'), MIMEAccept)
+    export_format = export_format_for(args, accept)
+    if export_format:
+        return export_jobs(request, args, export_format)
+    return await list_jobs(request)
+
+
+def export_jobs(request, args, export_format):
+    """Stream all jobs matching the filters, in sort order, without pagination"""
+    state = request.app.state
+    try:
+        fields = parse_fields(args.get('fields'), Job.LIST_FIELDS)
+    except ValueError as e:
+        return json_response({
+            'success': False,
+            'error': 'Invalid fields',
+            'message': str(e)
+        }, 400)
+
+    statement = export_statement(fields, args, state.engine.sync_engine).execution_options(
+        yield_per=state.config['EXPORT_BATCH_SIZE']
+    )
+    serialize = row_serializer(fields)
+
+    async def batches():
+        # The session lives as long as the response body is being sent
+        async with state.sessions() as session:
+            result = await session.stream(statement)
+            async for partition in result.partitions(CHUNK_ROWS):
+                yield [serialize(row) for row in partition]
+
+    if export_format == 'csv':
+        return StreamingResponse(
+            csv_chunks_async(batches(), fields), media_type=CSV_MIMETYPE,
+            headers={'Content-Disposition': 'attachment; filename=jobs.csv'}
+        )
+    return StreamingResponse(ndjson_chunks_async(batches()), media_type=NDJSON_MIMETYPE)
+
+
+@cached_response
+async def list_jobs(request):
+    """Get a page of jobs with optional filtering and sorting"""
+    state = request.app.state
+    args = query_args(request)
+    try:
+        try:
+            fields = parse_fields(args.get('fields'), Job.LIST_FIELDS)
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': 'Invalid fields',
+                'message': str(e)
+            }, 400)
+
+        limit = page_limit(args, state.config)
+        try:
+            statement, sort_by = page_statement(fields, args, limit, state.engine.sync_engine)
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': 'Invalid cursor',
+                'message': str(e)
+            }, 400)
+
+        async with state.sessions() as session:
+            rows = (await session.execute(statement)).all()
+        return Response(page_body(rows, fields, sort_by, limit), media_type=JSON_MIMETYPE)
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch jobs',
+            'message': str(e)
+        }, 500)
+
+
+@cached_response
+async def get_job(request):
+    """Get a single job by ID"""
+    try:
+        try:
+            fields = parse_fields(request.query_params.get('fields'), Job.ALL_FIELDS)
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': 'Invalid fields',
+                'message': str(e)
+            }, 400)
+
+        async with request.app.state.sessions() as session:
+            job = await session.get(Job, request.path_params['job_id'], options=[undefer(Job.description)])
+
+        if not job:
+            return json_response({
+                'success': False,
+                'error': 'Job not found'
+            }, 404)
+
+        return json_response({
+            'success': True,
+            'data': job.to_dict(fields)
+        })
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch job',
+            'message': str(e)
+        }, 500)
+
+
+def save_job_data(session, data, upsert):
+    """save_job returning the job as a dict, for use with run_sync"""
+    status, job = save_job(session, data, upsert)
+    return status, job.to_dict()
+
+
+async def create_job(request):
+    """Create a new job"""
+    state = request.app.state
+    async with state.sessions() as session:
+        try:
+            data = await json_body(request)
+
+            if not data:
+                return json_response({
+                    'success': False,
+                    'error': 'No data provided'
+                }, 400)
+
+            errors = validate_job_data(data)
+            if errors:
+                return json_response({
+                    'success': False,
+                    'error': 'Validation failed',
+                    'errors': errors
+                }, 400)
+
+            upsert = is_truthy(request.query_params.get('upsert'))
+            status, job_data = await session.run_sync(save_job_data, data, upsert)
+            if status in (CREATED, UPDATED):
+                state.cache.bump_version()
+
+            payload, status_code = save_job_response(status, job_data)
+            return json_response(payload, status_code)
+
+        except Exception as e:
+            await session.rollback()
+            return json_response({
+                'success': False,
+                'error': 'Failed to create job',
+                'message': str(e)
+            }, 500)
+
+
+async def iter_lines(stream):
+    """Split an async stream of byte chunks into lines"""
+    pending = b''
+    async for chunk in stream:
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def iter_bulk_items(request):
+    """Yield (index, item) pairs from a JSON array or NDJSON request body, as job_routes does"""
+    mimetype = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    if mimetype in NDJSON_BODY_MIMETYPES:
+        index = 0
+        async for line in iter_lines(request.stream()):
+            line = line.strip()
+            if not line:
+                continue
+            yield index, parse_json_line(line)
+            index += 1
+        return
+
+    for index, item in enumerate(bulk_items_from_json(await json_body(request))):
+        yield index, item
+
+
+def ingest_items(session, items, upsert):
+    """ingest_chunk with the session first, for use with run_sync"""
+    return ingest_chunk(items, upsert, session)
+
+
+async def bulk_create_jobs(request):
+    """Create many jobs at once, reporting success or errors per item"""
+    state = request.app.state
+    results = BulkResults()
+    chunk = []
+    chunk_size = state.config['BULK_CHUNK_SIZE']
+    upsert = is_truthy(request.query_params.get('upsert'))
+
+    async with state.sessions() as session:
+        async def flush_chunk():
+            items = [item for _, item in chunk]
+            try:
+                results.add_chunk(chunk, await session.run_sync(ingest_items, items, upsert))
+            except Exception as e:
+                results.add_chunk_failure(chunk, e)
+            chunk.clear()
+
+        try:
+            async for index, item in iter_bulk_items(request):
+                errors = bulk_item_errors(item)
+                if errors:
+                    results.add_errors(index, errors)
+                    continue
+
+                chunk.append((index, item))
+                if len(chunk) >= chunk_size:
+                    await flush_chunk()
+
+            if chunk:
+                await flush_chunk()
+
+            if results.changed:
+                state.cache.bump_version()
+
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': 'Invalid bulk payload',
+                'message': str(e)
+            }, 400)
+        except Exception as e:
+            await session.rollback()
+            return json_response({
+                'success': False,
+                'error': 'Failed to create jobs',
+                'message': str(e)
+            }, 500)
+
+    payload, status_code = results.response()
+    return json_response(payload, status_code)
+
+
+def update_job_data(session, job, data):
+    """update_job_fields for use with run_sync; returns (job dict, duplicate job dict or None)"""
+    duplicate = update_job_fields(session, job, data)
+    if duplicate:
+        return None, duplicate.to_dict()
+    return job.to_dict(), None
+
+
+async def update_job(request):
+    """Update an existing job"""
+    state = request.app.state
+    async with state.sessions() as session:
+        try:
+            job = await session.get(Job, request.path_params['job_id'])
+
+            if not job:
+                return json_response({
+                    'success': False,
+                    'error': 'Job not found'
+                }, 404)
+
+            data = await json_body(request)
+
+            if not data:
+                return json_response({
+                    'success': False,
+                    'error': 'No data provided'
+                }, 400)
+
+            errors = validate_job_update(data)
+            if errors:
+                return json_response({
+                    'success': False,
+                    'error': 'Validation failed',
+                    'errors': errors
+                }, 400)
+
+            job_data, duplicate_data = await session.run_sync(update_job_data, job, data)
+            if duplicate_data:
+                payload, status_code = save_job_response(DUPLICATE, duplicate_data)
+                return json_response(payload, status_code)
+            state.cache.bump_version()
+
+            return json_response({
+                'success': True,
+                'data': job_data,
+                'message': 'Job updated successfully'
+            })
+
+        except Exception as e:
+            await session.rollback()
+            return json_response({
+                'success': False,
+                'error': 'Failed to update job',
+                'message': str(e)
+            }, 500)
+
+
+async def delete_job(request):
+    """Delete a job"""
+    state = request.app.state
+    async with state.sessions() as session:
+        try:
+            job = await session.get(Job, request.path_params['job_id'])
+
+            if not job:
+                return json_response({
+                    'success': False,
+                    'error': 'Job not found'
+                }, 404)
+
+            await session.delete(job)
+            await session.commit()
+            state.cache.bump_version()
+
+            return json_response({
+                'success': True,
+                'message': 'Job deleted successfully'
+            })
+
+        except Exception as e:
+            await session.rollback()
+            return json_response({
+                'success': False,
+                'error': 'Failed to delete job',
+                'message': str(e)
+            }, 500)
+
+
+async def health_check(request):
+    """Health check endpoint"""
+    return json_response({
+        'success': True,
+        'message': 'Job API is running',
+        'version': '1.0.0',
+        'cache': request.app.state.cache.stats()
+    })
+
+
+@cached_response
+async def get_facets(request):
+    """Get job counts per job type, location and tag for the current filters"""
+    state = request.app.state
+    try:
+        statement = facet_statement(query_args(request), state.engine.sync_engine)
+        async with state.sessions() as session:
+            rows = (await session.execute(statement)).all()
+
+        return json_response({
+            'success': True,
+            'data': group_facets(rows)
+        })
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch facets',
+            'message': str(e)
+        }, 500)
+
+
+async def distinct_values(request, statement):
+    async with request.app.state.sessions() as session:
+        return [value for value in (await session.scalars(statement)) if value]
+
+
+@cached_response
+async def get_job_types(request):
+    """Get unique job types"""
+    try:
+        return json_response({
+            'success': True,
+            'data': await distinct_values(request, select(Job.job_type).distinct())
+        })
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch job types',
+            'message': str(e)
+        }, 500)
+
+
+@cached_response
+async def get_locations(request):
+    """Get unique locations"""
+    try:
+        return json_response({
+            'success': True,
+            'data': await distinct_values(request, select(Job.location).distinct())
+        })
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch locations',
+            'message': str(e)
+        }, 500)
+
+
+@cached_response
+async def get_tags(request):
+    """Get all unique tags"""
+    try:
+        # Only tags that are attached to at least one job
+        statement = (
+            select(Tag.name)
+            .where(select(job_tags.c.tag_id).where(job_tags.c.tag_id == Tag.id).exists())
+            .order_by(Tag.name)
+        )
+        return json_response({
+            'success': True,
+            'data': await distinct_values(request, statement)
+        })
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'error': 'Failed to fetch tags',
+            'message': str(e)
+        }, 500)
+
+
+async def get_metrics_text(request):
+    """Request, database and cache metrics in Prometheus text format"""
+    state = request.app.state
+    if state.metrics is None:
+        return json_response({
+            'success': False,
+            'error': 'Metrics are disabled'
+        }, 404)
+
+    return Response(metrics_text(state.metrics, state.cache), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def timed_view(view, endpoint, list_view, sort_options):
+    """Record the metrics metrics.track_requests records for the blueprint around an async view"""
+    @wraps(view)
+    async def wrapper(request):
+        metrics = request.app.state.metrics
+        if metrics is None:
+            return await view(request)
+
+        args = query_args(request)
+        queries = AsyncRequestQueries(metrics, request.method, endpoint, args)
+        token = current_async_request.set(queries)
+        started = time.perf_counter()
+        try:
+            response = await view(request)
+        finally:
+            current_async_request.reset(token)
+        duration = time.perf_counter() - started
+
+        streamed = isinstance(response, StreamingResponse)
+        list_labels = None
+        # A streamed export's latency only covers producing the first chunk
+        if view is list_view and not streamed:
+            sort = args.get('sort')
+            list_labels = (filter_combination(args), sort if sort in sort_options else 'default')
+
+        metrics.observe_request(
+            request.method, endpoint, response.status_code, duration,
+            None if streamed else len(response.body), queries.queries, queries.db_seconds, list_labels
+        )
+        return response
+
+    return wrapper
+
+
+def track_requests(routes, prefix, list_view, sort_options):
+    """Routes whose views record request metrics; endpoints are labelled prefix + route path"""
+    sort_options = set(sort_options)
+    return [
+        Route(route.path, timed_view(route.endpoint, prefix + route.path, list_view, sort_options),
+              methods=sorted(route.methods - {'HEAD'}))
+        for route in routes
+    ]
+
+
+# Mounted at /api by asgi.py, mirroring the job_routes blueprint
+async_job_routes = track_requests([
+    Route('/jobs', get_jobs, methods=['GET']),
+    Route('/jobs', create_job, methods=['POST']),
+    Route('/jobs/bulk', bulk_create_jobs, methods=['POST']),
+    Route('/jobs/facets', get_facets, methods=['GET']),
+    Route('/jobs/job-types', get_job_types, methods=['GET']),
+    Route('/jobs/locations', get_locations, methods=['GET']),
+    Route('/jobs/tags', get_tags, methods=['GET']),
+    Route('/jobs/{job_id:int}', get_job, methods=['GET']),
+    Route('/jobs/{job_id:int}', update_job, methods=['PUT']),
+    Route('/jobs/{job_id:int}', delete_job, methods=['DELETE']),
+    Route('/health', health_check, methods=['GET']),
+    Route('/metrics', get_metrics_text, methods=['GET']),
+], '/api', get_jobs, [*SORT_OPTIONS, RELEVANCE_SORT])
@@ -1,10 +1,37 @@
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from db import db
+from ingest import ingest_chunk, merged_row, UPSERT_FIELDS, CREATED, UPDATED, UNCHANGED, DUPLICATE, INVALID
+from cache import cached_response, get_cache, invalidate_jobs_cache
+from metrics import get_metrics, track_requests
+from export import EXPORT_FORMATS, NDJSON_MIMETYPE, CSV_MIMETYPE, ndjson_chunks, csv_chunks
+from serializers import columns_for, row_serializer, dumps
 from models.job import Job
-from sqlalchemy import or_
+from models.tag import Tag, job_tags, parse_tags, tag_slug
+from pagination import encode_cursor, decode_cursor, keyset_filter, order_by_keyset, sort_value_type
+from search import apply_search, apply_location_filter
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import undefer
 
 job_routes = Blueprint('jobs', __name__)
 
+# Supported sorts: (column, descending, nullable). Job.id is always the tie-breaker,
+# and each sort is backed by a (column, id) / (job_type, column, id) index.
+SORT_OPTIONS = {
+    'posting_date_desc': (Job.posting_date, True, False),
+    'posting_date_asc': (Job.posting_date, False, False),
+    'title_asc': (Job.title, False, False),
+    'company_asc': (Job.company, False, False),
+}
+DEFAULT_SORT = 'posting_date_desc'
+# Ranks full-text matches, only available together with the search parameter
+RELEVANCE_SORT = 'relevance'
+
+track_requests(job_routes, list_endpoint='jobs.get_jobs', sort_options=[*SORT_OPTIONS, RELEVANCE_SORT])
+
+# Fields that must be strings (or null) when present
+STRING_FIELDS = ('title', 'company', 'location', 'url', 'job_type', 'description', 'posting_date')
+
 # Input validation helper
 def validate_job_data(data, required_fields=None):
     if required_fields is None:
@@ -12,6 +39,12 @@ def validate_job_data(data, required_fields=None):
     
     errors = []
     
+    for field in STRING_FIELDS:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            errors.append(f"{field} must be a string")
+    if data.get('tags') is not None and not isinstance(data['tags'], (str, list)):
+        errors.append("tags must be a list or a comma-separated string")
+    
     for field in required_fields:
         if field not in data or not str(data[field]).strip():
             errors.append(f"{field} is required")
@@ -19,60 +52,224 @@ def validate_job_data(data, required_fields=None):
     if 'job_type' in data and data['job_type'] not in ['Full-time', 'Part-time', 'Contract', 'Internship']:
         errors.append("job_type must be one of: Full-time, Part-time, Contract, Internship")
     
+    if data.get('url') and len(str(data['url'])) > 500:
+        errors.append("url must be at most 500 characters")
+    
     return errors
 
+def validate_job_update(data):
+    """Validate a partial update, only checking the required fields it provides"""
+    provided_fields = [field for field in ['title', 'company', 'location'] if field in data]
+    if not provided_fields:  # Only validate if there are fields to validate
+        return []
+    return validate_job_data(data, provided_fields)
+
+def parse_fields(fields, default):
+    """Parse a fields= projection value, raising ValueError for unknown fields"""
+    if not fields:
+        return tuple(default)
+    
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in Job.ALL_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(Job.ALL_FIELDS)}")
+    return tuple(dict.fromkeys(fields))
+
+def requested_fields(default):
+    """Parse the fields= projection parameter, raising ValueError for unknown fields"""
+    return parse_fields(request.args.get('fields'), default)
+
+def is_truthy(value):
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+def upsert_requested():
+    """Whether the request asked to update existing jobs instead of rejecting duplicates"""
+    return is_truthy(request.args.get('upsert'))
+
+def filter_by_tags(query, tags, match_all=True):
+    """Restrict a Job query to jobs having all (or any) of the given tags"""
+    slugs = list({tag_slug(tag) for tag in tags})
+    matching = (
+        select(job_tags.c.job_id)
+        .join(Tag, Tag.id == job_tags.c.tag_id)
+        .where(Tag.slug.in_(slugs))
+    )
+    if match_all and len(slugs) > 1:
+        matching = matching.group_by(job_tags.c.job_id).having(func.count() == len(slugs))
+    return query.filter(Job.id.in_(matching))
+
+def apply_job_filters(query, args, engine=None):
+    """Apply the job_type, location, tag and search filters from the request args.
+    
+    Returns the filtered query and the full-text relevance expression, which
+    is None unless a search was applied on a database with a full-text index.
+    engine is the one the query will run on, by default the Flask-SQLAlchemy engine.
+    """
+    job_type = args.get('job_type')
+    location = args.get('location')
+    tags = parse_tags(','.join(args.getlist('tag')))
+    tag_match = args.get('tag_match', 'all')
+    search = args.get('search')
+    
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+    
+    if location:
+        query = apply_location_filter(query, location, engine)
+    
+    if tags:
+        query = filter_by_tags(query, tags, match_all=(tag_match != 'any'))
+    
+    relevance = None
+    if search:
+        query, relevance = apply_search(query, search, engine)
+    
+    return query, relevance
+
+def resolve_sort(sort_by, relevance=None):
+    """Return (sort_by, column, descending, nullable) for a sort parameter"""
+    if sort_by == RELEVANCE_SORT and relevance is not None:
+        return sort_by, relevance, True, False
+    if sort_by not in SORT_OPTIONS:
+        sort_by = DEFAULT_SORT
+    return (sort_by,) + SORT_OPTIONS[sort_by]
+
+def export_format_for(args, accept_mimetypes):
+    """Return 'ndjson' or 'csv' if the args or Accept header ask for a streamed export, else None"""
+    export_format = args.get('format')
+    if export_format in EXPORT_FORMATS:
+        return export_format
+    if is_truthy(args.get('stream')):
+        return 'ndjson'
+    
+    # JSON is listed first so that */* keeps the paginated response
+    best = accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE, CSV_MIMETYPE])
+    if best == NDJSON_MIMETYPE:
+        return 'ndjson'
+    if best == CSV_MIMETYPE:
+        return 'csv'
+    return None
+
+def requested_export_format():
+    """Return 'ndjson' or 'csv' if the request asked for a streamed export, else None"""
+    return export_format_for(request.args, request.accept_mimetypes)
+
+def export_statement(fields, args, engine=None):
+    """Select the fields of every job matching the filters in args, in sort order"""
+    statement, relevance = apply_job_filters(select(*columns_for(fields)), args, engine)
+    _, sort_column, descending, nullable = resolve_sort(args.get('sort'), relevance)
+    return statement.order_by(*order_by_keyset(sort_column, Job.id, descending, nullable))
+
+def page_limit(args, config):
+    """Page size from the limit parameter, clamped to 1..JOBS_MAX_PAGE_SIZE"""
+    limit = args.get('limit', config['JOBS_PAGE_SIZE'], type=int)
+    return max(1, min(limit, config['JOBS_MAX_PAGE_SIZE']))
+
+def page_statement(fields, args, limit, engine=None):
+    """Select one page of jobs matching args, plus one row to detect a next page.
+    
+    Returns the statement and the effective sort. Raises ValueError if the
+    cursor parameter is invalid.
+    """
+    # Select plain column tuples for the requested fields; no ORM objects
+    statement, relevance = apply_job_filters(select(*columns_for(fields)), args, engine)
+    sort_by, sort_column, descending, nullable = resolve_sort(args.get('sort'), relevance)
+    
+    # Keyset pagination
+    cursor = args.get('cursor')
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_value_type(sort_column), nullable)
+        statement = statement.filter(keyset_filter(sort_column, Job.id, descending, value, last_id, nullable))
+    
+    # The id and sort key are selected after the fields so the cursor can be built
+    statement = (
+        statement
+        .order_by(*order_by_keyset(sort_column, Job.id, descending, nullable))
+        .add_columns(Job.id.label('cursor_id'), sort_column.label('sort_key'))
+        .limit(limit + 1)
+    )
+    return statement, sort_by
+
+def page_body(rows, fields, sort_by, limit):
+    """Encode the JSON body for a page fetched with page_statement"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_by, last.sort_key, last.cursor_id)
+    
+    serialize = row_serializer(fields)
+    return dumps({
+        'success': True,
+        'data': [serialize(row) for row in rows],
+        'count': len(rows),
+        'limit': limit,
+        'next_cursor': next_cursor
+    })
+
 @job_routes.route('/jobs', methods=['GET'])
 def get_jobs():
-    """Get all jobs with optional filtering and sorting"""
+    """Get a page of jobs, or stream every matching job as NDJSON or CSV"""
+    export_format = requested_export_format()
+    if export_format:
+        return export_jobs(export_format)
+    return list_jobs()
+
+def export_jobs(export_format):
+    """Stream all jobs matching the filters, in sort order, without pagination"""
     try:
-        query = Job.query
-        
-        # Filtering parameters
-        job_type = request.args.get('job_type')
-        location = request.args.get('location')
-        tag = request.args.get('tag')
-        search = request.args.get('search')
-        
-        # Apply filters
-        if job_type:
-            query = query.filter(Job.job_type == job_type)
-        
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-        
-        if tag:
-            query = query.filter(Job.tags.ilike(f'%{tag}%'))
-        
-        if search:
-            query = query.filter(
-                or_(
-                    Job.title.ilike(f'%{search}%'),
-                    Job.company.ilike(f'%{search}%')
-                )
-            )
-        
-        # Sorting
-        sort_by = request.args.get('sort', 'posting_date_desc')
-        
-        if sort_by == 'posting_date_desc':
-            query = query.order_by(Job.posting_date.desc())
-        elif sort_by == 'posting_date_asc':
-            query = query.order_by(Job.posting_date.asc())
-        elif sort_by == 'title_asc':
-            query = query.order_by(Job.title.asc())
-        elif sort_by == 'company_asc':
-            query = query.order_by(Job.company.asc())
-        else:
-            # Default sort
-            query = query.order_by(Job.posting_date.desc())
-        
-        jobs = query.all()
-        
+        fields = requested_fields(Job.LIST_FIELDS)
+    except ValueError as e:
         return jsonify({
-            'success': True,
-            'data': [job.to_dict() for job in jobs],
-            'count': len(jobs)
-        }), 200
+            'success': False,
+            'error': 'Invalid fields',
+            'message': str(e)
+        }), 400
+    
+    statement = export_statement(fields, request.args).execution_options(
+        yield_per=current_app.config['EXPORT_BATCH_SIZE']
+    )
+    
+    # yield_per streams rows from a server-side cursor in batches instead of
+    # loading the whole result
+    serialize = row_serializer(fields)
+    rows = (serialize(row) for row in db.session.execute(statement))
+    
+    if export_format == 'csv':
+        response = current_app.response_class(
+            stream_with_context(csv_chunks(rows, fields)), mimetype=CSV_MIMETYPE
+        )
+        response.headers['Content-Disposition'] = 'attachment; filename=jobs.csv'
+        return response
+    
+    return current_app.response_class(stream_with_context(ndjson_chunks(rows)), mimetype=NDJSON_MIMETYPE)
+
+@cached_response
+def list_jobs():
+    """Get a page of jobs with optional filtering and sorting"""
+    try:
+        try:
+            fields = requested_fields(Job.LIST_FIELDS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid fields',
+                'message': str(e)
+            }), 400
+        
+        limit = page_limit(request.args, current_app.config)
+        try:
+            statement, sort_by = page_statement(fields, request.args, limit)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid cursor',
+                'message': str(e)
+            }), 400
+        
+        rows = db.session.execute(statement).all()
+        body = page_body(rows, fields, sort_by, limit)
+        return current_app.response_class(body, status=200, mimetype='application/json')
         
     except Exception as e:
         return jsonify({
@@ -82,10 +279,20 @@ def get_jobs():
         }), 500
 
 @job_routes.route('/jobs/<int:job_id>', methods=['GET'])
+@cached_response
 def get_job(job_id):
     """Get a single job by ID"""
     try:
-        job = Job.query.get(job_id)
+        try:
+            fields = requested_fields(Job.ALL_FIELDS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid fields',
+                'message': str(e)
+            }), 400
+        
+        job = Job.query.options(undefer(Job.description)).get(job_id)
         
         if not job:
             return jsonify({
@@ -95,7 +302,7 @@ def get_job(job_id):
         
         return jsonify({
             'success': True,
-            'data': job.to_dict()
+            'data': job.to_dict(fields)
         }), 200
         
     except Exception as e:
@@ -105,6 +312,74 @@ def get_job(job_id):
             'message': str(e)
         }), 500
 
+def save_job(session, data, upsert=False):
+    """Insert a job, or with upsert update the existing one with the same source key.
+    
+    Jobs are unique by source URL, or by title, company and location. Commits
+    any change and returns (status, job) with an ingest status: CREATED,
+    UPDATED, UNCHANGED, or DUPLICATE when the job exists and upsert is off.
+    """
+    values = Job.columns_from_dict(data)
+    existing = session.scalars(select(Job).filter_by(source_key=values['source_key'])).first()
+    
+    if existing:
+        if not upsert:
+            return DUPLICATE, existing
+        # Fields missing from data keep their stored values, so compare what the update would store
+        stored = {field: getattr(existing, field) for field in UPSERT_FIELDS}
+        if existing.content_hash == merged_row(stored, data, values)['content_hash']:
+            return UNCHANGED, existing
+        existing.update_from_dict(data, session)
+        session.commit()
+        return UPDATED, existing
+    
+    # Create new job using model method
+    job = Job.from_dict(data, session)
+    session.add(job)
+    session.commit()
+    return CREATED, job
+
+def update_job_fields(session, job, data):
+    """Apply a partial update to a job and commit it.
+    
+    If the update gives the job the source key of another job, nothing is
+    committed and that other job is returned; otherwise returns None.
+    """
+    # Nothing may be flushed before the check, or the new key would hit the unique index first
+    with session.no_autoflush:
+        job.update_from_dict(data, session)
+        duplicate = session.scalars(
+            select(Job).where(Job.source_key == job.source_key, Job.id != job.id)
+        ).first()
+    if duplicate:
+        session.rollback()
+        return duplicate
+    session.commit()
+    return None
+
+# Status code and message for each save_job status
+SAVE_RESPONSES = {
+    CREATED: (201, 'Job created successfully'),
+    UPDATED: (200, 'Job updated successfully'),
+    UNCHANGED: (200, 'Job unchanged'),
+}
+
+def save_job_response(status, job_data):
+    """Response payload and status code for a save_job result"""
+    if status == DUPLICATE:
+        return {
+            'success': False,
+            'error': 'Job already exists',
+            'data': job_data
+        }, 409
+    
+    status_code, message = SAVE_RESPONSES[status]
+    return {
+        'success': True,
+        'data': job_data,
+        'message': message
+    }, status_code
+
 @job_routes.route('/jobs', methods=['POST'])
 def create_job():
     """Create a new job"""
@@ -126,25 +401,158 @@ def create_job():
                 'errors': errors
             }), 400
         
-        # Create new job using model method
-        job = Job.from_dict(data)
+        status, job = save_job(db.session, data, upsert_requested())
+        if status in (CREATED, UPDATED):
+            invalidate_jobs_cache()
         
-        db.session.add(job)
-        db.session.commit()
+        payload, status_code = save_job_response(status, job.to_dict())
+        return jsonify(payload), status_code
         
+    except Exception as e:
+        db.session.rollback()
         return jsonify({
-            'success': True,
-            'data': job.to_dict(),
-            'message': 'Job created successfully'
-        }), 201
+            'success': False,
+            'error': 'Failed to create job',
+            'message': str(e)
+        }), 500
+
+INVALID_JSON = object()
+NDJSON_BODY_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+
+def parse_json_line(line):
+    """Parse one NDJSON line, returning INVALID_JSON if it is not valid JSON"""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return INVALID_JSON
+
+def bulk_items_from_json(data):
+    """The job list of a JSON array or {"jobs": [...]} body, raising ValueError otherwise"""
+    if isinstance(data, dict):
+        data = data.get('jobs')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of jobs or an NDJSON body')
+    return data
+
+def iter_bulk_items():
+    """Yield (index, item) pairs from a JSON array or NDJSON request body.
+
+    NDJSON bodies are read line by line so they are never buffered whole.
+    Lines that are not valid JSON are yielded as INVALID_JSON.
+    """
+    if request.mimetype in NDJSON_BODY_MIMETYPES:
+        index = 0
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            yield index, parse_json_line(line)
+            index += 1
+        return
+    
+    yield from enumerate(bulk_items_from_json(request.get_json(silent=True)))
+
+def bulk_item_errors(item):
+    """Validation errors for one bulk item; empty if it can be ingested"""
+    if item is INVALID_JSON:
+        return ['Invalid JSON']
+    if not isinstance(item, dict):
+        return ['Item must be a JSON object']
+    return validate_job_data(item)
+
+class BulkResults:
+    """Per-item outcome of a bulk request, in the shape of its response"""
+    
+    def __init__(self):
+        self.results = {CREATED: [], UPDATED: [], UNCHANGED: []}
+        self.failed = []
+    
+    @property
+    def changed(self):
+        return bool(self.results[CREATED] or self.results[UPDATED])
+    
+    def add_errors(self, index, errors):
+        self.failed.append({'index': index, 'errors': errors})
+    
+    def add_chunk(self, chunk, statuses):
+        """Record ingest_chunk statuses for a chunk of (index, item) pairs"""
+        for (index, _), (status, job_id) in zip(chunk, statuses):
+            if status in self.results:
+                self.results[status].append({'index': index, 'id': job_id})
+            elif status == INVALID:
+                # job_id holds the reason the item could not be read
+                self.failed.append({'index': index, 'errors': [f'Invalid job: {job_id}']})
+            else:
+                self.failed.append({'index': index, 'id': job_id, 'errors': [f'Duplicate of job {job_id}']})
+    
+    def add_chunk_failure(self, chunk, error):
+        self.failed.extend({'index': index, 'errors': [f'Insert failed: {error}']} for index, _ in chunk)
+    
+    def response(self):
+        """Response payload and status code: 201 if every item succeeded, else 207"""
+        created = self.results[CREATED]
+        return {
+            'success': not self.failed,
+            'data': {
+                'created': created,
+                'updated': self.results[UPDATED],
+                'unchanged': self.results[UNCHANGED],
+                'errors': self.failed
+            },
+            'count': len(created),
+            'message': (f'{len(created)} jobs created, {len(self.results[UPDATED])} updated, '
+                        f'{len(self.results[UNCHANGED])} unchanged, {len(self.failed)} failed')
+        }, 201 if not self.failed else 207
+
+@job_routes.route('/jobs/bulk', methods=['POST'])
+def bulk_create_jobs():
+    """Create many jobs at once, reporting success or errors per item"""
+    results = BulkResults()
+    chunk = []
+    
+    def flush_chunk():
+        try:
+            results.add_chunk(chunk, ingest_chunk([item for _, item in chunk], upsert))
+        except Exception as e:
+            results.add_chunk_failure(chunk, e)
+        chunk.clear()
+    
+    try:
+        chunk_size = current_app.config['BULK_CHUNK_SIZE']
+        upsert = upsert_requested()
+        
+        for index, item in iter_bulk_items():
+            errors = bulk_item_errors(item)
+            if errors:
+                results.add_errors(index, errors)
+                continue
+            
+            chunk.append((index, item))
+            if len(chunk) >= chunk_size:
+                flush_chunk()
+        
+        if chunk:
+            flush_chunk()
         
+        if results.changed:
+            invalidate_jobs_cache()
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid bulk payload',
+            'message': str(e)
+        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({
             'success': False,
-            'error': 'Failed to create job',
+            'error': 'Failed to create jobs',
             'message': str(e)
         }), 500
+    
+    payload, status_code = results.response()
+    return jsonify(payload), status_code
 
 @job_routes.route('/jobs/<int:job_id>', methods=['PUT'])
 def update_job(job_id):
@@ -166,21 +574,21 @@ def update_job(job_id):
                 'error': 'No data provided'
             }), 400
         
-        # Validate input (only check provided fields)
-        provided_fields = [field for field in ['title', 'company', 'location'] if field in data]
-        if provided_fields:  # Only validate if there are fields to validate
-            errors = validate_job_data(data, provided_fields)
-            if errors:
-                return jsonify({
-                    'success': False,
-                    'error': 'Validation failed',
-                    'errors': errors
-                }), 400
+        errors = validate_job_update(data)
+        if errors:
+            return jsonify({
+                'success': False,
+                'error': 'Validation failed',
+                'errors': errors
+            }), 400
         
         # Update job using model method
-        job.update_from_dict(data)
+        duplicate = update_job_fields(db.session, job, data)
+        if duplicate:
+            payload, status_code = save_job_response(DUPLICATE, duplicate.to_dict())
+            return jsonify(payload), status_code
         
-        db.session.commit()
+        invalidate_jobs_cache()
         
         return jsonify({
             'success': True,
@@ -210,6 +618,7 @@ def delete_job(job_id):
         
         db.session.delete(job)
         db.session.commit()
+        invalidate_jobs_cache()
         
         return jsonify({
             'success': True,
@@ -231,10 +640,97 @@ def health_check():
     return jsonify({
         'success': True,
         'message': 'Job API is running',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'cache': get_cache().stats()
     }), 200
 
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def metrics_text(metrics, cache):
+    """The /api/metrics body: the request metrics plus cache and process gauges"""
+    cache_stats = cache.stats()
+    extra_lines = [
+        '# HELP jobs_api_cache_requests_total Response cache lookups, by result',
+        '# TYPE jobs_api_cache_requests_total counter',
+        f'jobs_api_cache_requests_total{{result="hit"}} {cache_stats["hits"]}',
+        f'jobs_api_cache_requests_total{{result="miss"}} {cache_stats["misses"]}',
+        '# HELP jobs_api_process_start_time_seconds Start time of this process since the epoch',
+        '# TYPE jobs_api_process_start_time_seconds gauge',
+        f'jobs_api_process_start_time_seconds {metrics.started_at}',
+    ]
+    return metrics.render(extra_lines)
+
+@job_routes.route('/metrics', methods=['GET'])
+def get_metrics_text():
+    """Request, database and cache metrics in Prometheus text format"""
+    metrics = get_metrics()
+    if metrics is None:
+        return jsonify({
+            'success': False,
+            'error': 'Metrics are disabled'
+        }), 404
+    
+    return current_app.response_class(metrics_text(metrics, get_cache()), status=200,
+                                      content_type=PROMETHEUS_CONTENT_TYPE)
+
+def facet_statement(args, engine=None):
+    """Count jobs per job_type, location and tag under the filters in args.
+    
+    The three grouped counts run as one UNION ALL statement over the filtered
+    job ids, so the filters are evaluated once and it is a single round trip.
+    Rows are (facet, value, count).
+    """
+    filtered_query, _ = apply_job_filters(select(Job.id, Job.job_type, Job.location), args, engine)
+    filtered = filtered_query.subquery('filtered')
+    
+    by_job_type = (
+        select(literal('job_type').label('facet'), filtered.c.job_type.label('value'), func.count().label('count'))
+        .group_by(filtered.c.job_type)
+    )
+    by_location = (
+        select(literal('location'), filtered.c.location, func.count())
+        .group_by(filtered.c.location)
+    )
+    by_tag = (
+        select(literal('tag'), Tag.name, func.count())
+        .select_from(filtered)
+        .join(job_tags, job_tags.c.job_id == filtered.c.id)
+        .join(Tag, Tag.id == job_tags.c.tag_id)
+        .group_by(Tag.id, Tag.name)
+    )
+    
+    return union_all(by_job_type, by_location, by_tag)
+
+def group_facets(rows):
+    """Group facet_statement rows into sorted value/count lists per facet, plus the total"""
+    facets = {'job_type': [], 'location': [], 'tag': []}
+    for facet, value, count in rows:
+        facets[facet].append({'value': value, 'count': count})
+    
+    for values in facets.values():
+        values.sort(key=lambda item: (-item['count'], item['value'] or ''))
+    facets['total'] = sum(item['count'] for item in facets['job_type'])
+    return facets
+
+@job_routes.route('/jobs/facets', methods=['GET'])
+@cached_response
+def get_facets():
+    """Get job counts per job type, location and tag for the current filters"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': group_facets(db.session.execute(facet_statement(request.args)))
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': 'Failed to fetch facets',
+            'message': str(e)
+        }), 500
+
 @job_routes.route('/jobs/job-types', methods=['GET'])
+@cached_response
 def get_job_types():
     """Get unique job types"""
     try:
@@ -255,6 +751,7 @@ def get_job_types():
 
 # Get unique locations for dropdown
 @job_routes.route('/jobs/locations', methods=['GET'])
+@cached_response
 def get_locations():
     """Get unique locations"""
     try:
@@ -275,20 +772,21 @@ def get_locations():
 
 # Get all unique tags
 @job_routes.route('/jobs/tags', methods=['GET'])
+@cached_response
 def get_tags():
     """Get all unique tags"""
     try:
-        jobs_with_tags = db.session.query(Job.tags).filter(Job.tags.isnot(None)).all()
-        all_tags = set()
-        
-        for job_tags in jobs_with_tags:
-            if job_tags[0]:
-                tags = [tag.strip() for tag in job_tags[0].split(',') if tag.strip()]
-                all_tags.update(tags)
+        # Only tags that are attached to at least one job
+        tags = (
+            db.session.query(Tag.name)
+            .filter(select(job_tags.c.tag_id).where(job_tags.c.tag_id == Tag.id).exists())
+            .order_by(Tag.name)
+            .all()
+        )
         
         return jsonify({
             'success': True,
-            'data': sorted(list(all_tags))
+            'data': [tag[0] for tag in tags]
         }), 200
         
     except Exception as e:
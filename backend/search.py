@@ -0,0 +1,210 @@
+import re
+
+from sqlalchemy import column, func, inspect, literal_column, or_, table, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from db import db
+from models.job import Job
+
+FTS_TABLE = 'jobs_fts'
+# Trigram index over jobs.location, serving substring location filters
+LOCATION_FTS_TABLE = 'jobs_location_fts'
+
+# Trigram queries need at least this many characters to use the index
+MIN_TRIGRAM_LENGTH = 3
+
+# Column weights used for relevance ranking: title, company, location, tags
+SQLITE_BM25_WEIGHTS = (10.0, 5.0, 2.0, 2.0)
+
+SQLITE_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    title, company, location, tags,
+    content='jobs', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)
+"""
+
+# External-content FTS5 tables are kept in sync with triggers on the jobs table
+SQLITE_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company, location, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, location, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, location, tags ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, location, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, company, location, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.tags);
+    END
+    """,
+]
+
+SQLITE_LOCATION_TABLE = f"""
+CREATE VIRTUAL TABLE {LOCATION_FTS_TABLE} USING fts5(
+    location, content='jobs', content_rowid='id', tokenize='trigram'
+)
+"""
+
+SQLITE_LOCATION_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_location_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {LOCATION_FTS_TABLE}(rowid, location) VALUES (new.id, new.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_location_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {LOCATION_FTS_TABLE}({LOCATION_FTS_TABLE}, rowid, location)
+        VALUES ('delete', old.id, old.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_location_fts_au AFTER UPDATE OF location ON jobs BEGIN
+        INSERT INTO {LOCATION_FTS_TABLE}({LOCATION_FTS_TABLE}, rowid, location)
+        VALUES ('delete', old.id, old.location);
+        INSERT INTO {LOCATION_FTS_TABLE}(rowid, location) VALUES (new.id, new.location);
+    END
+    """,
+]
+
+# PostgreSQL keeps the tsvector current through a stored generated column
+POSTGRES_STATEMENTS = [
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'C') ||
+        setweight(to_tsvector('simple', replace(coalesce(tags, ''), ',', ' ')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+# Trigram GIN index that PostgreSQL uses for ILIKE '%...%' on location
+POSTGRES_TRIGRAM_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_location_trgm ON jobs USING GIN (location gin_trgm_ops)",
+]
+
+# Whether the trigram location index could be created, per database URL
+_location_index = {}
+
+
+def index_key(engine):
+    """Key for _location_index, the same for sync and async drivers of one database"""
+    return str(engine.url.set(drivername=engine.dialect.name))
+
+
+def create_fts_table(conn, name, create_statement, triggers):
+    """Create an external-content FTS5 table and its sync triggers, indexing existing rows"""
+    created = not inspect(conn).has_table(name)
+    if created:
+        conn.execute(text(create_statement))
+    for statement in triggers:
+        conn.execute(text(statement))
+    if created:
+        # Index rows that existed before the FTS table was added
+        conn.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+
+def init_search_index():
+    """Create the full-text and location indexes for the current database if they do not exist yet"""
+    dialect = db.engine.dialect.name
+    url = index_key(db.engine)
+    _location_index[url] = False
+
+    if dialect == 'sqlite':
+        with db.engine.begin() as conn:
+            create_fts_table(conn, FTS_TABLE, SQLITE_FTS_TABLE, SQLITE_FTS_TRIGGERS)
+        try:
+            # The trigram tokenizer needs SQLite 3.34+
+            with db.engine.begin() as conn:
+                create_fts_table(conn, LOCATION_FTS_TABLE, SQLITE_LOCATION_TABLE, SQLITE_LOCATION_TRIGGERS)
+            _location_index[url] = True
+        except OperationalError:
+            pass
+    elif dialect == 'postgresql':
+        with db.engine.begin() as conn:
+            for statement in POSTGRES_STATEMENTS:
+                conn.execute(text(statement))
+        try:
+            # pg_trgm may not be installable without superuser rights
+            with db.engine.begin() as conn:
+                for statement in POSTGRES_TRIGRAM_STATEMENTS:
+                    conn.execute(text(statement))
+            _location_index[url] = True
+        except (OperationalError, ProgrammingError):
+            pass
+
+
+def apply_location_filter(query, location, engine=None):
+    """Filter a Job query by case-insensitive substring match on location.
+    
+    engine is the one the query will run on, by default the Flask-SQLAlchemy engine.
+    """
+    engine = engine or db.engine
+    if (engine.dialect.name == 'sqlite' and _location_index.get(index_key(engine))
+            and len(location) >= MIN_TRIGRAM_LENGTH):
+        fts = table(LOCATION_FTS_TABLE, column('rowid'))
+        phrase = '"' + location.replace('"', '""') + '"'
+        return query.join(fts, fts.c.rowid == Job.id).filter(
+            text(f'{LOCATION_FTS_TABLE} MATCH :location_match').bindparams(location_match=phrase)
+        )
+
+    # PostgreSQL serves this from the trigram index when pg_trgm is available
+    return query.filter(Job.location.ilike(f'%{location}%'))
+
+
+def search_terms(search):
+    """Split a user search string into lowercase word tokens"""
+    return re.findall(r'\w+', search.lower())
+
+
+def apply_search(query, search, engine=None):
+    """Filter a Job query by full-text search.
+
+    Returns the filtered query and a relevance expression (higher is better),
+    or None as relevance when the database has no full-text index. engine is
+    the one the query will run on, by default the Flask-SQLAlchemy engine.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query, None
+
+    dialect = (engine or db.engine).dialect.name
+
+    if dialect == 'sqlite':
+        # Each term is a quoted prefix query, combined with implicit AND
+        match = ' '.join(f'"{term}"*' for term in terms)
+        fts = table(FTS_TABLE, column('rowid'))
+        query = query.join(fts, fts.c.rowid == Job.id).filter(
+            text(f'{FTS_TABLE} MATCH :fts_match').bindparams(fts_match=match)
+        )
+        relevance = -func.bm25(literal_column(FTS_TABLE), *SQLITE_BM25_WEIGHTS)
+        return query, relevance
+
+    if dialect == 'postgresql':
+        ts_query = func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+        search_vector = literal_column('jobs.search_vector')
+        query = query.filter(search_vector.op('@@')(ts_query))
+        return query, func.ts_rank(search_vector, ts_query)
+
+    # No full-text support: fall back to substring matching
+    pattern = f'%{search}%'
+    query = query.filter(
+        or_(
+            Job.title.ilike(pattern),
+            Job.company.ilike(pattern),
+            Job.location.ilike(pattern),
+            Job.tags.ilike(pattern)
+        )
+    )
+    return query, None
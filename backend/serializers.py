@@ -0,0 +1,64 @@
+"""Fast serialization of job list rows without hydrating ORM objects.
+
+List endpoints select plain column tuples and turn them into dicts with a
+converter compiled once per field list, then encode with orjson when it is
+installed. The output matches Job.to_dict for the same fields.
+"""
+import json
+from functools import lru_cache
+
+from models.job import Job
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _split_tags(value):
+    return value.split(',') if value and value.strip() else []
+
+
+# Per-field conversion from the column value to its JSON value, as in Job.to_dict
+CONVERTERS = {
+    'posting_date': _isoformat,
+    'tags': _split_tags,
+}
+
+
+def columns_for(fields):
+    """Job columns to select for the given field names"""
+    return [getattr(Job, field) for field in fields]
+
+
+@lru_cache(maxsize=64)
+def row_serializer(fields):
+    """Return a function turning a row selected with columns_for(fields) into a dict.
+
+    fields must be a tuple. The function is generated once per field tuple so
+    each row costs a single dict display with no per-field lookups.
+    """
+    items = []
+    namespace = {}
+    for position, field in enumerate(fields):
+        converter = CONVERTERS.get(field)
+        if converter is None:
+            items.append(f'{field!r}: row[{position}]')
+        else:
+            namespace[f'convert_{position}'] = converter
+            items.append(f'{field!r}: convert_{position}(row[{position}])')
+
+    source = f"def serialize(row):\n    return {{{', '.join(items)}}}\n"
+    exec(source, namespace)
+    return namespace['serialize']
+
+
+def dumps(data):
+    """Encode data as UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,4 @@
+"""WSGI entry point for production servers: gunicorn -c gunicorn.conf.py wsgi:app"""
+from app import app
+
+__all__ = ['app']
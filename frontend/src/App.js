@@ -8,10 +8,14 @@ import './App.css';
 function App() {
   const [jobs, setJobs] = useState([]);
   const [isLoading, setIsLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [currentView, setCurrentView] = useState('list'); // 'list', 'add', 'edit'
   const [selectedJob, setSelectedJob] = useState(null);
   const [filters, setFilters] = useState({});
+  // Bumped after every save or delete so the filter counts are fetched again
+  const [jobsVersion, setJobsVersion] = useState(0);
   const [apiStatus, setApiStatus] = useState('checking');
 
   // Check API health and load jobs on mount
@@ -42,6 +46,7 @@ function App() {
     try {
       const response = await jobsAPI.getJobs(currentFilters);
       setJobs(response.data || []);
+      setNextCursor(response.next_cursor || null);
     } catch (error) {
       setError(error.message);
     } finally {
@@ -49,6 +54,26 @@ function App() {
     }
   };
 
+  // Fetch the page after the last one loaded and append it to the list
+  const loadMoreJobs = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    setError('');
+
+    try {
+      const response = await jobsAPI.getJobs({ ...filters, cursor: nextCursor });
+      setJobs(prev => {
+        const loadedIds = new Set(prev.map(job => job.id));
+        return [...prev, ...(response.data || []).filter(job => !loadedIds.has(job.id))];
+      });
+      setNextCursor(response.next_cursor || null);
+    } catch (error) {
+      setError(error.message);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleFiltersChange = (newFilters) => {
     setFilters(newFilters);
   };
@@ -64,12 +89,14 @@ function App() {
       ));
     }
     
+    setJobsVersion(version => version + 1);
     setCurrentView('list');
     setSelectedJob(null);
   };
 
   const handleJobDeleted = (deletedJobId) => {
     setJobs(prev => prev.filter(job => job.id !== deletedJobId));
+    setJobsVersion(version => version + 1);
   };
 
   const handleEditJob = (job) => {
@@ -136,7 +163,7 @@ function App() {
   const renderJobList = () => (
     <div className="jobs-section">
       <div className="jobs-header">
-        <h2>Job Listings ({jobs.length})</h2>
+        <h2>Job Listings ({jobs.length}{nextCursor ? '+' : ''})</h2>
         <button
           onClick={() => setCurrentView('add')}
           className="btn btn-primary"
@@ -145,7 +172,7 @@ function App() {
         </button>
       </div>
 
-      <FilterSortJob onFiltersChange={handleFiltersChange} />
+      <FilterSortJob onFiltersChange={handleFiltersChange} refreshKey={jobsVersion} />
 
       {error && (
         <div className="error-message">
@@ -176,6 +203,18 @@ function App() {
           {jobs.map(renderJobCard)}
         </div>
       )}
+
+      {!isLoading && nextCursor && (
+        <div className="load-more">
+          <button
+            onClick={loadMoreJobs}
+            className="btn btn-secondary"
+            disabled={isLoadingMore}
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more jobs'}
+          </button>
+        </div>
+      )}
     </div>
   );
 
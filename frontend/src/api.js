@@ -44,6 +44,8 @@ export const jobsAPI = {
       if (filters.location) params.append('location', filters.location);
       if (filters.tag) params.append('tag', filters.tag);
       if (filters.sort) params.append('sort', filters.sort);
+      if (filters.limit) params.append('limit', filters.limit);
+      if (filters.cursor) params.append('cursor', filters.cursor);
       
       const response = await api.get(`/jobs?${params.toString()}`);
       return response.data;
@@ -92,6 +94,23 @@ export const jobsAPI = {
     }
   },
 
+  // Get job counts per job type, location and tag for the given filters
+  getFacets: async (filters = {}) => {
+    try {
+      const params = new URLSearchParams();
+      
+      if (filters.search) params.append('search', filters.search);
+      if (filters.job_type) params.append('job_type', filters.job_type);
+      if (filters.location) params.append('location', filters.location);
+      if (filters.tag) params.append('tag', filters.tag);
+      
+      const response = await api.get(`/jobs/facets?${params.toString()}`);
+      return response.data;
+    } catch (error) {
+      throw new Error('Failed to fetch facets');
+    }
+  },
+
   // Get unique job types for dropdown
   getJobTypes: async () => {
     try {
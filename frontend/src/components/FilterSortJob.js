@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { jobsAPI } from '../api';
 
-const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
+const FilterSortJob = ({ onFiltersChange, initialFilters = {}, refreshKey = 0 }) => {
   const [filters, setFilters] = useState({
     search: '',
     job_type: '',
@@ -20,10 +20,17 @@ const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
   const [isLoading, setIsLoading] = useState(false);
   const [showAdvancedFilters, setShowAdvancedFilters] = useState(false);
 
-  // Load dropdown data on component mount
+  const { search, job_type, location, tag } = filters;
+
+  // Reload dropdown counts for the current filters, and after jobs are saved or deleted (refreshKey)
   useEffect(() => {
-    loadDropdownData();
-  }, []);
+    let ignore = false;
+    loadDropdownData({ search, job_type, location, tag }, () => ignore);
+    // A response for filters that have changed since must not overwrite newer counts
+    return () => {
+      ignore = true;
+    };
+  }, [search, job_type, location, tag, refreshKey]);
 
   // Notify parent component when filters change
   useEffect(() => {
@@ -32,24 +39,23 @@ const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
     }
   }, [filters, onFiltersChange]);
 
-  const loadDropdownData = async () => {
+  const loadDropdownData = async (facetFilters, isStale) => {
     setIsLoading(true);
     try {
-      const [jobTypesRes, locationsRes, tagsRes] = await Promise.all([
-        jobsAPI.getJobTypes().catch(() => ({ data: [] })),
-        jobsAPI.getLocations().catch(() => ({ data: [] })),
-        jobsAPI.getTags().catch(() => ({ data: [] }))
-      ]);
+      // One request returns the values of all three dropdowns with their counts
+      const facetsRes = await jobsAPI.getFacets(facetFilters).catch(() => ({ data: {} }));
+      if (isStale()) return;
+      const facets = facetsRes.data || {};
 
       setDropdownData({
-        jobTypes: jobTypesRes.data || [],
-        locations: locationsRes.data || [],
-        tags: tagsRes.data || []
+        jobTypes: facets.job_type || [],
+        locations: facets.location || [],
+        tags: facets.tag || []
       });
     } catch (error) {
       console.error('Error loading dropdown data:', error);
     } finally {
-      setIsLoading(false);
+      if (!isStale()) setIsLoading(false);
     }
   };
 
@@ -119,6 +125,7 @@ const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
             <option value="posting_date_asc">Oldest First</option>
             <option value="title_asc">Title A-Z</option>
             <option value="company_asc">Company A-Z</option>
+            <option value="relevance">Best Match</option>
           </select>
         </div>
 
@@ -134,8 +141,8 @@ const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
           >
             <option value="">All Types</option>
             {dropdownData.jobTypes.map((type, index) => (
-              <option key={index} value={type}>
-                {type}
+              <option key={index} value={type.value}>
+                {type.value} ({type.count})
               </option>
             ))}
           </select>
@@ -169,8 +176,8 @@ const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
               >
                 <option value="">All Locations</option>
                 {dropdownData.locations.map((location, index) => (
-                  <option key={index} value={location}>
-                    {location}
+                  <option key={index} value={location.value}>
+                    {location.value} ({location.count})
                   </option>
                 ))}
               </select>
@@ -188,8 +195,8 @@ const FilterSortJob = ({ onFiltersChange, initialFilters = {} }) => {
               >
                 <option value="">All Tags</option>
                 {dropdownData.tags.map((tag, index) => (
-                  <option key={index} value={tag}>
-                    {tag}
+                  <option key={index} value={tag.value}>
+                    {tag.value} ({tag.count})
                   </option>
                 ))}
               </select>